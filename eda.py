@@ -14,7 +14,7 @@ scripts_dir = Path(__file__).parent / "scripts"
 sys.path.insert(0, str(scripts_dir))
 
 from config import SMS_FILE, WHATSAPP_FILES, CSV_ENCODING, DELIMITERS
-from data_loader import get_sms_stats, get_whatsapp_stats
+from data_engine import get_sms_statistics, get_whatsapp_statistics
 
 
 def print_header(title):
@@ -30,7 +30,7 @@ def analyze_sms():
     
     try:
         # Obtener estadísticas
-        stats = get_sms_stats()
+        stats = get_sms_statistics()
         
         print(f"\n📊 Estadísticas Generales:")
         print(f"  Total de registros: {stats['total']:,}")
@@ -58,7 +58,7 @@ def analyze_whatsapp():
     print_header("ANÁLISIS WHATSAPP")
     
     try:
-        stats = get_whatsapp_stats()
+        stats = get_whatsapp_statistics()
         
         print(f"\n📊 Estadísticas Generales:")
         print(f"  Total de registros: {stats['total']:,}")
@@ -112,8 +112,8 @@ def compare_datasets():
     print_header("COMPARATIVA SMS vs WHATSAPP")
     
     try:
-        sms_stats = get_sms_stats()
-        whatsapp_stats = get_whatsapp_stats()
+        sms_stats = get_sms_statistics()
+        whatsapp_stats = get_whatsapp_statistics()
         
         total = sms_stats['total'] + whatsapp_stats['total']
         
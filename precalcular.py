@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Precalcula los agregados del dashboard fuera de la app (ej: job nocturno con cron).
+Usa el motor de datos sin Streamlit con el caché en disco: la app con
+CACHE_BACKEND=disk toma esos resultados en lugar de recalcularlos. El cubo OLAP,
+los conteos y los agregados de WhatsApp quedan además en los sidecars junto a
+cada archivo de datos.
+
+Ejecutar: python precalcular.py [--backend disk|memory|none]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / "scripts"))
+
+import data_engine
+import source_cache
+from cache_backends import make_backend
+
+AGREGADOS = [
+    data_engine.count_total_sms_records,
+    data_engine.count_total_whatsapp_records,
+    data_engine.count_total_interacciones_records,
+    data_engine.get_cube,
+    data_engine.get_sms_statistics,
+    data_engine.get_whatsapp_statistics,
+    data_engine.get_whatsapp_failed_analysis,
+    data_engine.get_sentiment_stats_by_operator,
+    data_engine.get_sentiment_stats_by_codigo,
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--backend", default="disk", help="Backend de caché: disk, memory o none")
+    args = parser.parse_args()
+
+    source_cache.set_backend(make_backend(args.backend))
+
+    print("="*80)
+    print(f"PRECÁLCULO DE AGREGADOS (caché: {args.backend})")
+    print("="*80)
+
+    inicio_total = time.perf_counter()
+    for funcion in AGREGADOS:
+        inicio = time.perf_counter()
+        funcion()
+        print(f"  ✓ {funcion.__name__:<36} {time.perf_counter() - inicio:>8.2f}s")
+    print(f"\nTotal: {time.perf_counter() - inicio_total:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Reporte de memoria: columnas de texto como objetos de Python vs large_string de Arrow.
+Carga el dataset SMS completo y los mensajes de interacciones con cada
+almacenamiento (config.STRING_STORAGE) y compara el uso de memoria por columna
+contra el límite del contenedor.
+
+Ejecutar: python reporte_memoria.py [--limite-mb 1024]
+"""
+
+import argparse
+import sys
+import time
+import warnings
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / "scripts"))
+warnings.filterwarnings("ignore")
+
+import config
+import data_engine
+import source_cache
+from cache_backends import NullCache
+
+STORAGES = ("python", "pyarrow")
+
+
+def _medir(storage: str):
+    """Carga los datasets con un almacenamiento de texto y retorna (memoria por columna, totales, segundos)."""
+    config.STRING_STORAGE = storage
+
+    start = time.perf_counter()
+    sms = data_engine.load_sms_data(sample=False)
+    mensajes = data_engine.get_interacciones_messages()
+    elapsed = time.perf_counter() - start
+    for nombre, df in (("SMS", sms), ("Mensajes interacciones", mensajes)):
+        if data_engine.is_truncated(df):
+            print(f"⚠️ {nombre} ({storage}): carga cortada en {len(df):,} filas por OUT_OF_CORE_TRUNCATE; "
+                  "la memoria medida no es la del archivo completo")
+
+    por_columna = sms.memory_usage(deep=True, index=False).to_dict()
+    totales = {
+        "SMS completo": int(sms.memory_usage(deep=True).sum()),
+        "Mensajes interacciones": int(mensajes.memory_usage(deep=True).sum()),
+    }
+    # Longitud de mensajes: con Arrow corre sobre kernels de pyarrow.compute
+    start_len = time.perf_counter()
+    if not sms.empty:
+        sms["Mensaje"].str.len().sum()
+        sms["Mensaje"].str.lower()
+    str_ops = time.perf_counter() - start_len
+    return por_columna, totales, elapsed, str_ops
+
+
+def _mb(n: int) -> str:
+    return f"{n / 1024 / 1024:,.1f} MB"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--limite-mb", type=int, default=1024, help="Memoria disponible del contenedor (MB)")
+    args = parser.parse_args()
+    # Cada almacenamiento se mide con una carga real, sin resultados cacheados
+    source_cache.set_backend(NullCache())
+
+    print("="*80)
+    print("REPORTE DE MEMORIA - Almacenamiento de columnas de texto")
+    print("="*80)
+    print(f"SMS: {config.SMS_FILE.name} | Interacciones: {config.INTERACCIONES_FILE.name}")
+
+    resultados = {storage: _medir(storage) for storage in STORAGES}
+
+    columnas, _, _, _ = resultados["python"]
+    print(f"\n{'Columna':<28}" + "".join(f"{s:>16}" for s in STORAGES))
+    for col in columnas:
+        print(f"{col:<28}" + "".join(f"{_mb(resultados[s][0].get(col, 0)):>16}" for s in STORAGES))
+
+    print(f"\n{'Total':<28}" + "".join(f"{s:>16}" for s in STORAGES))
+    for nombre in resultados["python"][1]:
+        print(f"{nombre:<28}" + "".join(f"{_mb(resultados[s][1][nombre]):>16}" for s in STORAGES))
+    print(f"{'Carga (s)':<28}" + "".join(f"{resultados[s][2]:>16.2f}" for s in STORAGES))
+    print(f"{'.str.len() + .str.lower() (s)':<28}" + "".join(f"{resultados[s][3]:>16.2f}" for s in STORAGES))
+
+    limite = args.limite_mb * 1024 * 1024
+    print()
+    for storage in STORAGES:
+        total = sum(resultados[storage][1].values())
+        estado = "✅ cabe" if total < limite else "❌ NO cabe"
+        print(f"{storage:<10} {_mb(total):>12} de {args.limite_mb:,} MB → {estado}")
+
+    python_total = sum(resultados["python"][1].values())
+    arrow_total = sum(resultados["pyarrow"][1].values())
+    if python_total:
+        print(f"\nAhorro con Arrow: {_mb(python_total - arrow_total)} ({1 - arrow_total / python_total:.0%})")
+
+
+if __name__ == "__main__":
+    main()
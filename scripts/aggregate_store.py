@@ -0,0 +1,236 @@
+"""
+Almacén persistente de agregados precalculados.
+Guarda junto a cada archivo de datos un sidecar JSON pequeño con los resultados de
+las agregaciones, para que un reinicio de la app lea kilobytes en lugar de volver a
+recorrer todo el archivo. Los resultados se invalidan solos cuando el archivo cambia.
+Las escrituras del sidecar son atómicas y la lectura-modificación-escritura se hace
+con un bloqueo de archivo, así varios procesos de la app pueden guardar a la vez.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterator, Optional
+
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:  # Windows: sin bloqueo, las escrituras siguen siendo atómicas
+    fcntl = None
+
+# Cambiar si cambia el formato del sidecar (invalida todos los agregados guardados)
+STORE_VERSION = 1
+
+# Tamaño de bloque para calcular el hash del contenido
+HASH_CHUNK_SIZE = 8 * 1024 * 1024
+
+
+def sidecar_path(filepath: Path) -> Path:
+    """Ruta del sidecar de agregados: data/x/archivo.parquet → data/x/.archivo.parquet.aggregates.json"""
+    return filepath.parent / f".{filepath.name}.aggregates.json"
+
+
+def table_path(filepath: Path, key: str) -> Path:
+    """Ruta de un agregado tabular: data/x/archivo.parquet → data/x/.archivo.parquet.<key>.parquet"""
+    return filepath.parent / f".{filepath.name}.{key}.parquet"
+
+
+def lock_path(filepath: Path) -> Path:
+    """Ruta del archivo de bloqueo del sidecar: data/x/.archivo.parquet.aggregates.lock"""
+    return filepath.parent / f".{filepath.name}.aggregates.lock"
+
+
+def _tmp_path(path: Path) -> Path:
+    """Temporal único por proceso e hilo junto a path (para escribir y luego os.replace)."""
+    return path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+
+
+# Bloqueos que ya tiene cada hilo (el bloqueo es reentrante dentro del mismo hilo)
+_held_locks = threading.local()
+
+
+@contextmanager
+def _sidecar_lock(filepath: Path) -> Iterator[None]:
+    """Bloqueo exclusivo del sidecar entre procesos e hilos (flock sobre lock_path).
+
+    Si el archivo de bloqueo no se puede crear (directorio de solo lectura) se
+    sigue sin bloqueo: en ese caso el sidecar tampoco se puede escribir.
+    """
+    path = lock_path(filepath)
+    held = _held_locks.__dict__.setdefault('paths', set())
+    if fcntl is None or path in held:
+        yield
+        return
+    try:
+        f = open(path, 'a')
+    except OSError:
+        yield
+        return
+    try:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        held.add(path)
+        try:
+            yield
+        finally:
+            held.discard(path)
+            fcntl.flock(f, fcntl.LOCK_UN)
+    finally:
+        f.close()
+
+
+def content_hash(filepath: Path) -> str:
+    """Calcula el hash BLAKE2b del contenido completo del archivo (por bloques)."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def file_fingerprint(filepath: Path, with_hash: bool = True) -> Dict:
+    """Huella del archivo: tamaño, mtime y (opcionalmente) hash del contenido."""
+    stat = filepath.stat()
+    fingerprint = {
+        'name': filepath.name,
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+    }
+    if with_hash:
+        fingerprint['hash'] = content_hash(filepath)
+    return fingerprint
+
+
+def _read_sidecar(filepath: Path) -> Optional[Dict]:
+    """Lee el sidecar si existe y tiene la versión actual."""
+    path = sidecar_path(filepath)
+    if not path.exists():
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if data.get('version') != STORE_VERSION:
+        return None
+    return data
+
+
+def _write_sidecar(filepath: Path, data: Dict) -> None:
+    """Escribe el sidecar de forma atómica (archivo temporal + os.replace)."""
+    path = sidecar_path(filepath)
+    tmp_path = _tmp_path(path)
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        # Directorio de solo lectura: los agregados simplemente no se persisten
+        print(f"DEBUG: No se pudo guardar agregados de {filepath.name}: {e}")
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+
+
+def _validated_sidecar(filepath: Path) -> Optional[Dict]:
+    """Retorna el sidecar solo si sigue correspondiendo al archivo actual.
+
+    Si tamaño y mtime coinciden se acepta sin leer el archivo. Si solo cambió
+    el mtime (ej: el archivo se volvió a copiar en un deploy), se compara el
+    hash del contenido y, si coincide, se actualiza el mtime guardado.
+    """
+    data = _read_sidecar(filepath)
+    if data is None:
+        return None
+
+    saved = data.get('source', {})
+    current = file_fingerprint(filepath, with_hash=False)
+
+    if saved.get('size') != current['size']:
+        return None
+    if saved.get('mtime_ns') == current['mtime_ns']:
+        return data
+
+    if saved.get('hash') != content_hash(filepath):
+        return None
+
+    with _sidecar_lock(filepath):
+        # Se relee bajo el bloqueo: otro proceso pudo guardar agregados desde la primera lectura
+        data = _read_sidecar(filepath)
+        if data is None or data.get('source', {}).get('hash') != saved.get('hash'):
+            return None
+        data['source']['mtime_ns'] = current['mtime_ns']
+        _write_sidecar(filepath, data)
+    return data
+
+
+def load_aggregate(filepath: Path, key: str) -> Optional[Dict]:
+    """Carga un agregado guardado para el archivo, o None si no existe o está obsoleto."""
+    if not filepath.exists():
+        return None
+    data = _validated_sidecar(filepath)
+    if data is None:
+        return None
+    return data.get('aggregates', {}).get(key)
+
+
+def save_aggregate(filepath: Path, key: str, value) -> None:
+    """Guarda un agregado en el sidecar del archivo (conserva los demás agregados válidos).
+
+    La lectura, la modificación y la escritura se hacen bajo el bloqueo del sidecar:
+    dos procesos que guardan agregados distintos a la vez no se pisan.
+    """
+    with _sidecar_lock(filepath):
+        data = _validated_sidecar(filepath)
+        if data is None:
+            data = {
+                'version': STORE_VERSION,
+                'source': file_fingerprint(filepath),
+                'aggregates': {},
+            }
+        data['aggregates'][key] = value
+        _write_sidecar(filepath, data)
+
+
+def cached_aggregate(filepath: Path, key: str, compute: Callable[[], Dict]):
+    """Retorna el agregado guardado o lo calcula con compute() y lo persiste.
+
+    El resultado debe ser serializable a JSON (dicts, listas, números, strings).
+    """
+    value = load_aggregate(filepath, key)
+    if value is not None:
+        return value
+    value = compute()
+    save_aggregate(filepath, key, value)
+    return value
+
+
+def cached_table(filepath: Path, key: str, compute: Callable[[], pd.DataFrame]) -> pd.DataFrame:
+    """Como cached_aggregate, pero para agregados tabulares (ej: el cubo OLAP).
+    
+    El DataFrame se guarda como Parquet comprimido junto al archivo de datos
+    (las columnas categóricas quedan con dictionary encoding) y el sidecar JSON
+    registra su tamaño, así que se invalida junto con los demás agregados.
+    """
+    path = table_path(filepath, key)
+    saved = load_aggregate(filepath, key)
+    if saved is not None and path.exists() and path.stat().st_size == saved.get('size'):
+        return pd.read_parquet(path)
+    
+    df = compute()
+    tmp_path = _tmp_path(path)
+    try:
+        df.to_parquet(tmp_path, index=False, compression='zstd')
+        os.replace(tmp_path, path)
+        save_aggregate(filepath, key, {'file': path.name, 'rows': len(df), 'size': path.stat().st_size})
+    except OSError as e:
+        print(f"DEBUG: No se pudo guardar {key} de {filepath.name}: {e}")
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+    return df
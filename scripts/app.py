@@ -3,9 +3,15 @@ Aplicación principal de Streamlit para visualizar estados de interacción.
 Análisis separados de SMS, WhatsApp e Interacciones con visualizaciones mejoradas.
 """
 
+import time
+
+# Inicio de esta ejecución del script (para medir el tiempo hasta el primer dibujado)
+_SCRIPT_START = time.perf_counter()
+
 import streamlit as st
 import pandas as pd
 from pathlib import Path
+from typing import Dict
 import sys
 import os
 
@@ -13,37 +19,16 @@ import os
 scripts_dir = Path(__file__).parent
 sys.path.insert(0, str(scripts_dir))
 
-# CLEANUP: Eliminar archivos sample Y CSVs grandes si existen (para limpiar cache en servidor)
 BASE_DIR = scripts_dir.parent
 DATA_DIR = BASE_DIR / "data"
-files_to_remove = [
-    # Samples
-    DATA_DIR / "mensajes_whatsapp" / "whatsapp_sample.csv",
-    DATA_DIR / "mensajes_texto" / "mensajes_texto_sample.csv",
-    DATA_DIR / "mensajes_texto" / "interacciones_sample.csv",
-    # CSVs grandes (deben usar Parquet)
-    DATA_DIR / "mensajes_texto" / "mensajes_texto.csv",
-    DATA_DIR / "mensajes_texto" / "interacciones.csv",
-]
-removed_files = []
-for file_to_remove in files_to_remove:
-    if file_to_remove.exists():
-        try:
-            os.remove(file_to_remove)
-            removed_files.append(file_to_remove.name)
-        except:
-            pass
 
-# Si se eliminaron archivos, mostrar advertencia
-if removed_files:
-    import streamlit as st
-    st.warning(f"⚠️ **REBOOT REQUERIDO**: Se eliminaron {len(removed_files)} archivo(s) obsoleto(s). "
-               f"Por favor REBOOT la app manualmente desde el dashboard de Streamlit Cloud para aplicar cambios. "
-               f"Archivos eliminados: {', '.join(removed_files[:3])}")
-    st.info("📍 **Cómo hacer reboot:** Dashboard → Encuentra 'reportes' → Click '⋮' → 'Reboot app'")
-    st.stop()
+from config import PAGE_CONFIG, MESSAGES, WATCH_INTERVAL, STARTUP_PROFILE, STARTUP_BUDGET_MS, PANDAS_COPY_ON_WRITE
 
-from config import PAGE_CONFIG, MESSAGES, WHATSAPP_FILES
+# Copy-on-Write para las vistas de los datasets compartidos (en pandas 3 ya está activo)
+if PANDAS_COPY_ON_WRITE and int(pd.__version__.split('.')[0]) < 3:
+    pd.set_option('mode.copy_on_write', True)
+from source_cache import check_for_changes, data_version, start_watcher
+from startup_profiler import STARTUP_STEPS, direct_imports, measure_imports, step, total_import_ms
 from data_loader import (
     load_sms_data,
     load_whatsapp_data,
@@ -52,9 +37,11 @@ from data_loader import (
     get_sms_flow_data,
     get_whatsapp_flow_data,
     get_sms_clicks_stats,
+    get_sms_states_estimate,
     count_total_sms_records,
     get_sms_file_size,
     count_total_interacciones_records,
+    count_total_whatsapp_records,
     get_interacciones_data,
     get_interacciones_states_summary,
     get_interacciones_by_operator,
@@ -78,6 +65,79 @@ from visualizations import (
 )
 
 
+def _remove_obsolete_files() -> list:
+    """CLEANUP: Elimina archivos sample Y CSVs grandes si existen (para limpiar cache en servidor)."""
+    files_to_remove = [
+        # Samples
+        DATA_DIR / "mensajes_whatsapp" / "whatsapp_sample.csv",
+        DATA_DIR / "mensajes_texto" / "mensajes_texto_sample.csv",
+        DATA_DIR / "mensajes_texto" / "interacciones_sample.csv",
+        # CSVs grandes (deben usar Parquet)
+        DATA_DIR / "mensajes_texto" / "mensajes_texto.csv",
+        DATA_DIR / "mensajes_texto" / "interacciones.csv",
+    ]
+    removed_files = []
+    for file_to_remove in files_to_remove:
+        if file_to_remove.exists():
+            try:
+                os.remove(file_to_remove)
+                removed_files.append(file_to_remove.name)
+            except:
+                pass
+    return removed_files
+
+
+@st.cache_resource(show_spinner=False)
+def startup() -> Dict:
+    """Inicialización única por proceso (no en cada rerun): limpieza de archivos y vigía de datos."""
+    with step("limpieza de archivos obsoletos"):
+        removed_files = _remove_obsolete_files()
+    with step("vigía de archivos de datos"):
+        start_watcher()
+    return {"removed_files": removed_files, "notified": False}
+
+
+def check_reboot_required(state: Dict):
+    """Si la limpieza eliminó archivos, muestra la advertencia de reboot una vez y detiene la ejecución."""
+    removed_files = state["removed_files"]
+    if removed_files and not state["notified"]:
+        state["notified"] = True
+        st.warning(f"⚠️ **REBOOT REQUERIDO**: Se eliminaron {len(removed_files)} archivo(s) obsoleto(s). "
+                   f"Por favor REBOOT la app manualmente desde el dashboard de Streamlit Cloud para aplicar cambios. "
+                   f"Archivos eliminados: {', '.join(removed_files[:3])}")
+        st.info("📍 **Cómo hacer reboot:** Dashboard → Encuentra 'reportes' → Click '⋮' → 'Reboot app'")
+        st.stop()
+
+
+@st.cache_resource(show_spinner=False)
+def _import_timings():
+    """Tiempos de importación de la app en un proceso limpio (solo con STARTUP_PROFILE)."""
+    return measure_imports("app")
+
+
+def render_startup_profile(first_paint: float):
+    """Muestra el perfil de arranque: tiempo hasta el primer dibujado, importaciones e inicialización."""
+    with st.sidebar.expander("⏱️ Perfil de arranque", expanded=False):
+        budget_status = "✅" if first_paint * 1000 <= STARTUP_BUDGET_MS else "⚠️"
+        st.metric("Primer dibujado", f"{first_paint * 1000:,.0f} ms", help=f"Presupuesto: {STARTUP_BUDGET_MS:,.0f} ms")
+        st.caption(f"{budget_status} Presupuesto: {STARTUP_BUDGET_MS:,.0f} ms")
+        
+        try:
+            timings = _import_timings()
+            st.markdown(f"**Importación de app:** {total_import_ms(timings, 'app'):,.0f} ms")
+            st.dataframe(pd.DataFrame(
+                [{"Módulo": t.module, "ms": round(t.cumulative_us / 1000, 1)} for t in direct_imports(timings, "app")]
+            ), hide_index=True, use_container_width=True)
+        except Exception as e:
+            st.caption(f"No se pudo medir la importación: {e}")
+        
+        if STARTUP_STEPS:
+            st.markdown("**Inicialización:**")
+            st.dataframe(pd.DataFrame(
+                [{"Paso": name, "ms": round(seconds * 1000, 1)} for name, seconds in STARTUP_STEPS.items()]
+            ), hide_index=True, use_container_width=True)
+
+
 def setup_page():
     """Configura la página de Streamlit con estilos mejorados."""
     st.set_page_config(**PAGE_CONFIG)
@@ -188,9 +248,18 @@ def render_sms_section():
     st.markdown("*Visualización de 315K+ mensajes SMS procesados*")
     
     total_sms = count_total_sms_records()
-    sms_stats = get_sms_statistics()
     file_size = get_sms_file_size()
     
+    # Modo rápido: el total sale del conteo de filas y los estados de la muestra (IC del 95%),
+    # sin pasar por el cubo ni recorrer el archivo completo
+    sms_estimates = {}
+    if st.session_state.get("estimacion_rapida", False):
+        sms_estimates = get_sms_states_estimate()
+    if sms_estimates:
+        sms_stats = {"total": total_sms, "states": {k: v["estimate"] for k, v in sms_estimates.items()}}
+    else:
+        sms_stats = get_sms_statistics()
+    
     # Métricas resumen
     st.markdown('<div class="metrics-container">', unsafe_allow_html=True)
     col1, col2, col3, col4 = st.columns(4)
@@ -204,7 +273,11 @@ def render_sms_section():
         if sms_stats["states"]:
             top_state_count = max(sms_stats["states"].values())
             top_state = [k for k, v in sms_stats["states"].items() if v == top_state_count][0]
-            st.metric("🔝 Estado Principal", top_state)
+            help_text = None
+            if top_state in sms_estimates:
+                ci = sms_estimates[top_state]
+                help_text = f"Estimado por muestreo. IC 95%: {ci['low']:,} – {ci['high']:,}"
+            st.metric("🔝 Estado Principal", top_state, help=help_text)
     st.markdown('</div>', unsafe_allow_html=True)
     
     # Tabs para diferentes análisis
@@ -229,6 +302,12 @@ def render_sms_section():
                  for state, count in sorted(sms_stats["states"].items(), key=lambda x: x[1], reverse=True)],
                 columns=["Estado", "Cantidad", "Porcentaje"]
             )
+            if sms_estimates:
+                states_df["IC 95%"] = [
+                    f"{sms_estimates[state]['low']:,} – {sms_estimates[state]['high']:,}"
+                    for state in states_df["Estado"]
+                ]
+                st.caption("⚡ Valores estimados por muestreo aleatorio estratificado")
             st.dataframe(states_df, use_container_width=True, hide_index=True)
     
     with tab2:
@@ -318,7 +397,7 @@ def render_whatsapp_section():
     num_files = len(whatsapp_stats.get('by_file', {}))
     
     # Encabezado con info de fuentes
-    file_names = ", ".join([f.name for f in WHATSAPP_FILES]) if hasattr(WHATSAPP_FILES, '__iter__') else "múltiples archivos"
+    file_names = ", ".join(whatsapp_stats.get('by_file', {}).keys()) or "múltiples archivos"
     st.markdown(f"*Análisis combinado de **{num_files} archivo(s)** con **{total_wa:,}+ mensajes** WhatsApp con validaciones de calidad*")
     st.markdown(f"<small>📂 Fuentes: {file_names}</small>", unsafe_allow_html=True)
     
@@ -950,17 +1029,27 @@ def render_sidebar():
         ✅ **Data Quality** - Validaciones avanzadas
         """)
         
+        st.markdown("---")
+        st.toggle(
+            "⚡ Estimación rápida (muestreo)",
+            key="estimacion_rapida",
+            help="Estima los estados SMS con una muestra aleatoria (±1%) e intervalos de confianza del 95%",
+        )
+        
         st.markdown("---")
         st.markdown("### 📊 Estadísticas en Caché")
         
-        # Botón para limpiar caché
-        if st.button("🔄 Recargar Datos (Limpiar Caché)", help="Haz clic para forzar recarga de todos los datos"):
-            st.cache_data.clear()
+        # Los cachés se indexan por la huella de cada archivo: el botón solo fuerza la
+        # revisión y se recalcula únicamente lo que depende de archivos modificados
+        if st.button("🔄 Recargar Datos", help="Detecta archivos nuevos o modificados y actualiza solo lo que depende de ellos"):
+            changed = check_for_changes()
+            if changed:
+                st.toast(f"Datos actualizados: {', '.join(changed)}")
             st.rerun()
         
         try:
             total_sms = count_total_sms_records()
-            whatsapp_stats = get_whatsapp_statistics()
+            total_wa = count_total_whatsapp_records()
             total_inter = count_total_interacciones_records()
             
             col1, col2 = st.columns(2)
@@ -968,7 +1057,7 @@ def render_sidebar():
                 st.metric("📱 SMS", f"{total_sms:,}")
                 st.metric("💌 Interacciones", f"{total_inter:,}")
             with col2:
-                st.metric("💬 WhatsApp", f"{whatsapp_stats['total']:,}")
+                st.metric("💬 WhatsApp", f"{total_wa:,}")
             
         except:
             st.info("⏳ Calculando estadísticas...")
@@ -990,9 +1079,8 @@ def render_sidebar():
         ### 📝 Notas Técnicas
         
         **Optimizaciones:**
-        - Muestreo estadístico (10K registros)
+        - Agregaciones exactas por lotes
         - Caché de resultados
-        - Datos extrapolados
         
         **Fecha:** 2026
         **Sistema:** Cuántico Tecnología
@@ -1003,12 +1091,27 @@ def render_sidebar():
         st.markdown('<div style="text-align: center; color: #999; font-size: 0.8rem;"><p>© 2026 Todos los derechos reservados</p></div>', unsafe_allow_html=True)
 
 
+def _watch_data_files():
+    """Vuelve a dibujar la app cuando el vigía detecta archivos de datos nuevos o modificados."""
+    version = data_version()
+    if st.session_state.setdefault("data_version", version) != version:
+        st.session_state["data_version"] = version
+        st.rerun()
+
+
+if WATCH_INTERVAL > 0 and hasattr(st, "fragment"):
+    _watch_data_files = st.fragment(run_every=WATCH_INTERVAL)(_watch_data_files)
+
+
 def main():
     """Función principal."""
     setup_page()
+    check_reboot_required(startup())
+    _watch_data_files()
     render_sidebar()
     
     render_header()
+    first_paint = time.perf_counter() - _SCRIPT_START
     render_sms_section()
     render_whatsapp_section()
     render_interacciones_section()
@@ -1019,9 +1122,12 @@ def main():
     <div style="text-align: center; color: #888; font-size: 0.85rem; padding: 2rem 0;">
         <p>📊 <strong>Análisis de Campañas de Comunicación</strong></p>
         <p>Estados de Interacción © 2026 | Cuántico Tecnología</p>
-        <p style="color: #aaa; margin-top: 0.5rem;">Datos optimizados con muestreo estadístico</p>
+        <p style="color: #aaa; margin-top: 0.5rem;">Datos agregados por lotes de forma exacta</p>
     </div>
     """, unsafe_allow_html=True)
+    
+    if STARTUP_PROFILE:
+        render_startup_profile(first_paint)
 
 
 if __name__ == "__main__":
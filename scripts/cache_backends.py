@@ -0,0 +1,275 @@
+"""
+Backends de caché para el motor de datos (data_engine).
+Un backend memoiza funciones: wrap(func) retorna una versión cacheada que recibe
+la huella de los archivos fuente (source_fingerprint) como parte de la clave.
+
+- "none": sin caché (cada llamada recalcula)
+- "memory": LRU en memoria del proceso
+- "disk": pickle por resultado en CACHE_DIR; sobrevive entre procesos, así un
+  job nocturno puede dejar los agregados listos para la app
+
+La app de Streamlit usa su propio backend (st.cache_data) definido en data_loader.
+
+Todos los backends calculan en "single-flight": si varias sesiones piden a la vez
+el mismo resultado que aún no está en caché (ej: justo después de reiniciar la
+app), lo calcula una sola y las demás esperan y reciben ese mismo resultado.
+"""
+
+import functools
+import hashlib
+import inspect
+import os
+import pickle
+import shutil
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, Hashable, Optional
+
+import config
+
+# Marca de "no está en caché" (None es un resultado válido)
+MISSING = object()
+
+
+class _Flight:
+    """Un cálculo en curso: los que esperan leen value o error cuando done se activa."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Una sola ejecución en curso por clave.
+
+    Quien pide una clave que ya se está calculando espera ese cálculo y recibe su
+    resultado (o su excepción) en lugar de repetirlo. Terminado el cálculo la
+    clave se libera: la siguiente llamada vuelve a ejecutar (el caché es aparte).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights: Dict[Hashable, _Flight] = {}
+        self.shared = 0   # llamadas que recibieron el resultado de otra
+
+    def do(self, key: Hashable, func: Callable):
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+            else:
+                self.shared += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = func()
+            return flight.value
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+
+def call_key(signature: inspect.Signature, args: tuple, kwargs: dict) -> tuple:
+    """Argumentos normalizados (valores por defecto incluidos, así f() y f(sample=True) coinciden)."""
+    bound = signature.bind(*args, **kwargs)
+    bound.apply_defaults()
+    return tuple(bound.arguments.items())
+
+
+class CacheBackend:
+    """Caché clave → valor con memoización de funciones por encima.
+
+    Las subclases implementan get/set/clear/discard_stale; wrap arma la clave con
+    el nombre de la función, la huella de las fuentes y los argumentos
+    normalizados (ver call_key), y calcula los fallos en single-flight. Cuando
+    una función recibe otra huella, se descartan sus entradas de las anteriores.
+    """
+
+    def __init__(self):
+        self.single_flight = SingleFlight()
+
+    def get(self, name: str, key: tuple, ttl: Optional[float] = None):
+        return MISSING
+
+    def set(self, name: str, key: tuple, value) -> None:
+        pass
+
+    def clear(self, name: Optional[str] = None) -> None:
+        """Elimina las entradas de una función (o todas con name=None)."""
+
+    def discard_stale(self, name: str, source_fingerprint: tuple) -> None:
+        """Elimina las entradas de una función calculadas con otra huella de sus fuentes."""
+
+    def wrap(self, func: Callable, ttl: Optional[float] = None, shared: bool = False) -> Callable:
+        """Versión cacheada de func; ttl en segundos (None = sin vencimiento).
+
+        shared=True indica que el resultado es de solo lectura y puede entregarse sin
+        copiar. Los backends de aquí no copian (el LRU ya comparte el objeto), así que
+        lo ignoran; lo usan los que copian cada resultado, como el de Streamlit.
+        """
+        name = f"{func.__module__}.{func.__qualname__}"
+        signature = inspect.signature(func)
+
+        def compute(key, args, kwargs):
+            # Otro llamador pudo terminar el cálculo mientras este esperaba su turno
+            value = self.get(name, key, ttl)
+            if value is MISSING:
+                value = func(*args, **kwargs)
+                self.set(name, key, value)
+            return value
+
+        last_fingerprint = [MISSING]
+
+        @functools.wraps(func)
+        def cached(*args, source_fingerprint=(), **kwargs):
+            # Archivos nuevos o modificados: los resultados de la huella anterior ya no se piden
+            if source_fingerprint != last_fingerprint[0]:
+                last_fingerprint[0] = source_fingerprint
+                self.discard_stale(name, source_fingerprint)
+            key = (source_fingerprint, call_key(signature, args, kwargs))
+            value = self.get(name, key, ttl)
+            if value is MISSING:
+                value = self.single_flight.do((name, key), lambda: compute(key, args, kwargs))
+            return value
+
+        cached.clear = lambda: self.clear(name)
+        return cached
+
+
+class NullCache(CacheBackend):
+    """Sin caché: útil en jobs que recorren cada dato una sola vez."""
+
+
+class LRUCache(CacheBackend):
+    """Caché en memoria con desalojo LRU (los resultados se comparten: no modificarlos)."""
+
+    def __init__(self, max_entries: Optional[int] = None):
+        super().__init__()
+        self.max_entries = max_entries if max_entries is not None else config.CACHE_MAX_ENTRIES
+        self._entries: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, name, key, ttl=None):
+        with self._lock:
+            entry = self._entries.get((name, key))
+            if entry is None:
+                return MISSING
+            created, value = entry
+            if ttl is not None and time.time() - created > ttl:
+                del self._entries[(name, key)]
+                return MISSING
+            self._entries.move_to_end((name, key))
+            return value
+
+    def set(self, name, key, value):
+        with self._lock:
+            self._entries[(name, key)] = (time.time(), value)
+            self._entries.move_to_end((name, key))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self, name=None):
+        with self._lock:
+            if name is None:
+                self._entries.clear()
+            else:
+                for entry_key in [k for k in self._entries if k[0] == name]:
+                    del self._entries[entry_key]
+
+    def discard_stale(self, name, source_fingerprint):
+        with self._lock:
+            for entry_key in [k for k in self._entries if k[0] == name and k[1][0] != source_fingerprint]:
+                del self._entries[entry_key]
+
+
+def _digest(value) -> str:
+    return hashlib.blake2b(repr(value).encode('utf-8'), digest_size=16).hexdigest()
+
+
+class DiskCache(CacheBackend):
+    """Caché en disco: un pickle por resultado en <directory>/<función>/<hash de la huella>/<hash de los argumentos>.pkl.
+
+    Cuando una función recibe otra huella de sus fuentes se borran los
+    directorios de las huellas anteriores, así el caché no crece con cada
+    actualización de los datos.
+    """
+
+    def __init__(self, directory: Optional[Path] = None):
+        super().__init__()
+        self.directory = Path(directory if directory is not None else config.CACHE_DIR)
+
+    def _path(self, name: str, key: tuple) -> Path:
+        source_fingerprint, arguments = key
+        return self.directory / name / _digest(source_fingerprint) / f"{_digest(arguments)}.pkl"
+
+    def get(self, name, key, ttl=None):
+        path = self._path(name, key)
+        try:
+            if ttl is not None and time.time() - path.stat().st_mtime > ttl:
+                return MISSING
+            with open(path, 'rb') as f:
+                return pickle.load(f)
+        except (OSError, pickle.PickleError, EOFError):
+            return MISSING
+
+    def set(self, name, key, value):
+        """Escribe de forma atómica (archivo temporal + os.replace)."""
+        path = self._path(name, key)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except (OSError, pickle.PickleError) as e:
+            # Directorio de solo lectura o resultado no serializable: simplemente no se persiste
+            print(f"DEBUG: No se pudo guardar en caché {name}: {e}")
+
+    def clear(self, name=None):
+        shutil.rmtree(self.directory / name if name else self.directory, ignore_errors=True)
+
+    def discard_stale(self, name, source_fingerprint):
+        current = _digest(source_fingerprint)
+        try:
+            entries = list((self.directory / name).iterdir())
+        except OSError:
+            return
+        for entry in entries:
+            if entry.name == current:
+                continue
+            # Directorios de huellas anteriores (y pickles del formato sin directorio por huella)
+            if entry.is_dir():
+                shutil.rmtree(entry, ignore_errors=True)
+            else:
+                try:
+                    entry.unlink()
+                except OSError:
+                    pass
+
+
+BACKENDS = {
+    "none": NullCache,
+    "memory": LRUCache,
+    "disk": DiskCache,
+}
+
+
+def make_backend(name: Optional[str] = None) -> CacheBackend:
+    """Crea el backend por nombre ("none", "memory", "disk"); por defecto config.CACHE_BACKEND."""
+    name = name or config.CACHE_BACKEND
+    if name not in BACKENDS:
+        raise ValueError(f"Backend de caché desconocido: {name} (opciones: {', '.join(BACKENDS)})")
+    return BACKENDS[name]()
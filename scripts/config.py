@@ -2,6 +2,7 @@
 Configuración centralizada para la aplicación de visualización de estados de mensajes.
 """
 
+import os
 from pathlib import Path
 from typing import Dict, List
 
@@ -74,9 +75,22 @@ def _resolve_whatsapp_files() -> List[Path]:
     return parquet_samples + csv_samples
 
 
-SMS_FILE = _resolve_sms_file()
-INTERACCIONES_FILE = _resolve_interacciones_file()
-WHATSAPP_FILES = _resolve_whatsapp_files()
+# SMS_FILE, INTERACCIONES_FILE y WHATSAPP_FILES se resuelven en el primer acceso
+# (importar config no recorre los directorios de datos). La app y el motor
+# resuelven las rutas en cada llamada (ver source_cache.SOURCES).
+_LAZY_PATHS = {
+    "SMS_FILE": "_resolve_sms_file",
+    "INTERACCIONES_FILE": "_resolve_interacciones_file",
+    "WHATSAPP_FILES": "_resolve_whatsapp_files",
+}
+
+
+def __getattr__(name: str):
+    if name in _LAZY_PATHS:
+        value = globals()[_LAZY_PATHS[name]]()
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # Configuración de lectura de CSV
 CSV_ENCODING = {
@@ -84,6 +98,60 @@ CSV_ENCODING = {
     "whatsapp": "utf-8",
 }
 
+# Filas por lote al recorrer archivos completos (agregaciones exactas)
+SCAN_BATCH_SIZE = 100_000
+
+# Ingesta paralela de exports WhatsApp
+# WHATSAPP_LOAD_EXECUTOR: "thread" (Parquet y CSV) o "process" (solo CSV; Parquet siempre usa hilos)
+WHATSAPP_LOAD_WORKERS = int(os.getenv("WHATSAPP_LOAD_WORKERS", min(8, os.cpu_count() or 1)))
+WHATSAPP_LOAD_EXECUTOR = os.getenv("WHATSAPP_LOAD_EXECUTOR", "thread")
+
+# Almacenamiento de columnas de texto (Mensaje, Referencia, First reply message...)
+# "pyarrow": large_string de Arrow; .str.len()/.str.lower() corren sobre kernels de Arrow
+# "python": StringDtype("python"), un objeto str de Python por celda
+STRING_STORAGE = os.getenv("STRING_STORAGE", "pyarrow")
+
+# Modo out-of-core: "auto" (solo si el archivo completo no cabe en MEMORY_LIMIT_MB), "on" u "off"
+OUT_OF_CORE = os.getenv("OUT_OF_CORE", "auto")
+# Techo de memoria para datos cargados y estados intermedios de agregación (MB)
+MEMORY_LIMIT_MB = int(os.getenv("MEMORY_LIMIT_MB", 1024))
+# Copy-on-Write de pandas en la app: los datasets compartidos entre sesiones se entregan como vistas
+# sin copia (data_engine.shared_view). Desde pandas 3 siempre está activo; con pandas 2 lo activa
+# app.py al arrancar. El motor no cambia la opción: scripts y jobs conservan la semántica de su pandas.
+PANDAS_COPY_ON_WRITE = os.getenv("PANDAS_COPY_ON_WRITE", "1") == "1"
+
+# Cargas "completas" (load_sms_data(sample=False), get_interacciones_messages() sin limit) que no caben en el techo:
+# "0" se cargan completas igual y solo se avisa; "1" se cortan en las primeras filas que caben (ver data_engine.is_truncated)
+OUT_OF_CORE_TRUNCATE = os.getenv("OUT_OF_CORE_TRUNCATE", "0") == "1"
+# Directorio para volcar estados de group-by que no caben en memoria (por defecto el temporal del sistema)
+SPILL_DIR = os.getenv("SPILL_DIR") or None
+
+# Cada cuántos segundos se revisan las huellas (ruta, tamaño, mtime) de los archivos de datos; 0 desactiva el vigía
+WATCH_INTERVAL = float(os.getenv("WATCH_INTERVAL", 5))
+
+# Caché del motor de datos fuera de Streamlit (jobs y scripts): "memory" (LRU), "disk" o "none"
+# Con "disk" la app también consulta los resultados que dejó un job nocturno
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory")
+# Entradas máximas del caché LRU en memoria
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", 128))
+# Directorio del caché en disco
+CACHE_DIR = Path(os.getenv("CACHE_DIR", DATA_DIR / ".cache"))
+
+# Almacén de validaciones de números (LRU en memoria delante de una tabla SQLite)
+# VALIDATION_STORE_PATH vacío: solo memoria
+_VALIDATION_STORE_PATH = os.getenv("VALIDATION_STORE_PATH", str(CACHE_DIR / "validaciones.sqlite"))
+VALIDATION_STORE_PATH = Path(_VALIDATION_STORE_PATH) if _VALIDATION_STORE_PATH else None
+# Números guardados en el LRU del proceso
+VALIDATION_CACHE_ENTRIES = int(os.getenv("VALIDATION_CACHE_ENTRIES", 100_000))
+
+# Directorio de los planes de numeración versionados (un JSON por plan; ver phone_validator)
+NUMBERING_PLAN_DIR = Path(os.getenv("NUMBERING_PLAN_DIR", BASE_DIR / "scripts" / "planes_numeracion"))
+
+# Perfil de arranque: STARTUP_PROFILE=1 muestra en la app los tiempos de importación e inicialización
+STARTUP_PROFILE = os.getenv("STARTUP_PROFILE", "0") == "1"
+# Presupuesto para importar la app e inicializarla hasta el primer dibujado (ms)
+STARTUP_BUDGET_MS = float(os.getenv("STARTUP_BUDGET_MS", 1500))
+
 # Delimitadores
 DELIMITERS = {
     "sms": ";",
@@ -107,6 +175,13 @@ SMS_COLUMNS = [
     "Total Clicks URL 3",
 ]
 
+# Columnas de clicks por URL en SMS
+SMS_CLICK_COLUMNS = [
+    "Total Clicks URL 1",
+    "Total Clicks URL 2",
+    "Total Clicks URL 3",
+]
+
 # Columnas relevantes para WhatsApp
 WHATSAPP_COLUMNS = [
     "Nick name",
@@ -120,6 +195,22 @@ WHATSAPP_COLUMNS = [
     "First reply message",
 ]
 
+# Formatos exactos de las columnas de fecha (se parsean una sola vez al cargar cada dataset)
+DATE_FORMATS = {
+    "Fecha de Carga": "%Y-%m-%d %H:%M:%S",
+    "Fecha y hora procesado": "%Y-%m-%d %H:%M:%S",
+    "Date Sent": "%Y-%m-%d %H:%M:%S",
+    "Date Delivered": "%Y-%m-%d %H:%M:%S",
+    "Date Read": "%Y-%m-%d %H:%M:%S",
+    "Date First replied": "%Y-%m-%d %H:%M:%S",
+}
+
+# Columna de fecha que define la dimensión "hora" del cubo OLAP
+CUBE_HOUR_COLUMN = "Fecha de Carga"
+
+# Valores que significan "sin fecha" (WhatsApp usa '-' para mensajes no entregados/leídos)
+DATE_PLACEHOLDERS = ["-", ""]
+
 # Estados posibles según el esquema de flujo
 FLOW_STATES = {
     "initial_state": "Leído",
@@ -0,0 +1,129 @@
+"""
+Cubo OLAP preagregado para el dashboard.
+Cada celda guarda conteos y sumas de clicks para una combinación de
+(canal, estado, operador, código corto, usuario, hora, total de mensajes).
+El cubo se construye una vez por versión de los datos, se guarda como Parquet
+junto al archivo y cada gráfico es un roll-up sobre sus celdas en lugar de
+recorrer las filas crudas.
+"""
+
+from typing import Dict, Iterable, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from out_of_core import SpillingAggregator
+
+# Dimensiones del cubo (None/NaN cuando el canal no tiene esa columna, ej: código corto en SMS)
+CUBE_DIMENSIONS = ["channel", "state", "operator", "codigo", "usuario", "hour", "messages"]
+
+# Medidas sumables por celda
+CUBE_MEASURES = [
+    "count",
+    "with_clicks_1", "with_clicks_2", "with_clicks_3",
+    "total_clicks_1", "total_clicks_2", "total_clicks_3",
+    "with_any_click",
+]
+
+def batch_cells(channel: str, n: int, state=None, operator=None, codigo=None, usuario=None,
+                hour=None, messages=None, clicks: Optional[np.ndarray] = None) -> pd.DataFrame:
+    """Agrupa un lote de filas crudas en celdas del cubo.
+
+    Args:
+        channel: Canal del lote ('sms', 'interacciones')
+        n: Filas del lote
+        state, operator, codigo, usuario, hour, messages: Columnas del lote para cada
+            dimensión (None si el archivo no la tiene)
+        clicks: Matriz n×3 de clicks por URL (None si el canal no tiene clicks)
+
+    Returns:
+        DataFrame con una fila por celda: dimensiones + medidas
+    """
+    rows = {"channel": np.full(n, channel, dtype=object)}
+    for name, values in (("state", state), ("operator", operator), ("codigo", codigo),
+                         ("usuario", usuario), ("hour", hour), ("messages", messages)):
+        rows[name] = np.full(n, None, dtype=object) if values is None else _plain_values(values)
+
+    rows["count"] = np.ones(n, dtype=np.int64)
+    if clicks is None:
+        clicks = np.zeros((n, 3), dtype=np.int64)
+    for i in range(3):
+        rows[f"with_clicks_{i + 1}"] = (clicks[:, i] > 0).astype(np.int64)
+        rows[f"total_clicks_{i + 1}"] = clicks[:, i].astype(np.int64)
+    rows["with_any_click"] = (clicks > 0).any(axis=1).astype(np.int64)
+
+    return _regroup(pd.DataFrame(rows))
+
+
+def _plain_values(values) -> np.ndarray:
+    """Columna como arreglo de objetos Python (str/int/None), sin categorías ni NA de pandas."""
+    series = pd.Series(values).astype(object)
+    return series.where(series.notna(), None).to_numpy()
+
+
+def _regroup(cells: pd.DataFrame) -> pd.DataFrame:
+    """Suma las medidas de celdas con las mismas dimensiones."""
+    return cells.groupby(CUBE_DIMENSIONS, dropna=False, sort=False)[CUBE_MEASURES].sum().reset_index()
+
+
+def build_cube(batches: Iterable[pd.DataFrame], memory_limit: Optional[int] = None) -> pd.DataFrame:
+    """Construye el cubo a partir de las celdas parciales de cada lote.
+    
+    Los parciales se acumulan en un SpillingAggregator: si las celdas superan
+    memory_limit (por defecto una fracción de MEMORY_LIMIT_MB) se vuelcan a disco.
+    """
+    with SpillingAggregator(CUBE_DIMENSIONS, CUBE_MEASURES, memory_limit=memory_limit) as aggregator:
+        for cells in batches:
+            aggregator.add(cells)
+        parts = list(aggregator.iter_results())
+
+    if not parts:
+        cube = pd.DataFrame({name: pd.Series(dtype=object) for name in CUBE_DIMENSIONS})
+        cube = cube.assign(**{name: pd.Series(dtype=np.int64) for name in CUBE_MEASURES})
+    else:
+        cube = pd.concat(parts, ignore_index=True)
+    return compact_cube(cube)
+
+
+def compact_cube(cube: pd.DataFrame) -> pd.DataFrame:
+    """Dimensiones como categorías (dictionary encoding en Parquet) y medidas int64."""
+    cube = cube.copy()
+    for name in CUBE_DIMENSIONS:
+        cube[name] = cube[name].astype(object).astype('category')
+    for name in CUBE_MEASURES:
+        cube[name] = cube[name].astype(np.int64)
+    return cube
+
+
+def rollup(cube: pd.DataFrame, by: Sequence[str] = (), where: Optional[Dict] = None,
+           exclude: Optional[Dict] = None, measures: Sequence[str] = ("count",)) -> pd.DataFrame:
+    """Roll-up del cubo: filtra celdas y suma medidas agrupando por las dimensiones pedidas.
+
+    Args:
+        cube: Cubo (ver build_cube)
+        by: Dimensiones del resultado (vacío = un solo total)
+        where: {dimensión: valor o lista de valores} que se conservan
+        exclude: {dimensión: valor o lista de valores} que se descartan (los nulos se conservan)
+        measures: Medidas a sumar
+
+    Returns:
+        DataFrame con las columnas de by + measures, ordenado por la primera medida (desc)
+    """
+    mask = np.ones(len(cube), dtype=bool)
+    for name, values in (where or {}).items():
+        mask &= cube[name].isin(_as_list(values)).to_numpy()
+    for name, values in (exclude or {}).items():
+        mask &= ~cube[name].isin(_as_list(values)).to_numpy()
+
+    selected = cube.loc[mask]
+    measures = list(measures)
+    if not by:
+        return selected[measures].sum().to_frame().T.astype(np.int64)
+
+    result = selected.groupby(list(by), observed=True, dropna=False)[measures].sum().reset_index()
+    result = result[result[measures[0]] > 0]
+    return result.sort_values(measures[0], ascending=False, kind="stable").reset_index(drop=True)
+
+
+def _as_list(values) -> list:
+    return list(values) if isinstance(values, (list, tuple, set)) else [values]
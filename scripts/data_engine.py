@@ -0,0 +1,1454 @@
+"""
+Motor de datos: carga y agregación de SMS, WhatsApp e interacciones.
+Especializado en trabajar con archivos grandes sin cargarlos completamente en memoria.
+Soporta tanto CSV como Parquet (priorizando Parquet por su eficiencia).
+
+No depende de Streamlit: sirve igual para la app (ver data_loader), scripts y
+jobs por lotes. Los resultados se cachean con el backend de source_cache
+(config.CACHE_BACKEND) y los avisos pasan por set_notifier().
+"""
+
+import pandas as pd
+import numpy as np
+import threading
+import time
+from pathlib import Path
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Dict, Iterator, List, Tuple, Optional
+import config
+from config import (
+    SMS_COLUMNS,
+    SMS_CLICK_COLUMNS,
+    WHATSAPP_COLUMNS,
+    CSV_ENCODING,
+    DELIMITERS,
+    SCAN_BATCH_SIZE,
+    WHATSAPP_LOAD_WORKERS,
+    WHATSAPP_LOAD_EXECUTOR,
+    CUBE_HOUR_COLUMN,
+    DATE_FORMATS,
+)
+from aggregate_store import cached_aggregate, cached_table, load_aggregate
+from cube import CUBE_MEASURES, batch_cells, build_cube, compact_cube, rollup
+from date_parsing import parse_date_columns, parse_date_columns_arrow, parse_datetime
+from out_of_core import SpillingAggregator, rows_within_limit
+from row_counter import cached_row_count
+from source_cache import cached_on, source_paths
+from sampling import estimate_counts, sample_file, sample_size_for_error
+
+
+def _print_notice(level: str, message: str) -> None:
+    """Notificador por defecto: imprime en consola."""
+    print(f"⚠️ {message}" if level == "warning" else message)
+
+
+_notifier: Callable[[str, str], None] = _print_notice
+
+
+def set_notifier(notifier: Callable[[str, str], None]) -> None:
+    """Cambia a dónde van los avisos del motor: notifier(nivel, mensaje), nivel 'info' o 'warning'."""
+    global _notifier
+    _notifier = notifier
+
+
+def _notify(level: str, message: str) -> None:
+    _notifier(level, message)
+
+
+def _dataset(filepath: Path, **kwargs):
+    """Abre un archivo CSV o Parquet como pyarrow.dataset para empujar filtros al escáner.
+    
+    Args:
+        filepath: Ruta al archivo
+        **kwargs: encoding, delimiter y dtype con la misma semántica de pd.read_csv()
+                  (solo se usan en CSV)
+    
+    Returns:
+        pyarrow.dataset.Dataset sobre el archivo
+    """
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    
+    if filepath.suffix == '.parquet':
+        # Columnas 'category' se leen con dictionary encoding → Categorical en pandas
+        parquet_format = ds.ParquetFileFormat(
+            read_options=ds.ParquetReadOptions(dictionary_columns=_dictionary_columns(kwargs.get('dtype')))
+        )
+        return ds.dataset(filepath, format=parquet_format)
+    
+    import pyarrow.csv as pacsv
+    
+    # Columnas de texto se leen como string para no perder ceros a la izquierda
+    dtype = kwargs.get('dtype') or {}
+    column_types = {col: pa.string() for col, t in dtype.items() if t in ('string', 'category')}
+    csv_format = ds.CsvFileFormat(
+        read_options=pacsv.ReadOptions(encoding=kwargs.get('encoding', 'utf8')),
+        parse_options=pacsv.ParseOptions(delimiter=kwargs.get('delimiter', ','), newlines_in_values=True),
+        convert_options=pacsv.ConvertOptions(column_types=column_types),
+    )
+    return ds.dataset(filepath, format=csv_format)
+
+
+def _dictionary_columns(dtype: Optional[Dict]) -> List[str]:
+    """Columnas declaradas 'category' en un mapeo de dtypes (se leen dictionary-encoded de Parquet)."""
+    return [col for col, col_type in (dtype or {}).items() if col_type == 'category']
+
+
+def _string_dtype():
+    """Dtype de las columnas de texto según config.STRING_STORAGE."""
+    if config.STRING_STORAGE == "pyarrow":
+        import pyarrow as pa
+        return pd.ArrowDtype(pa.large_string())
+    return pd.StringDtype("python")
+
+
+def _resolve_dtypes(dtype: Optional[Dict]) -> Optional[Dict]:
+    """Reemplaza 'string' en un mapeo de dtypes por el almacenamiento de texto configurado."""
+    if not dtype:
+        return dtype
+    string_dtype = _string_dtype()
+    return {col: string_dtype if col_type == 'string' else col_type for col, col_type in dtype.items()}
+
+
+def _to_pandas(table) -> pd.DataFrame:
+    """Convierte una tabla o lote de Arrow a pandas.
+    
+    Con STRING_STORAGE="pyarrow" las columnas de texto quedan como large_string
+    de Arrow en lugar de un objeto str de Python por celda; las columnas con
+    dictionary encoding siguen llegando como Categorical.
+    """
+    import pyarrow as pa
+    string_dtype = _string_dtype()
+    
+    def types_mapper(pa_type):
+        if pa.types.is_string(pa_type) or pa.types.is_large_string(pa_type):
+            return string_dtype
+        return None
+    
+    return table.to_pandas(types_mapper=types_mapper)
+
+
+def _copy_on_write() -> bool:
+    """Si pandas tiene Copy-on-Write activo (siempre desde pandas 3; en pandas 2 lo activa la app al arrancar)."""
+    if int(pd.__version__.split('.')[0]) >= 3:
+        return True
+    return pd.get_option('mode.copy_on_write') is True
+
+
+def shared_view(df: pd.DataFrame) -> pd.DataFrame:
+    """Vista de un dataset compartido entre sesiones.
+    
+    Con Copy-on-Write comparte los datos del original sin copiarlos: modificar la
+    vista (asignar columnas, cambiar valores) copia solo lo modificado y el
+    dataset compartido queda intacto. El motor no cambia opciones globales de
+    pandas; sin Copy-on-Write (pandas 2 fuera de la app) entrega una copia.
+    """
+    return df.copy(deep=not _copy_on_write())
+
+
+def _apply_dtypes(df: pd.DataFrame, dtype: Optional[Dict]) -> pd.DataFrame:
+    """Aplica un mapeo de dtypes estilo pd.read_csv() a las columnas presentes."""
+    for col, col_type in (_resolve_dtypes(dtype) or {}).items():
+        if col in df.columns:
+            try:
+                df[col] = df[col].astype(col_type)
+            except (TypeError, ValueError):
+                pass
+    return df
+
+
+def _read_file(filepath: Path, filters=None, **kwargs) -> pd.DataFrame:
+    """Lee un archivo CSV o Parquet automáticamente según su extensión.
+    
+    Args:
+        filepath: Ruta al archivo
+        filters: Expresión pyarrow.compute opcional. Se empuja al escáner de
+                 pyarrow.dataset, así las filas excluidas nunca se decodifican
+        **kwargs: Argumentos adicionales para pd.read_csv() o pd.read_parquet()
+    
+    Returns:
+        DataFrame con los datos cargados (o iterador si chunksize está activo en CSV)
+    """
+    if filters is not None:
+        dataset = _dataset(filepath, **kwargs)
+        columns = kwargs.get('usecols')
+        nrows = kwargs.get('nrows')
+        if nrows is not None:
+            table = dataset.head(nrows, columns=columns, filter=filters)
+        else:
+            table = dataset.to_table(columns=columns, filter=filters)
+        
+        return _apply_dtypes(_to_pandas(table), kwargs.get('dtype'))
+    
+    if filepath.suffix == '.parquet':
+        import pyarrow.parquet as pq
+        
+        # Para Parquet, usar columns parameter nativo si hay usecols
+        usecols = kwargs.pop('usecols', None)
+        dtype = kwargs.get('dtype')
+        nrows = kwargs.get('nrows')
+        
+        # Mantener dictionary encoding de Arrow para las columnas 'category':
+        # to_pandas() las convierte en Categorical sin pasar por strings de Python
+        if nrows is not None:
+            table = _read_parquet_head(filepath, nrows, columns=usecols or None, dtype=dtype)
+        else:
+            table = pq.read_table(
+                filepath,
+                columns=usecols or None,
+                read_dictionary=_dictionary_columns(dtype) or None,
+            )
+        
+        return _apply_dtypes(_to_pandas(table), dtype)
+    else:
+        # CSV usa los argumentos originales (incluyendo chunksize para iteración)
+        return pd.read_csv(filepath, **{**kwargs, 'dtype': _resolve_dtypes(kwargs.get('dtype'))})
+
+
+def _parquet_file(filepath: Path, dtype: Optional[Dict] = None):
+    """Abre un Parquet con dictionary encoding para las columnas 'category' presentes en el archivo.
+    
+    read_dictionary falla si nombra una columna que el archivo no tiene, y los
+    mapeos de dtypes declaran columnas de varias versiones del export.
+    """
+    import pyarrow.parquet as pq
+    
+    names = set(pq.read_schema(filepath).names)
+    read_dictionary = [col for col in _dictionary_columns(dtype) if col in names]
+    return pq.ParquetFile(filepath, read_dictionary=read_dictionary or None)
+
+
+def _read_parquet_head(filepath: Path, nrows: int, columns: Optional[List[str]] = None,
+                       dtype: Optional[Dict] = None):
+    """Lee solo las primeras nrows filas de un Parquet.
+    
+    Recorre el archivo con ParquetFile.iter_batches y se detiene en cuanto junta
+    nrows filas, así una vista previa de 100 filas decodifica un solo lote en
+    lugar del archivo completo.
+    """
+    import pyarrow as pa
+    
+    parquet_file = _parquet_file(filepath, dtype)
+    if nrows >= parquet_file.metadata.num_rows:
+        return parquet_file.read(columns=columns)
+    
+    batches = []
+    rows = 0
+    for batch in parquet_file.iter_batches(batch_size=max(1, min(nrows, SCAN_BATCH_SIZE)), columns=columns):
+        batches.append(batch)
+        rows += batch.num_rows
+        if rows >= nrows:
+            break
+    return pa.Table.from_batches(batches).slice(0, nrows)
+
+
+def _iter_batches(filepath: Path, columns: List[str], batch_size: int = SCAN_BATCH_SIZE,
+                  filters=None, **kwargs) -> Iterator[pd.DataFrame]:
+    """Recorre un archivo CSV o Parquet por lotes sin cargarlo completo en memoria.
+    
+    Args:
+        filepath: Ruta al archivo
+        columns: Columnas a leer
+        batch_size: Cantidad de filas por lote
+        filters: Expresión pyarrow.compute opcional que se empuja al escáner
+        **kwargs: Argumentos adicionales para pd.read_csv() (ignorados en Parquet)
+    
+    Yields:
+        DataFrame con cada lote de filas
+    """
+    if filters is not None:
+        dataset = _dataset(filepath, **kwargs)
+        for batch in dataset.to_batches(columns=columns, filter=filters, batch_size=batch_size):
+            yield _apply_dtypes(_to_pandas(batch), kwargs.get('dtype'))
+    elif filepath.suffix == '.parquet':
+        dtype = kwargs.get('dtype')
+        parquet_file = _parquet_file(filepath, dtype)
+        for batch in parquet_file.iter_batches(batch_size=batch_size, columns=columns):
+            yield _apply_dtypes(_to_pandas(batch), dtype)
+    else:
+        yield from pd.read_csv(filepath, usecols=columns, chunksize=batch_size,
+                               **{**kwargs, 'dtype': _resolve_dtypes(kwargs.get('dtype'))})
+
+
+def _count_rows(filepath: Path, filters=None, **kwargs) -> int:
+    """Cuenta filas sin construir un DataFrame.
+    
+    En Parquet sin filtro usa solo los metadatos; con filtro el escáner de
+    pyarrow.dataset decodifica únicamente las columnas del filtro.
+    """
+    return _dataset(filepath, **kwargs).count_rows(filter=filters)
+
+
+def _sms_file() -> Path:
+    """Archivo SMS actual (se resuelve en cada llamada: detecta un .parquet nuevo o un archivo reemplazado)."""
+    return source_paths("sms")[0]
+
+
+def _interacciones_file() -> Path:
+    """Archivo de interacciones actual (se resuelve en cada llamada)."""
+    return source_paths("interacciones")[0]
+
+
+def _rows_within_limit(filepath: Path, columns: List[str], **read_kwargs) -> Optional[int]:
+    """Filas a leer en una carga completa (None = archivo completo).
+    
+    Las métricas y gráficos recorren el archivo por lotes y no dependen de esto.
+    Si la tabla completa no cabe en MEMORY_LIMIT_MB se carga igual y solo se
+    avisa; cortarla en las primeras filas que caben es opcional
+    (config.OUT_OF_CORE_TRUNCATE) y el resultado queda marcado (ver is_truncated).
+    """
+    nrows = rows_within_limit(filepath, columns, **read_kwargs)
+    if nrows is None:
+        return None
+    if not config.OUT_OF_CORE_TRUNCATE:
+        _notify(
+            "warning",
+            f"{filepath.name} ocupa más que el límite de memoria y se carga completo "
+            f"(OUT_OF_CORE_TRUNCATE=1 carga solo las primeras {nrows:,} filas)."
+        )
+        return None
+    _notify(
+        "warning",
+        f"{filepath.name} no cabe en el límite de memoria: se cargan solo las primeras {nrows:,} filas. "
+        "Las métricas y gráficos se calculan sobre el archivo completo."
+    )
+    return nrows
+
+
+def _mark_truncation(df: pd.DataFrame, nrows: Optional[int]) -> pd.DataFrame:
+    """Marca si una carga completa se cortó en nrows filas por el límite de memoria."""
+    df.attrs['truncated'] = nrows is not None and len(df) >= nrows
+    return df
+
+
+def is_truncated(df: pd.DataFrame) -> bool:
+    """Si el DataFrame de una carga completa trae solo las primeras filas del archivo (OUT_OF_CORE_TRUNCATE)."""
+    return bool(df.attrs.get('truncated', False))
+
+
+@cached_on("sms", shared=True)
+def _sms_frame(sample: bool, sample_size: int) -> pd.DataFrame:
+    """DataFrame SMS compartido por el proceso (no modificar: usar load_sms_data)."""
+    sms_file = _sms_file()
+    try:
+        if not sms_file.exists():
+            _notify("warning", "No se encontró el archivo SMS. Asegúrate de colocar tus datos en data/mensajes_texto/.")
+            return pd.DataFrame()
+
+        dtypes = {
+            "Id": "int32",
+            "Celular": "category",
+            "Mensaje": "string",
+            "Fecha Envio": "string",
+            "Fecha Proceso": "string",
+            "Estado del envio": "category",
+            "Referencia": "string",
+            "Usuario": "category",
+            "Operador": "category",
+            "Tipo Mensaje": "category",
+            "Total Clicks URL 1": "Int16",
+            "Total Clicks URL 2": "Int16",
+            "Total Clicks URL 3": "Int16",
+        }
+        
+        memory_limit = None if sample else _rows_within_limit(
+            sms_file, SMS_COLUMNS, encoding=CSV_ENCODING["sms"], delimiter=DELIMITERS["sms"]
+        )
+        nrows = sample_size if sample else memory_limit
+        
+        df = _read_file(
+            sms_file,
+            encoding=CSV_ENCODING["sms"],
+            delimiter=DELIMITERS["sms"],
+            usecols=SMS_COLUMNS,
+            nrows=nrows,
+            dtype=dtypes,
+            low_memory=False,
+        )
+        
+        # Fechas a datetime64 con su formato exacto (el resultado queda en el caché del dataset)
+        return _mark_truncation(parse_date_columns(df), memory_limit)
+    except Exception as e:
+        _notify("warning", f"Error cargando SMS: {e}")
+        return pd.DataFrame()
+
+
+def load_sms_data(sample: bool = True, sample_size: int = 10000) -> pd.DataFrame:
+    """Carga datos SMS optimizados.
+    
+    El dataset se carga una vez por proceso y se comparte entre sesiones; cada
+    llamada recibe una vista Copy-on-Write (ver shared_view).
+    """
+    return shared_view(_sms_frame(sample, sample_size))
+
+
+def _read_whatsapp_table(wa_file: Path):
+    """Lee un export de WhatsApp como tabla Arrow con la columna 'source_file'.
+    
+    'Error Code' se normaliza a string para que los archivos se puedan unir
+    aunque un export lo traiga numérico y otro como texto (o no lo traiga).
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    
+    if wa_file.suffix == '.parquet':
+        table = pq.read_table(wa_file)
+    else:
+        df = pd.read_csv(
+            wa_file,
+            encoding=CSV_ENCODING["whatsapp"],
+            delimiter=DELIMITERS["whatsapp"],
+            dtype={"Error Code": "string"},
+        )
+        table = pa.Table.from_pandas(df, preserve_index=False)
+    
+    if 'Error Code' in table.column_names and table.schema.field('Error Code').type != pa.string():
+        idx = table.column_names.index('Error Code')
+        table = table.set_column(idx, 'Error Code', table.column('Error Code').cast(pa.string()))
+    
+    # Fechas parseadas una sola vez por archivo; la tabla queda en el caché por archivo
+    table = parse_date_columns_arrow(table)
+    
+    source_file = pa.DictionaryArray.from_arrays(
+        pa.array(np.zeros(table.num_rows, dtype=np.int32)),
+        pa.array([wa_file.name]),
+    )
+    return table.append_column('source_file', source_file)
+
+
+def _timed_read_whatsapp_table(wa_file: Path):
+    """Lee un export de WhatsApp y mide su tiempo. Retorna (tabla, segundos, error)."""
+    start = time.perf_counter()
+    try:
+        return _read_whatsapp_table(wa_file), time.perf_counter() - start, None
+    except Exception as e:
+        return None, time.perf_counter() - start, str(e)
+
+
+def _read_whatsapp_tables(files: List[Path], max_workers: int = WHATSAPP_LOAD_WORKERS,
+                          executor: str = WHATSAPP_LOAD_EXECUTOR) -> List[Tuple]:
+    """Decodifica los exports de WhatsApp en paralelo, conservando el orden de los archivos.
+    
+    Parquet siempre usa hilos (pyarrow libera el GIL). Los CSV usan procesos si
+    executor == "process", porque el parser de pandas retiene el GIL en parte.
+    
+    Returns:
+        Lista de tuplas (archivo, tabla, segundos, error) en el mismo orden de files
+    """
+    if max_workers <= 1 or len(files) <= 1:
+        return [(f, *_timed_read_whatsapp_table(f)) for f in files]
+    
+    csv_files = [f for f in files if f.suffix != '.parquet']
+    results = {}
+    
+    if executor == "process" and csv_files:
+        with ProcessPoolExecutor(max_workers=min(max_workers, len(csv_files))) as pool:
+            for f, result in zip(csv_files, pool.map(_timed_read_whatsapp_table, csv_files)):
+                results[f] = result
+    
+    pending = [f for f in files if f not in results]
+    if pending:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(pending))) as pool:
+            for f, result in zip(pending, pool.map(_timed_read_whatsapp_table, pending)):
+                results[f] = result
+    
+    return [(f, *results[f]) for f in files]
+
+
+# Tablas Arrow ya decodificadas por archivo: {ruta: ((tamaño, mtime), tabla, segundos)}
+# Sobrevive a la invalidación de los cachés de WhatsApp: solo se decodifican archivos nuevos o modificados.
+_WHATSAPP_TABLES: Dict[Path, Tuple] = {}
+_WHATSAPP_TABLES_LOCK = threading.Lock()
+
+
+def _whatsapp_files() -> List[Path]:
+    """Resuelve los exports de WhatsApp en cada llamada (detecta archivos nuevos en data/mensajes_whatsapp/)."""
+    return [f for f in source_paths("whatsapp") if f.exists()]
+
+
+def _file_version(filepath: Path) -> Tuple[int, int]:
+    """(tamaño, mtime) del archivo, para saber si cambió desde la última lectura."""
+    stat = filepath.stat()
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _whatsapp_file_tables(files: List[Path]) -> List[Tuple]:
+    """Retorna las tablas de los archivos, decodificando (en paralelo) solo los nuevos o modificados.
+    
+    Returns:
+        Lista de tuplas (archivo, tabla, segundos, error) en el mismo orden de files
+    """
+    with _WHATSAPP_TABLES_LOCK:
+        cached = {f: _WHATSAPP_TABLES.get(f) for f in files}
+        stale = [f for f in files if cached[f] is None or cached[f][0] != _file_version(f)]
+        
+        for wa_file, table, seconds, error in _read_whatsapp_tables(stale):
+            if error is None:
+                _WHATSAPP_TABLES[wa_file] = (_file_version(wa_file), table, seconds)
+                _notify("info", f"✓ Cargado: {wa_file.name} ({table.num_rows} registros, {seconds:.2f}s)")
+            else:
+                _WHATSAPP_TABLES.pop(wa_file, None)
+                _notify("info", f"✗ Error cargando {wa_file.name}: {error}")
+                cached[wa_file] = (None, None, seconds, error)
+        
+        # Olvidar archivos que ya no existen
+        for old_file in [f for f in _WHATSAPP_TABLES if not f.exists()]:
+            del _WHATSAPP_TABLES[old_file]
+        
+        results = []
+        for wa_file in files:
+            if wa_file in _WHATSAPP_TABLES:
+                _, table, seconds = _WHATSAPP_TABLES[wa_file]
+                results.append((wa_file, table, seconds, None))
+            else:
+                results.append((wa_file, None, cached[wa_file][2], cached[wa_file][3]))
+        return results
+
+
+@cached_on("whatsapp", shared=True)
+def _load_whatsapp_table():
+    """Une las tablas de TODOS los archivos de WhatsApp en una sola tabla Arrow.
+    
+    Cada archivo se decodifica una sola vez (en paralelo) y se reutiliza mientras
+    no cambie. Los esquemas se combinan a nivel Arrow: las columnas que faltan en
+    un archivo (ej: 'Error Code') quedan como nulos. pa.concat_tables solo
+    encadena los chunks de cada archivo, sin copiar los datos.
+    
+    Returns:
+        Tupla (tabla o None, {archivo: segundos de lectura})
+    """
+    import pyarrow as pa
+    
+    tables = []
+    timings = {}
+    
+    for wa_file, table, seconds, error in _whatsapp_file_tables(_whatsapp_files()):
+        timings[wa_file.name] = round(seconds, 3)
+        if error is None:
+            tables.append(table)
+    
+    if not tables:
+        return None, timings
+    
+    result = pa.concat_tables(tables, promote_options="permissive")
+    _notify("info", f"✓ TOTAL: {result.num_rows} registros de {len(tables)} archivos")
+    return result, timings
+
+
+def _whatsapp_file_aggregates(table) -> Dict:
+    """Agregados parciales de UN archivo de WhatsApp: total, estados y embudo Status × Reply Status."""
+    columns = [c for c in ('Status', 'Reply Status') if c in table.column_names]
+    df = table.select(columns).to_pandas()
+    
+    states = {}
+    funnel = {}
+    if 'Status' in df.columns:
+        states = {str(k): int(v) for k, v in df['Status'].value_counts().items()}
+        if 'Reply Status' in df.columns:
+            replies = df['Reply Status'].astype('string').str.lower()
+            for (status, reply), count in df.groupby([df['Status'], replies]).size().items():
+                funnel.setdefault(str(status), {})[str(reply)] = int(count)
+    
+    return {"count": int(table.num_rows), "states": states, "funnel": funnel}
+
+
+@cached_on("whatsapp")
+def _whatsapp_partials() -> Dict[str, Dict]:
+    """Agregados parciales por archivo de WhatsApp, persistidos en el sidecar de cada export.
+    
+    Solo los archivos nuevos o modificados se leen y agregan; el resto se toma del
+    sidecar. Así, agregar el archivo N+1 cuesta lo mismo que procesar ese archivo.
+    """
+    files = _whatsapp_files()
+    missing = [f for f in files if load_aggregate(f, "whatsapp") is None]
+    tables = {f: table for f, table, _, error in _whatsapp_file_tables(missing) if error is None}
+    
+    partials = {}
+    for wa_file in files:
+        if wa_file in missing and wa_file not in tables:
+            continue
+        partials[wa_file.name] = cached_aggregate(
+            wa_file, "whatsapp", lambda: _whatsapp_file_aggregates(tables[wa_file])
+        )
+    return partials
+
+
+def _merge_whatsapp_partials(partials: Dict[str, Dict]) -> Dict:
+    """Suma los agregados parciales de todos los archivos en totales y embudo globales."""
+    total = 0
+    states = Counter()
+    funnel: Dict[str, Counter] = {}
+    for partial in partials.values():
+        total += partial["count"]
+        states.update(partial["states"])
+        for status, replies in partial["funnel"].items():
+            funnel.setdefault(status, Counter()).update(replies)
+    return {"total": total, "states": dict(states), "funnel": funnel}
+
+
+def get_whatsapp_load_timings() -> Dict[str, float]:
+    """Retorna el tiempo de lectura (segundos) de cada archivo de WhatsApp."""
+    try:
+        return dict(_load_whatsapp_table()[1])
+    except Exception:
+        return {}
+
+
+@cached_on("whatsapp", shared=True)
+def _whatsapp_frame() -> pd.DataFrame:
+    """DataFrame de WhatsApp compartido por el proceso (no modificar: usar load_whatsapp_data)."""
+    try:
+        if not _whatsapp_files():
+            _notify("warning", "No se encontraron archivos de WhatsApp. Coloca tus CSV en data/mensajes_whatsapp/.")
+            return pd.DataFrame()
+        
+        table, _ = _load_whatsapp_table()
+        if table is None:
+            _notify("warning", "No se pudieron cargar archivos de WhatsApp.")
+            return pd.DataFrame()
+        
+        return _to_pandas(table)
+    except Exception as e:
+        _notify("warning", f"Error cargando WhatsApp: {e}")
+        return pd.DataFrame()
+
+
+def load_whatsapp_data() -> pd.DataFrame:
+    """Carga TODOS los datos de WhatsApp de TODOS los archivos.
+    
+    Incluye la columna categórica 'source_file' con el archivo de origen. El
+    dataset se comparte entre sesiones; cada llamada recibe una vista Copy-on-Write.
+    """
+    return shared_view(_whatsapp_frame())
+
+
+@cached_on("sms")
+def get_sms_statistics() -> Dict:
+    """Obtiene estadísticas de SMS."""
+    try:
+        sms_stats = get_sms_states_summary()
+        return {
+            "total": count_total_sms_records(),
+            "states": sms_stats,
+        }
+    except Exception as e:
+        _notify("warning", f"Error en estadísticas SMS: {e}")
+        return {"total": 0, "states": {}}
+
+
+@cached_on("whatsapp")
+def get_whatsapp_statistics() -> Dict:
+    """Obtiene estadísticas de WhatsApp (globales y por archivo) a partir de los agregados por archivo."""
+    try:
+        partials = _whatsapp_partials()
+        
+        if not partials:
+            return {"total": 0, "states": {}, "by_file": {}}
+        
+        merged = _merge_whatsapp_partials(partials)
+        by_file = {
+            file_name: {"count": partial["count"], "states": dict(partial["states"])}
+            for file_name, partial in partials.items()
+        }
+        
+        return {
+            "total": merged["total"],
+            "states": merged["states"],
+            "by_file": by_file,
+        }
+    except Exception as e:
+        _notify("warning", f"Error en estadísticas WhatsApp: {e}")
+        return {"total": 0, "states": {}, "by_file": {}}
+
+
+def get_sms_flow_data() -> Tuple[List, List, List]:
+    """Obtiene datos de flujo exactos para SMS."""
+    try:
+        source, target, value = [], [], []
+        
+        for state, count in get_sms_states_summary().items():
+            if count > 0:
+                source.append("Enviados")
+                target.append(str(state))
+                value.append(count)
+        
+        return source, target, value
+    except Exception as e:
+        _notify("warning", f"Error en flujo SMS: {e}")
+        return [], [], []
+
+
+def get_whatsapp_flow_data() -> Tuple[List, List, List]:
+    """Obtiene datos de flujo enriquecido para WhatsApp de TODOS los archivos.
+    
+    Flujo de 3 niveles:
+    1. Total Enviados → Status (Entregados / Fallidos / Procesando)
+       - Entregados se subdividen en: No Leído + Leído
+    2. No Leído/Leído/Fallidos/Procesando → Reply Status (Respondido/No Respondido)
+    
+    Lógica:
+    - Status='Delivered' + Date Read='-' → No Leído
+    - Status='Read' + Date Read != '-' → Leído
+    - Status='Failed' → Fallido
+    - Status='Processing' → Procesando
+    """
+    try:
+        merged = _merge_whatsapp_partials(_whatsapp_partials())
+        states = merged["states"]
+        funnel = merged["funnel"]
+        
+        if not states:
+            return [], [], []
+        
+        source, target, value = [], [], []
+        
+        # Crear nuevas categorías basadas en Status Y Date Read
+        # No Leído: Status='Delivered' (implica que Date Read = '-')
+        no_leido = states.get('Delivered', 0)
+        # Leído: Status='Read' (implica que fue entregado y leído)
+        leido = states.get('Read', 0)
+        # Fallidos y Procesando
+        fallidos = states.get('Failed', 0)
+        procesando = states.get('Processing', 0)
+        
+        # NIVEL 1: Total Enviados → Categorías de Entrega
+        source.append('📨 Total Enviados')
+        target.append('📦 Entregados')
+        value.append(no_leido + leido)
+        
+        source.append('📨 Total Enviados')
+        target.append('❌ Fallidos')
+        value.append(fallidos)
+        
+        source.append('📨 Total Enviados')
+        target.append('⏳ Procesando')
+        value.append(procesando)
+        
+        # NIVEL 2: Entregados → No Leído / Leído
+        source.append('📦 Entregados')
+        target.append('📖 No Leído')
+        value.append(no_leido)
+        
+        source.append('📦 Entregados')
+        target.append('✅ Leído')
+        value.append(leido)
+        
+        # NIVEL 3: No Leído → Respuestas
+        no_leido_replies = funnel.get('Delivered', {})
+        
+        source.append('📖 No Leído')
+        target.append('💬 Respondido')
+        value.append(no_leido_replies.get('yes', 0))
+        
+        source.append('📖 No Leído')
+        target.append('🔇 Sin respuesta')
+        value.append(no_leido_replies.get('no', 0))
+        
+        # NIVEL 3: Leído → Respuestas
+        leido_replies = funnel.get('Read', {})
+        
+        source.append('✅ Leído')
+        target.append('💬 Respondido')
+        value.append(leido_replies.get('yes', 0))
+        
+        source.append('✅ Leído')
+        target.append('🔇 Sin respuesta')
+        value.append(leido_replies.get('no', 0))
+        
+        # NIVEL 3: Fallidos/Procesando → Solo Sin respuesta
+        source.append('❌ Fallidos')
+        target.append('🔇 Sin respuesta')
+        value.append(fallidos)
+        
+        source.append('⏳ Procesando')
+        target.append('🔇 Sin respuesta')
+        value.append(procesando)
+        
+        return source, target, value
+    except Exception as e:
+        return [], [], []
+
+
+@cached_on("sms")
+def count_total_sms_records() -> int:
+    """Cuenta total de registros SMS.
+    
+    Parquet usa los metadatos; CSV se recorre una sola vez con el contador que
+    respeta comillas (mensajes con saltos de línea) y el total queda en el sidecar.
+    """
+    sms_file = _sms_file()
+    try:
+        if not sms_file.exists():
+            return 0
+        return cached_row_count(sms_file, delimiter=DELIMITERS["sms"])
+    except Exception as e:
+        print(f"DEBUG: Error contando SMS: {e}")
+        return 0
+
+
+@cached_on("whatsapp")
+def count_total_whatsapp_records() -> int:
+    """Cuenta total de registros WhatsApp sin decodificar los exports (conteo por archivo en su sidecar)."""
+    try:
+        return sum(cached_row_count(wa_file, delimiter=DELIMITERS["whatsapp"]) for wa_file in _whatsapp_files())
+    except Exception as e:
+        print(f"DEBUG: Error contando WhatsApp: {e}")
+        return 0
+
+
+def _file_columns(filepath: Path, **kwargs) -> List[str]:
+    """Columnas disponibles en el archivo (esquema de Parquet o encabezado del CSV)."""
+    return _dataset(filepath, **kwargs).schema.names
+
+
+def _hour_of(values: pd.Series) -> pd.Series:
+    """Hora del día (0-23) de una columna de fecha, con su formato exacto."""
+    return parse_datetime(values, DATE_FORMATS.get(CUBE_HOUR_COLUMN)).dt.hour.astype('Int8')
+
+
+def _compute_sms_cube() -> pd.DataFrame:
+    """Recorre el archivo SMS UNA sola vez por lotes y construye su parte del cubo OLAP.
+    
+    La memoria queda acotada al tamaño del lote (SCAN_BATCH_SIZE) más las celdas
+    del cubo, así que funciona igual para 315K que para decenas de millones de registros.
+    """
+    sms_file = _sms_file()
+    read_kwargs = dict(encoding=CSV_ENCODING["sms"], delimiter=DELIMITERS["sms"])
+    available = _file_columns(sms_file, **read_kwargs)
+    wanted = ["Estado del envio", "Operador", "Usuario", CUBE_HOUR_COLUMN] + SMS_CLICK_COLUMNS
+    columns = [col for col in wanted if col in available]
+    
+    def cells():
+        for df in _iter_batches(
+            sms_file,
+            columns=columns,
+            dtype={"Estado del envio": "category", "Operador": "category", "Usuario": "category"},
+            low_memory=False,
+            **read_kwargs,
+        ):
+            # Convertir a float primero (maneja '1.0' strings), luego a int
+            clicks = np.column_stack([
+                pd.to_numeric(df[col], errors='coerce').fillna(0).to_numpy(dtype=np.int64)
+                if col in df.columns else np.zeros(len(df), dtype=np.int64)
+                for col in SMS_CLICK_COLUMNS
+            ])
+            yield batch_cells(
+                "sms",
+                len(df),
+                state=df["Estado del envio"],
+                operator=df.get("Operador"),
+                usuario=df.get("Usuario"),
+                hour=_hour_of(df[CUBE_HOUR_COLUMN]) if CUBE_HOUR_COLUMN in df.columns else None,
+                clicks=clicks,
+            )
+    
+    return build_cube(cells())
+
+
+def get_sms_states_summary() -> Dict:
+    """Obtiene resumen exacto de estados SMS."""
+    try:
+        if not _sms_file().exists():
+            return {}
+        states = cube_rollup(by=["state"], where={"channel": "sms"})
+        return {str(k): int(v) for k, v in zip(states["state"], states["count"])}
+    except Exception as e:
+        _notify("warning", f"Aviso al procesar estados: {e}")
+        return {}
+
+
+@cached_on("sms")
+def get_sms_states_estimate(margin: float = 0.01, confidence: float = 0.95) -> Dict:
+    """Estima los estados SMS con una muestra aleatoria estratificada (modo rápido).
+    
+    El tamaño de muestra se deriva del error objetivo (margin) y cada conteo trae
+    su intervalo de confianza: {estado: {'estimate', 'low', 'high', 'proportion'}}.
+    """
+    sms_file = _sms_file()
+    try:
+        if not sms_file.exists():
+            return {}
+        total_sms = count_total_sms_records()
+        n = sample_size_for_error(margin, confidence, population=total_sms)
+        sample = sample_file(
+            sms_file,
+            n,
+            columns=["Estado del envio"],
+            seed=0,
+            encoding=CSV_ENCODING["sms"],
+            delimiter=DELIMITERS["sms"],
+        )
+        return estimate_counts(sample["Estado del envio"], total_sms, confidence)
+    except Exception as e:
+        _notify("warning", f"Aviso al estimar estados: {e}")
+        return {}
+
+
+def get_sms_clicks_stats() -> Dict:
+    """Calcula estadísticas exactas de clicks SMS."""
+    try:
+        if not _sms_file().exists():
+            return {}
+        totals = cube_rollup(where={"channel": "sms"}, measures=CUBE_MEASURES).iloc[0]
+        total_sms = int(totals["count"])
+        with_clicks = [int(totals[f"with_clicks_{i}"]) for i in (1, 2, 3)]
+        total_clicks = [int(totals[f"total_clicks_{i}"]) for i in (1, 2, 3)]
+        
+        with_any_click = int(totals["with_any_click"])
+        percentage = (with_any_click / total_sms * 100) if total_sms > 0 else 0
+        
+        return {
+            "total_with_clicks": with_any_click,
+            "total_sms": total_sms,
+            "percentage": round(percentage, 2),
+            "clicks_url1": with_clicks[0],
+            "clicks_url2": with_clicks[1],
+            "clicks_url3": with_clicks[2],
+            "total_clicks_url1": total_clicks[0],
+            "total_clicks_url2": total_clicks[1],
+            "total_clicks_url3": total_clicks[2],
+        }
+    except Exception as e:
+        _notify("warning", f"Error en clicks: {e}")
+        return {}
+
+
+def get_sms_file_size() -> str:
+    """Obtiene el tamaño del archivo SMS."""
+    try:
+        size_bytes = _sms_file().stat().st_size
+        size_mb = size_bytes / (1024 * 1024)
+        return f"{size_mb:.1f}MB"
+    except:
+        return "Desconocido"
+
+
+# ============= FUNCIONES PARA ANÁLISIS DE INTERACCIONES =============
+
+def _filtro_excluir_cuantico():
+    """Expresión pyarrow para Usuario != 'Cuantico_tecnologia' (conserva Usuario nulo)."""
+    import pyarrow.compute as pc
+    
+    usuario = pc.field('Usuario')
+    return (usuario != 'Cuantico_tecnologia') | usuario.is_null()
+
+
+def _compute_interacciones_cube() -> pd.DataFrame:
+    """Recorre interacciones UNA sola vez y construye su parte del cubo OLAP.
+    
+    El cubo incluye TODOS los usuarios: el filtro Usuario != 'Cuantico_tecnologia'
+    se aplica en cada roll-up, así otros filtros no requieren volver a leer el archivo.
+    """
+    interacciones_file = _interacciones_file()
+    read_kwargs = dict(encoding='LATIN1', delimiter=';')
+    available = _file_columns(interacciones_file, **read_kwargs)
+    wanted = ['Total de mensajes', 'Estado del envio', 'Operador', 'Codigo corto', 'Usuario', CUBE_HOUR_COLUMN]
+    columns = [col for col in wanted if col in available]
+    
+    def cells():
+        for df in _iter_batches(
+            interacciones_file,
+            columns=columns,
+            dtype={
+                'Total de mensajes': 'Int16',
+                'Estado del envio': 'category',
+                'Operador': 'category',
+                'Codigo corto': 'category',
+                'Usuario': 'category',
+            },
+            **read_kwargs,
+        ):
+            yield batch_cells(
+                'interacciones',
+                len(df),
+                state=df['Estado del envio'],
+                operator=df.get('Operador'),
+                codigo=df.get('Codigo corto'),
+                usuario=df.get('Usuario'),
+                hour=_hour_of(df[CUBE_HOUR_COLUMN]) if CUBE_HOUR_COLUMN in df.columns else None,
+                messages=df.get('Total de mensajes'),
+            )
+    
+    return build_cube(cells())
+
+
+@cached_on("interacciones")
+def _count_interacciones() -> int:
+    """Cuenta interacciones filtradas sin construir un DataFrame (persistido en el sidecar)."""
+    interacciones_file = _interacciones_file()
+    return cached_aggregate(
+        interacciones_file,
+        'interacciones_count',
+        lambda: _count_rows(
+            interacciones_file,
+            filters=_filtro_excluir_cuantico(),
+            encoding='LATIN1',
+            delimiter=';',
+            dtype={'Usuario': 'string'},
+        ),
+    )
+
+
+def count_total_interacciones_records() -> int:
+    """Cuenta total de registros en interacciones (filtrado: Usuario != 'Cuantico_tecnologia')."""
+    interacciones_file = _interacciones_file()
+    try:
+        if not interacciones_file.exists():
+            return 0
+        
+        return _count_interacciones()
+    except Exception as e:
+        print(f"DEBUG: Error contando interacciones: {e}")
+        # Si hay error (ej: archivo corrupto), crear un archivo vacío válido
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            
+            # Crear estructura vacía válida
+            empty_data = {
+                'Id Envio': pa.array([], type=pa.string()),
+                'Telefono celular': pa.array([], type=pa.int64()),
+                'Total de mensajes': pa.array([], type=pa.int16()),
+                'Estado del envio': pa.array([], type=pa.string()),
+                'Operador': pa.array([], type=pa.string()),
+                'Codigo corto': pa.array([], type=pa.string()),
+                'Usuario': pa.array([], type=pa.string()),
+            }
+            table = pa.table(empty_data)
+            interacciones_file.parent.mkdir(parents=True, exist_ok=True)
+            pq.write_table(table, interacciones_file)
+            print(f"✅ Archivo interacciones.parquet reparado (0 registros)")
+        except:
+            pass
+        return 0
+
+
+@cached_on("interacciones", shared=True)
+def _interacciones_frame(sample: bool, sample_size: int) -> pd.DataFrame:
+    """DataFrame de interacciones compartido por el proceso (no modificar: usar get_interacciones_data)."""
+    interacciones_file = _interacciones_file()
+    try:
+        if not interacciones_file.exists():
+            return pd.DataFrame()
+        columns = ['Id Envio', 'Telefono celular', 'Total de mensajes', 'Estado del envio', 'Operador', 'Codigo corto', 'Usuario']
+        memory_limit = None if sample else _rows_within_limit(interacciones_file, columns, encoding='LATIN1', delimiter=';')
+        nrows = sample_size if sample else memory_limit
+        
+        df = _read_file(
+            interacciones_file,
+            encoding='LATIN1',
+            delimiter=';',
+            usecols=columns,
+            filters=_filtro_excluir_cuantico(),
+            nrows=nrows,
+            dtype={
+                'Id Envio': 'string',
+                'Telefono celular': 'int64',
+                'Total de mensajes': 'Int16',
+                'Estado del envio': 'category',
+                'Operador': 'category',
+                'Codigo corto': 'category',
+                'Usuario': 'category',
+            },
+            low_memory=False
+        )
+        
+        return _mark_truncation(df, memory_limit)
+    except Exception as e:
+        print(f"DEBUG: Error cargando interacciones: {e}")
+        return pd.DataFrame()
+
+
+def get_interacciones_data(sample: bool = True, sample_size: int = 10000) -> pd.DataFrame:
+    """Carga datos de interacciones (filtrado: Usuario != 'Cuantico_tecnologia').
+    
+    El dataset se comparte entre sesiones; cada llamada recibe una vista Copy-on-Write.
+    """
+    return shared_view(_interacciones_frame(sample, sample_size))
+
+
+def get_interacciones_states_summary() -> Dict:
+    """Obtiene resumen exacto de estados de interacciones (filtrado: Usuario != 'Cuantico_tecnologia')."""
+    try:
+        if not _interacciones_file().exists():
+            return {}
+        states = _interacciones_rollup(['state'])
+        return {str(k): int(v) for k, v in zip(states['state'], states['count'])}
+    except Exception as e:
+        print(f"DEBUG: Error en resumen de interacciones: {e}")
+        return {}
+
+
+def get_interacciones_by_operator() -> Dict:
+    """Obtiene estadísticas exactas por operador (filtrado: Usuario != 'Cuantico_tecnologia')."""
+    try:
+        operators = _interacciones_rollup(['operator'])
+        return {str(k): int(v) for k, v in zip(operators['operator'], operators['count']) if pd.notna(k)}
+    except Exception as e:
+        print(f"DEBUG: Error en análisis por operador: {e}")
+        return {}
+
+
+def get_interacciones_by_codigo_corto() -> Dict:
+    """Obtiene estadísticas exactas por código corto (filtrado: Usuario != 'Cuantico_tecnologia')."""
+    try:
+        codigos = _interacciones_rollup(['codigo'])
+        return {str(k): int(v) for k, v in zip(codigos['codigo'], codigos['count']) if pd.notna(k) and k != ''}
+    except Exception as e:
+        print(f"DEBUG: Error en análisis por código corto: {e}")
+        return {}
+
+
+def get_interacciones_interaction_flow() -> Tuple[List, List, List]:
+    """Obtiene datos para diagrama de flujo de interacciones (filtrado: Usuario != 'Cuantico_tecnologia').
+    
+    Se muestran los 5 valores de 'Total de mensajes' con más interacciones.
+    """
+    try:
+        cells = _interacciones_rollup(['messages', 'state'])
+        flow = [(int(msgs), str(state), int(n)) for msgs, state, n in zip(cells['messages'], cells['state'], cells['count'])
+                if pd.notna(msgs) and pd.notna(state)]
+        if not flow:
+            return [], [], []
+        
+        by_messages = Counter()
+        for num_messages, _, count in flow:
+            by_messages[num_messages] += count
+        top_messages = {num for num, _ in by_messages.most_common(5)}
+        
+        source, target, value = [], [], []
+        for num_messages, state, count in sorted(flow):
+            if num_messages in top_messages:
+                source.append(f"{num_messages} msgs")
+                target.append(state)
+                value.append(count)
+        
+        return source, target, value
+    except Exception as e:
+        print(f"DEBUG: Error en flujo de interacciones: {e}")
+        return [], [], []
+
+
+# ============= CUBO OLAP =============
+
+@cached_on("sms", "interacciones")
+def get_cube() -> pd.DataFrame:
+    """Cubo OLAP de SMS e interacciones (una fila por celda, ver cube.CUBE_DIMENSIONS).
+    
+    La parte de cada archivo se construye una vez por versión de los datos y se
+    persiste como Parquet junto al archivo; reiniciar la app solo lee las celdas.
+    """
+    parts = [build_cube([])]
+    for filepath, compute in ((_sms_file(), _compute_sms_cube), (_interacciones_file(), _compute_interacciones_cube)):
+        if filepath.exists():
+            parts.append(cached_table(filepath, 'cube', compute))
+    return compact_cube(pd.concat(parts, ignore_index=True))
+
+
+def cube_rollup(by: List[str] = (), where: Optional[Dict] = None, exclude: Optional[Dict] = None,
+                measures: List[str] = ("count",)) -> pd.DataFrame:
+    """Roll-up del cubo OLAP (ver cube.rollup). Ej: cube_rollup(['operator'], where={'channel': 'sms'})."""
+    return rollup(get_cube(), by=by, where=where, exclude=exclude, measures=measures)
+
+
+def _interacciones_rollup(by: List[str]) -> pd.DataFrame:
+    """Roll-up de interacciones con el filtro Usuario != 'Cuantico_tecnologia'."""
+    return cube_rollup(by=by, where={'channel': 'interacciones'}, exclude={'usuario': 'Cuantico_tecnologia'})
+
+
+# ============= FUNCIONES PARA ANÁLISIS DE WHATSAPP FALLIDOS =============
+
+def validate_colombian_phone(phone_str: str) -> Dict:
+    """
+    Valida número celular colombiano usando el validador completo.
+    Wrapper para mantener compatibilidad con código existente; los números ya
+    validados salen del almacén de validaciones (ver validation_store).
+    """
+    # El validador solo se importa cuando hay números que analizar
+    from validation_store import get_store
+    
+    resultado = get_store().validate(phone_str)
+    
+    # Convertir formato del validador al formato esperado por el código existente
+    validation = {
+        'valid': resultado['valido'],
+        'issues': [resultado['mensaje_error']] if resultado['mensaje_error'] else [],
+        'operator': resultado['operador'],
+        'type': 'Celular Colombia' if resultado['valido'] else 'Inválido',
+        'categoria': resultado['categoria'],
+        'sospechoso': resultado['sospechoso'],
+        'razon_sospecha': resultado['razon_sospecha'],
+    }
+    
+    return validation
+
+
+def _conteos_en_orden(valores: pd.Series) -> Dict:
+    """Conteo de cada valor, en el orden en que aparece por primera vez."""
+    return valores.astype(object).value_counts(sort=False).to_dict()
+
+
+@cached_on("whatsapp")
+def get_whatsapp_failed_analysis() -> Dict:
+    """Analiza números fallidos y en procesamiento en WhatsApp para data quality enriquecido."""
+    try:
+        whatsapp_df = load_whatsapp_data()
+        all_failed = []
+        all_processing = []
+        
+        if 'Status' in whatsapp_df.columns:
+            # Mensajes fallidos
+            failed_df = whatsapp_df[whatsapp_df['Status'] == 'Failed']
+            if not failed_df.empty:
+                all_failed.append(failed_df)
+            
+            # Mensajes en procesamiento
+            processing_df = whatsapp_df[whatsapp_df['Status'] == 'Processing']
+            if not processing_df.empty:
+                all_processing.append(processing_df)
+        
+        if not all_failed and not all_processing:
+            return {
+                'total_failed': 0,
+                'total_processing': 0,
+                'unique_phones': 0,
+                'repeated_phones': {},
+                'top_prefixes': {},
+                'error_codes': {},
+                'invalid_format': {},
+                'by_operator': {},
+                'validation_summary': {},
+                'processing_phones': {},
+            }
+        
+        # Combinar todos los datos problemáticos
+        problematic_dfs = []
+        if all_failed:
+            problematic_dfs.extend(all_failed)
+        if all_processing:
+            problematic_dfs.extend(all_processing)
+        
+        problematic_combined = pd.concat(problematic_dfs, ignore_index=True) if problematic_dfs else pd.DataFrame()
+        
+        phone_col = 'Phone number' if 'Phone number' in problematic_combined.columns else None
+        error_col = 'Error Code' if 'Error Code' in problematic_combined.columns else None
+        status_col = 'Status' if 'Status' in problematic_combined.columns else None
+        
+        if not phone_col:
+            return {'total_failed': len(all_failed) if all_failed else 0}
+        
+        total_failed = len(pd.concat(all_failed, ignore_index=True)) if all_failed else 0
+        total_processing = len(pd.concat(all_processing, ignore_index=True)) if all_processing else 0
+        
+        phones = problematic_combined[phone_col].dropna().astype(str)
+        unique_phones = phones.nunique()
+        
+        # Números repetidos
+        repeated = phones.value_counts()
+        repeated_phones = dict(repeated[repeated > 1].head(20))
+        
+        # Teléfonos en processing
+        processing_phones = {}
+        if all_processing:
+            processing_combined = pd.concat(all_processing, ignore_index=True)
+            processing_phone_list = processing_combined[phone_col].dropna().astype(str)
+            processing_phones = dict(processing_phone_list.value_counts().head(10))
+        
+        # Análisis de prefijos (después del 57)
+        prefixes = {}
+        for phone in phones.unique():
+            # Limpiar y remover código de país
+            clean = phone.replace('+', '').replace(' ', '')
+            if clean.startswith('57'):
+                clean = clean[2:]  # Remover el 57
+            
+            if len(clean) >= 3:
+                prefix = clean[:3]  # Primeros 3 dígitos después del 57
+                prefixes[prefix] = prefixes.get(prefix, 0) + 1
+        
+        top_prefixes = dict(sorted(prefixes.items(), key=lambda x: x[1], reverse=True)[:10])
+        
+        # Códigos de error (solo para Failed)
+        error_codes = {}
+        if error_col and all_failed:
+            failed_combined = pd.concat(all_failed, ignore_index=True)
+            errors = failed_combined[error_col].dropna()
+            error_codes = dict(errors.value_counts().head(10))
+        
+        # Validación colombiana mejorada con detección de patrones sospechosos:
+        # toda la columna de números únicos de una vez con el validador columnar
+        from phone_validator import validar_columna
+        
+        unicos = phones.unique()
+        validacion = validar_columna(unicos)
+        validos = validacion['valido'].to_numpy()
+        sospechosos = validacion['sospechoso'].to_numpy()
+        issues = validacion['mensaje_error'].astype(object).where(validacion['mensaje_error'] != '', 'Inválido')
+        
+        invalid_format = dict(zip(unicos[~validos], issues[~validos]))
+        suspicious_phones = dict(zip(unicos[sospechosos], validacion['razon_sospecha'][sospechosos].astype(object)))
+        # Conteos en orden de primera aparición (el orden de desempate del sort estable)
+        by_category = _conteos_en_orden(validacion['categoria'])
+        by_operator = _conteos_en_orden(validacion['operador'])
+        validation_issues = _conteos_en_orden(issues[~validos])
+        
+        validation_summary = {
+            'números_inválidos': len(invalid_format),
+            'números_válidos': unique_phones - len(invalid_format),
+            'números_sospechosos': len(suspicious_phones),
+            'issues_principales': dict(sorted(validation_issues.items(), key=lambda x: x[1], reverse=True)[:5]),
+            'por_categoria': dict(sorted(by_category.items(), key=lambda x: x[1], reverse=True))
+        }
+        
+        return {
+            'total_failed': total_failed,
+            'total_processing': total_processing,
+            'unique_phones': unique_phones,
+            'repeated_phones': repeated_phones,
+            'processing_phones': processing_phones,
+            'top_prefixes': top_prefixes,
+            'error_codes': error_codes,
+            'invalid_format': invalid_format,
+            'suspicious_phones': suspicious_phones,
+            'by_operator': dict(sorted(by_operator.items(), key=lambda x: x[1], reverse=True)),
+            'validation_summary': validation_summary,
+        }
+    
+    except Exception as e:
+        return {}
+
+
+@cached_on("whatsapp")
+def get_whatsapp_failed_details() -> pd.DataFrame:
+    """Retorna detalles de mensajes fallidos."""
+    try:
+        whatsapp_df = load_whatsapp_data()
+        if 'Status' not in whatsapp_df.columns:
+            return pd.DataFrame()
+        
+        failed_df = whatsapp_df[whatsapp_df['Status'] == 'Failed']
+        if failed_df.empty:
+            return pd.DataFrame()
+        
+        cols_to_keep = ['Phone number', 'Status', 'Date Sent', 'Error Code']
+        cols_available = [c for c in cols_to_keep if c in failed_df.columns]
+        return failed_df[cols_available].head(100).reset_index(drop=True)
+    
+    except Exception as e:
+        return pd.DataFrame()
+
+
+def _filtro_mensajes_usuarios():
+    """Respuestas de usuarios con texto: Usuario != 'Cuantico_tecnologia' y Mensaje no vacío."""
+    import pyarrow.compute as pc
+    
+    mensaje = pc.field('Mensaje')
+    return _filtro_excluir_cuantico() & mensaje.is_valid() & (mensaje != '')
+
+
+@cached_on("interacciones", ttl=3600)
+def get_interacciones_messages(limit: int = None) -> pd.DataFrame:
+    """Obtiene todos los mensajes de interacciones para análisis de sentimiento.
+    FILTRO: Solo mensajes donde Usuario != 'Cuantico_tecnologia' (respuestas de usuarios).
+    
+    Con limit la lectura se detiene al juntar limit mensajes. Sin limit se cargan
+    todos, salvo que no quepan en MEMORY_LIMIT_MB con OUT_OF_CORE_TRUNCATE=1: ahí
+    se cargan los primeros que caben y el resultado queda marcado (is_truncated).
+    Las estadísticas por operador y código corto recorren siempre todo el archivo
+    (get_sentiment_stats_by_operator / get_sentiment_stats_by_codigo).
+    """
+    interacciones_file = _interacciones_file()
+    try:
+        if not interacciones_file.exists():
+            return pd.DataFrame()
+        
+        columns = ['Mensaje', 'Operador', 'Codigo corto', 'Usuario']
+        
+        memory_limit = None if limit else _rows_within_limit(interacciones_file, columns, encoding='LATIN1', delimiter=';')
+        
+        # FILTRO: Solo respuestas de usuarios con texto (no mensajes enviados por Cuantico_tecnologia)
+        df = _read_file(
+            interacciones_file,
+            encoding='LATIN1',
+            delimiter=';',
+            usecols=columns,
+            filters=_filtro_mensajes_usuarios(),
+            nrows=limit or memory_limit,
+        )
+        return _mark_truncation(df, memory_limit)
+    except Exception as e:
+        return pd.DataFrame()
+
+
+def get_unique_messages(limit: int = None) -> list:
+    """Obtiene mensajes únicos para análisis (evita duplicados)."""
+    try:
+        df = get_interacciones_messages(limit)
+        if df.empty:
+            return []
+        
+        # Obtener mensajes únicos
+        unique_msgs = df['Mensaje'].unique().tolist()
+        
+        # Limpiar y filtrar
+        unique_msgs = [str(m).strip() for m in unique_msgs if m and len(str(m).strip()) > 2]
+        
+        return unique_msgs
+    except:
+        return []
+
+
+def _message_stats(group_column: str) -> Dict[str, Dict]:
+    """Total de mensajes y mensajes únicos por grupo, recorriendo interacciones por lotes.
+    
+    Los pares (grupo, mensaje) se cuentan en un SpillingAggregator, así el conjunto
+    de mensajes distintos puede crecer más que la memoria: se vuelca a disco y se
+    resuelve por particiones.
+    """
+    totals = Counter()
+    uniques = Counter()
+    with SpillingAggregator([group_column, 'Mensaje'], ['n']) as aggregator:
+        for df in _iter_batches(
+            _interacciones_file(),
+            columns=[group_column, 'Mensaje'],
+            filters=_filtro_mensajes_usuarios(),
+            encoding='LATIN1',
+            delimiter=';',
+            dtype={group_column: 'category'},
+        ):
+            aggregator.add(df.assign(n=1))
+        
+        for part in aggregator.iter_results():
+            part = part[part[group_column].notna()]
+            by_group = part.groupby(group_column, observed=True)['n']
+            totals.update(by_group.sum().to_dict())
+            uniques.update(by_group.size().to_dict())
+    
+    return {
+        str(group): {'total_mensajes': int(totals[group]), 'mensajes_unicos': int(uniques[group])}
+        for group in totals
+    }
+
+
+@cached_on("interacciones")
+def get_sentiment_stats_by_operator() -> Dict[str, Dict]:
+    """Obtiene estadísticas de sentimiento por operador."""
+    try:
+        if not _interacciones_file().exists():
+            return {}
+        return _message_stats('Operador')
+    except:
+        return {}
+
+
+@cached_on("interacciones")
+def get_sentiment_stats_by_codigo() -> Dict[str, Dict]:
+    """Obtiene estadísticas de sentimiento por código corto."""
+    try:
+        if not _interacciones_file().exists():
+            return {}
+        return _message_stats('Codigo corto')
+    except:
+        return {}
+
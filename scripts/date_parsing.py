@@ -0,0 +1,79 @@
+"""
+Parseo vectorizado de columnas de fecha.
+Usa los formatos exactos de config.DATE_FORMATS (sin inferencia fila por fila) y
+convierte el marcador '-' de WhatsApp en NaT. Los loaders parsean cada columna una
+sola vez y el resultado queda en el caché del dataset; los análisis por tiempo
+reciben columnas datetime64 ya listas.
+"""
+
+from typing import Optional
+
+import pandas as pd
+
+from config import DATE_FORMATS, DATE_PLACEHOLDERS
+
+
+def parse_datetime(values: pd.Series, fmt: Optional[str] = None) -> pd.Series:
+    """Convierte una columna de texto a datetime64 con un formato exacto.
+
+    Args:
+        values: Columna con fechas como texto
+        fmt: Formato strftime; sin formato pandas infiere el formato de los valores
+
+    Returns:
+        Serie datetime64 (NaT para marcadores y valores inválidos)
+    """
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+    values = values.mask(values.isin(DATE_PLACEHOLDERS))
+    if fmt is None:
+        return pd.to_datetime(values, errors="coerce")
+    return pd.to_datetime(values, format=fmt, errors="coerce")
+
+
+def as_datetime(df: pd.DataFrame, column: str) -> pd.Series:
+    """Columna de fecha como datetime64: la toma tal cual si ya fue parseada al cargar.
+
+    Solo las columnas de config.DATE_FORMATS se parsean con formato exacto; las
+    demás (ej: una columna elegida en la app) se parsean infiriendo el formato.
+    """
+    return parse_datetime(df[column], DATE_FORMATS.get(column))
+
+
+def parse_date_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Parsea en el DataFrame todas las columnas de fecha conocidas que tenga."""
+    for column, fmt in DATE_FORMATS.items():
+        if column in df.columns:
+            df[column] = parse_datetime(df[column], fmt)
+    return df
+
+
+def parse_date_columns_arrow(table):
+    """Parsea las columnas de fecha conocidas de una tabla Arrow con pyarrow.compute.strptime.
+
+    Los marcadores ('-', vacío) y los valores que no cumplen el formato quedan
+    como null. Las columnas que no son texto (ej: ya timestamp) no se tocan.
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    parsed_any = False
+    for column, fmt in DATE_FORMATS.items():
+        if column not in table.column_names:
+            continue
+        values = table.column(column)
+        if pa.types.is_null(values.type):
+            # Columna sin ningún valor en el export (Arrow la infiere como null)
+            parsed = values.cast(pa.timestamp('s'))
+        elif pa.types.is_string(values.type) or pa.types.is_large_string(values.type):
+            parsed = pc.strptime(values, format=fmt, unit='s', error_is_null=True)
+        else:
+            continue
+        table = table.set_column(table.column_names.index(column), column, parsed)
+        parsed_any = True
+
+    if parsed_any and table.schema.metadata and b'pandas' in table.schema.metadata:
+        # Los metadatos de pandas declaran las fechas como texto y to_pandas() los respetaría
+        metadata = {k: v for k, v in table.schema.metadata.items() if k != b'pandas'}
+        table = table.replace_schema_metadata(metadata or None)
+    return table
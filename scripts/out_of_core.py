@@ -0,0 +1,201 @@
+"""
+Ejecución out-of-core para datasets más grandes que la memoria.
+Estima cuánto ocuparía un archivo cargado en pandas (midiendo sus primeras filas),
+decide si conviene recorrerlo por lotes y ofrece
+un group-by que vuelca sus estados intermedios a disco cuando superan el techo
+de memoria configurado (MEMORY_LIMIT_MB).
+"""
+
+import tempfile
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+import config
+from row_counter import cached_row_count
+
+# Filas que se cargan para medir la memoria por fila de un archivo
+ESTIMATE_SAMPLE_ROWS = 2000
+
+# Fracción del techo que puede ocupar UNA tabla cargada (el resto queda para la app y los cachés)
+LOAD_FRACTION = 0.5
+
+# Fracción del techo para los estados intermedios de un group-by antes de volcarlos a disco
+AGGREGATION_FRACTION = 0.25
+
+# Particiones por hash de las claves al volcar a disco (cada una se agrega por separado al final)
+SPILL_PARTITIONS = 16
+
+
+def memory_limit_bytes() -> int:
+    """Techo de memoria configurado, en bytes."""
+    return config.MEMORY_LIMIT_MB * 1024 * 1024
+
+
+def estimate_row_bytes(filepath: Path, columns: Optional[Sequence[str]] = None, **read_kwargs) -> float:
+    """Bytes por fila del archivo cargado en pandas, medidos sobre las primeras filas.
+
+    Los metadatos de Parquet no sirven para esto: una columna con dictionary
+    encoding ocupa poco en disco pero cada valor se materializa al cargarla.
+
+    Args:
+        filepath: Ruta al archivo
+        columns: Columnas que se cargarían (None = todas)
+        **read_kwargs: encoding y delimiter para CSV
+    """
+    if filepath.suffix == '.parquet':
+        import pyarrow.parquet as pq
+
+        parquet_file = pq.ParquetFile(filepath)
+        names = parquet_file.schema_arrow.names
+        selected = [col for col in columns if col in names] if columns else None
+        batch = next(parquet_file.iter_batches(batch_size=ESTIMATE_SAMPLE_ROWS, columns=selected), None)
+        sample = batch.to_pandas() if batch is not None else pd.DataFrame()
+    else:
+        wanted = set(columns) if columns else None
+        sample = pd.read_csv(filepath, nrows=ESTIMATE_SAMPLE_ROWS,
+                             usecols=(lambda col: col in wanted) if wanted else None, **read_kwargs)
+
+    if sample.empty:
+        return 0.0
+    return sample.memory_usage(deep=True).sum() / len(sample)
+
+
+def _total_rows(filepath: Path, delimiter: Optional[str] = None) -> int:
+    if filepath.suffix == '.parquet':
+        import pyarrow.parquet as pq
+        return pq.ParquetFile(filepath).metadata.num_rows
+    return cached_row_count(filepath, delimiter=delimiter)
+
+
+def estimate_table_bytes(filepath: Path, columns: Optional[Sequence[str]] = None, **read_kwargs) -> int:
+    """Bytes aproximados del archivo completo cargado en pandas."""
+    return int(_total_rows(filepath, read_kwargs.get('delimiter')) * estimate_row_bytes(filepath, columns, **read_kwargs))
+
+
+def out_of_core_enabled(filepath: Path, columns: Optional[Sequence[str]] = None, **read_kwargs) -> bool:
+    """Si el archivo debe procesarse por lotes según config.OUT_OF_CORE ("auto", "on", "off")."""
+    mode = config.OUT_OF_CORE
+    if mode == "on":
+        return True
+    if mode == "off":
+        return False
+    return estimate_table_bytes(filepath, columns, **read_kwargs) > memory_limit_bytes() * LOAD_FRACTION
+
+
+def rows_within_limit(filepath: Path, columns: Optional[Sequence[str]] = None, **read_kwargs) -> Optional[int]:
+    """Máximo de filas que se pueden cargar sin pasar el techo, o None si no hay que limitar."""
+    if not out_of_core_enabled(filepath, columns, **read_kwargs):
+        return None
+    row_bytes = estimate_row_bytes(filepath, columns, **read_kwargs)
+    if row_bytes == 0:
+        return None
+    return max(1, int(memory_limit_bytes() * LOAD_FRACTION / row_bytes))
+
+
+class SpillingAggregator:
+    """Group-by de medidas que vuelca a disco cuando excede su presupuesto de memoria.
+
+    Cada lote se pre-agrega y se acumula en memoria. Si los parciales superan el
+    presupuesto se re-agrupan; si aun así no caben, se escriben en Parquet
+    particionados por hash de las claves. Al final cada partición se agrega por
+    separado, así que nunca se tiene el estado completo en memoria a la vez.
+    Las medidas se suman, salvo las indicadas en aggregations (ej: {'primera': 'min'});
+    la función tiene que poder re-aplicarse sobre los parciales (sum, min o max).
+
+    Uso:
+        with SpillingAggregator(['Operador', 'Mensaje'], ['n']) as agg:
+            for df in lotes:
+                agg.add(df)
+            for parte in agg.iter_results():
+                ...
+    """
+
+    def __init__(self, keys: Sequence[str], measures: Sequence[str], memory_limit: Optional[int] = None,
+                 partitions: int = SPILL_PARTITIONS, spill_dir: Optional[str] = None,
+                 aggregations: Optional[Dict[str, str]] = None):
+        self.keys = list(keys)
+        self.measures = list(measures)
+        self.aggregations = {m: (aggregations or {}).get(m, 'sum') for m in self.measures}
+        self.memory_limit = memory_limit if memory_limit is not None else int(memory_limit_bytes() * AGGREGATION_FRACTION)
+        self.partitions = partitions
+        self.spill_dir = spill_dir if spill_dir is not None else config.SPILL_DIR
+        self.spills = 0
+        self._parts: List[pd.DataFrame] = []
+        self._bytes = 0
+        self._tmp: Optional[tempfile.TemporaryDirectory] = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self) -> None:
+        """Elimina los archivos volcados a disco."""
+        if self._tmp is not None:
+            self._tmp.cleanup()
+            self._tmp = None
+
+    def _group(self, df: pd.DataFrame) -> pd.DataFrame:
+        grouped = df.groupby(self.keys, dropna=False, sort=False, observed=True)[self.measures]
+        if all(f == 'sum' for f in self.aggregations.values()):
+            return grouped.sum().reset_index()
+        return grouped.agg(self.aggregations).reset_index()
+
+    @staticmethod
+    def _size(df: pd.DataFrame) -> int:
+        return int(df.memory_usage(deep=True).sum())
+
+    def add(self, df: pd.DataFrame) -> None:
+        """Agrega un lote con las columnas de claves y medidas."""
+        part = self._group(df)
+        self._parts.append(part)
+        self._bytes += self._size(part)
+        if self._bytes <= self.memory_limit:
+            return
+
+        merged = self._group(pd.concat(self._parts, ignore_index=True))
+        merged_bytes = self._size(merged)
+        if merged_bytes > self.memory_limit / 2:
+            self._spill(merged)
+            self._parts, self._bytes = [], 0
+        else:
+            self._parts, self._bytes = [merged], merged_bytes
+
+    def _spill(self, df: pd.DataFrame) -> None:
+        if self._tmp is None:
+            self._tmp = tempfile.TemporaryDirectory(prefix="spill_", dir=self.spill_dir)
+        partition = pd.util.hash_pandas_object(df[self.keys], index=False).to_numpy() % self.partitions
+        for p in np.unique(partition):
+            path = Path(self._tmp.name) / f"p{p:03d}_{self.spills:06d}.parquet"
+            df[partition == p].to_parquet(path, index=False)
+        self.spills += 1
+
+    def iter_results(self) -> Iterator[pd.DataFrame]:
+        """Resultado final por partes; cada clave aparece en una sola parte."""
+        in_memory = self._group(pd.concat(self._parts, ignore_index=True)) if self._parts else None
+        self._parts, self._bytes = [], 0
+
+        if self._tmp is None:
+            if in_memory is not None:
+                yield in_memory
+            return
+
+        if in_memory is not None:
+            self._spill(in_memory)
+        spill_dir = Path(self._tmp.name)
+        for p in range(self.partitions):
+            files = sorted(spill_dir.glob(f"p{p:03d}_*.parquet"))
+            if files:
+                yield self._group(pd.concat([pd.read_parquet(f) for f in files], ignore_index=True))
+        self.close()
+
+    def result(self) -> pd.DataFrame:
+        """Resultado final completo (usar solo cuando el resultado agregado es pequeño)."""
+        parts = list(self.iter_results())
+        if not parts:
+            return pd.DataFrame(columns=self.keys + self.measures)
+        return pd.concat(parts, ignore_index=True)
@@ -1,48 +1,162 @@
 """
 Módulo para validación de números telefónicos de Colombia.
 Validación completa de números móviles con detección de operadores y patrones sospechosos.
+
+validar_numero_colombiano() valida un número; validar_columna() valida una
+columna completa (pandas o Arrow) con operaciones vectorizadas y el mismo
+resultado, para listas de envío de millones de números. Los patrones
+sospechosos de una columna se evalúan en lote sobre la matriz de dígitos
+(matriz_digitos y detectar_patrones_sospechosos).
 """
 
+import json
 import re
+from bisect import bisect_right
+from datetime import date
+from pathlib import Path
+
+import numpy as np
 import pandas as pd
-from typing import Dict, List, Tuple
-from collections import Counter
-
-
-# Definición de prefijos válidos por operador (después del +57 y 3)
-PREFIJOS_OPERADORES = {
-    'Tigo': [
-        (300, 306),  # 300-306
-    ],
-    'Movistar': [
-        (310, 314),  # 310-314
-        (316, 319),  # 316-319
-        (321, 323),  # 321-323
-    ],
-    'Claro': [
-        (315, 315),  # 315
-        (320, 320),  # 320
-        (324, 325),  # 324-325
-    ],
-    'Avantel': [
-        (350, 352),  # 350-352
-    ],
-    'ETB': [
-        (353, 355),  # 353-355
-    ],
-    'WOM': [
-        (356, 357),  # 356-357
-    ],
-    'Virgin Mobile': [
-        (328, 329),  # 328-329
-    ],
-    'Éxito Móvil': [
-        (358, 359),  # 358-359
-    ],
-    'Flash Mobile': [
-        (334, 334),  # 334
-    ],
-}
+import pyarrow as pa
+import pyarrow.compute as pc
+from typing import Dict, List, NamedTuple, Tuple
+
+try:
+    from config import NUMBERING_PLAN_DIR
+except ImportError:  # importado como scripts.phone_validator (test_validator, ejemplo_validador)
+    from scripts.config import NUMBERING_PLAN_DIR
+
+
+# ==================== PLAN DE NUMERACIÓN ====================
+
+# Planes de numeración versionados: un JSON por plan con "version", "vigente_desde"
+# (AAAA-MM-DD; sin fecha aplica a todo lo anterior al plan siguiente) y "operadores"
+# con los rangos de prefijo (los 3 dígitos después del +57) de cada operador
+PLANES_DIR = NUMBERING_PLAN_DIR
+
+
+class PlanNumeracion(NamedTuple):
+    """Asignación de prefijos a operadores vigente desde una fecha."""
+    version: str
+    vigente_desde: date
+    rangos: Dict[str, List[Tuple[int, int]]]
+
+
+def leer_plan(archivo: Path) -> PlanNumeracion:
+    """Lee un plan de numeración en JSON."""
+    with open(archivo, encoding='utf-8') as f:
+        datos = json.load(f)
+    
+    vigente_desde = date.fromisoformat(datos['vigente_desde']) if datos.get('vigente_desde') else date.min
+    rangos = {
+        operador: [(int(inicio), int(fin)) for inicio, fin in lista]
+        for operador, lista in datos['operadores'].items()
+    }
+    return PlanNumeracion(str(datos.get('version', archivo.stem)), vigente_desde, rangos)
+
+
+def cargar_planes(directorio: Path = PLANES_DIR) -> List[PlanNumeracion]:
+    """Lee los planes del directorio, ordenados por fecha de vigencia."""
+    planes = sorted((leer_plan(a) for a in sorted(Path(directorio).glob('*.json'))), key=lambda p: p.vigente_desde)
+    if not planes:
+        raise ValueError(f"No hay planes de numeración en {directorio}")
+    
+    vigencias = [plan.vigente_desde for plan in planes]
+    if len(set(vigencias)) != len(vigencias):
+        raise ValueError(f"Hay planes de numeración con la misma fecha de vigencia en {directorio}")
+    return planes
+
+
+def compilar_plan(plan: PlanNumeracion, operadores: List[str]) -> np.ndarray:
+    """
+    Compila los rangos del plan en un arreglo de 1000 posiciones.
+    
+    Args:
+        plan: Plan de numeración
+        operadores: Vocabulario de operadores (debe incluir 'Desconocido')
+        
+    Returns:
+        Arreglo int8 prefijo → índice en operadores ('Desconocido' sin asignar)
+    """
+    tabla = np.full(1000, operadores.index('Desconocido'), dtype=np.int8)
+    asignado = np.zeros(1000, dtype=bool)
+    
+    for operador, rangos in plan.rangos.items():
+        for inicio, fin in rangos:
+            if not 0 <= inicio <= fin <= 999:
+                raise ValueError(f"Plan {plan.version}: rango {inicio}-{fin} de {operador} fuera de 000-999")
+            if asignado[inicio:fin + 1].any():
+                raise ValueError(f"Plan {plan.version}: el rango {inicio}-{fin} de {operador} se cruza con otro operador")
+            tabla[inicio:fin + 1] = operadores.index(operador)
+            asignado[inicio:fin + 1] = True
+    
+    return tabla
+
+
+PLANES = cargar_planes()
+
+# Vocabulario de operadores de todos los planes y una tabla de 1000 prefijos por plan
+OPERADORES = ['N/A', 'Desconocido', *dict.fromkeys(op for plan in PLANES for op in plan.rangos)]
+TABLAS_PLANES = np.stack([compilar_plan(plan, OPERADORES) for plan in PLANES])
+_VIGENCIAS = [plan.vigente_desde for plan in PLANES]
+# Las mismas tablas con el nombre del operador, para consultas de un solo número
+_NOMBRES_PLANES = [[OPERADORES[codigo] for codigo in tabla] for tabla in TABLAS_PLANES]
+
+
+def _indice_plan(fecha=None) -> int:
+    """Índice en PLANES del plan vigente en la fecha (sin fecha: el vigente hoy)."""
+    # Un solo plan sin fecha de inicio: no hay nada que elegir
+    if len(_VIGENCIAS) == 1 and _VIGENCIAS[0] == date.min:
+        return 0
+    dia = date.today() if fecha is None or pd.isna(fecha) else pd.Timestamp(fecha).date()
+    indice = bisect_right(_VIGENCIAS, dia) - 1
+    if indice < 0:
+        raise ValueError(f"No hay plan de numeración vigente el {dia} (el primero rige desde {_VIGENCIAS[0]})")
+    return indice
+
+
+def _dias(fechas, cantidad: int) -> np.ndarray:
+    """Fechas como datetime64[D]: una para todas las filas o una por fila (NaT = hoy)."""
+    if fechas is None or np.ndim(fechas) == 0:
+        dia = pd.Timestamp(fechas) if fechas is not None else pd.NaT
+        dias = np.full(cantidad, np.datetime64('NaT', 'D') if pd.isna(dia) else np.datetime64(dia.date(), 'D'))
+    else:
+        dias = pd.to_datetime(pd.Series(fechas)).to_numpy(dtype='datetime64[D]')
+        if len(dias) != cantidad:
+            raise ValueError(f"Se esperaban {cantidad} fechas y llegaron {len(dias)}")
+    return np.where(np.isnat(dias), np.datetime64(date.today(), 'D'), dias)
+
+
+def _indices_plan(dias: np.ndarray) -> np.ndarray:
+    """Índice en PLANES del plan vigente en cada fecha."""
+    indices = np.searchsorted(np.array(_VIGENCIAS, dtype='datetime64[D]'), dias, side='right') - 1
+    if len(indices) and indices.min() < 0:
+        raise ValueError(f"Hay fechas anteriores al primer plan de numeración ({_VIGENCIAS[0]})")
+    return indices
+
+
+def plan_vigente(fecha=None) -> PlanNumeracion:
+    """Plan de numeración vigente en la fecha (por defecto hoy)."""
+    return PLANES[_indice_plan(fecha)]
+
+
+def operadores_de_prefijos(prefijos, fechas=None) -> np.ndarray:
+    """
+    Operador de muchos prefijos a la vez: un indexado en la tabla de cada plan.
+    
+    Args:
+        prefijos: Prefijos de 3 dígitos (0-999)
+        fechas: Fecha de vigencia para todos, una por prefijo o None (hoy)
+        
+    Returns:
+        Arreglo de índices en OPERADORES
+    """
+    prefijos = np.asarray(prefijos)
+    return TABLAS_PLANES[_indices_plan(_dias(fechas, len(prefijos))), prefijos]
+
+
+# Rangos del plan vigente hoy, por operador (después del +57 y 3)
+PREFIJOS_OPERADORES = plan_vigente().rangos
 
 
 def limpiar_numero(numero: str) -> str:
@@ -87,12 +201,13 @@ def extraer_numero_movil(numero_limpio: str) -> Tuple[str, bool]:
     return numero_limpio, False
 
 
-def identificar_operador(numero_movil: str) -> str:
+def identificar_operador(numero_movil: str, fecha=None) -> str:
     """
     Identifica el operador basado en el prefijo del número.
     
     Args:
         numero_movil: Número sin código de país (10 dígitos)
+        fecha: Fecha del envío, para usar el plan de numeración de ese momento (None = hoy)
         
     Returns:
         Nombre del operador o 'Desconocido'
@@ -106,13 +221,11 @@ def identificar_operador(numero_movil: str) -> str:
     except ValueError:
         return 'Desconocido'
     
-    # Buscar en rangos de operadores
-    for operador, rangos in PREFIJOS_OPERADORES.items():
-        for inicio, fin in rangos:
-            if inicio <= prefijo <= fin:
-                return operador
+    if not 0 <= prefijo <= 999:
+        return 'Desconocido'
     
-    return 'Desconocido'
+    # Consulta directa en la tabla de 1000 prefijos del plan
+    return _NOMBRES_PLANES[_indice_plan(fecha)][prefijo]
 
 
 def detectar_patron_sospechoso(numero_movil: str) -> Tuple[bool, str]:
@@ -169,12 +282,13 @@ def detectar_patron_sospechoso(numero_movil: str) -> Tuple[bool, str]:
     return False, ""
 
 
-def validar_numero_colombiano(numero: str) -> Dict:
+def validar_numero_colombiano(numero: str, fecha=None) -> Dict:
     """
     Valida un número telefónico colombiano completo.
     
     Args:
         numero: Número telefónico a validar
+        fecha: Fecha del envío, para validar con el plan de numeración vigente entonces (None = hoy)
         
     Returns:
         Diccionario con resultado de validación:
@@ -232,7 +346,7 @@ def validar_numero_colombiano(numero: str) -> Dict:
         return resultado
     
     # 6. Identificar operador
-    operador = identificar_operador(numero_movil)
+    operador = identificar_operador(numero_movil, fecha)
     resultado['operador'] = operador
     
     if operador == 'Desconocido':
@@ -256,25 +370,358 @@ def validar_numero_colombiano(numero: str) -> Dict:
     return resultado
 
 
-def validar_lista_numeros(numeros: List[str]) -> pd.DataFrame:
+# ==================== VALIDACIÓN COLUMNAR ====================
+
+# Vocabulario fijo de los categóricos del resultado columnar (los resultados de
+# distintos lotes se pueden concatenar sin recodificar)
+CATEGORIAS = [
+    'No procesado',
+    'Vacío',
+    'Formato inválido',
+    'Longitud inválida',
+    'No es celular',
+    'Prefijo inválido',
+    'Válido',
+    'Válido (Sospechoso)',
+]
+COLUMNAS_RESULTADO = [
+    'numero_original',
+    'numero_limpio',
+    'numero_completo',
+    'valido',
+    'categoria',
+    'operador',
+    'mensaje_error',
+    'sospechoso',
+    'razon_sospecha',
+]
+
+# Claves de mensaje_error: fijas, o base + longitud / prefijo para los mensajes con número
+_MENSAJES_FIJOS = {
+    0: '',
+    1: 'Número vacío o nulo',
+    2: 'Contiene caracteres no numéricos después de limpiar',
+    3: 'No comienza con 3 (no es celular)',
+}
+_CLAVE_LONGITUD = 1_000
+_CLAVE_PREFIJO = 1_000_000
+
+
+def _mensaje_error(clave: int) -> str:
+    """Texto de mensaje_error para una clave (mismos textos que validar_numero_colombiano)."""
+    if clave >= _CLAVE_PREFIJO:
+        return f'Prefijo {clave - _CLAVE_PREFIJO} no corresponde a ningún operador colombiano'
+    if clave >= _CLAVE_LONGITUD:
+        return f'Longitud inválida: {clave - _CLAVE_LONGITUD} dígitos (esperado: 10)'
+    return _MENSAJES_FIJOS[clave]
+
+
+def _columna_texto(numeros) -> Tuple[pd.Series, pa.ChunkedArray]:
+    """Normaliza la entrada a (serie original, texto de Arrow con nulos).
+    
+    El texto es str(numero), como en limpiar_numero(): los enteros se convierten
+    en Arrow y el resto (float, mezclas de tipos) con astype(str) de pandas.
     """
-    Valida una lista completa de números y retorna un DataFrame.
+    if isinstance(numeros, (pa.Array, pa.ChunkedArray)):
+        numeros = pd.Series(pd.arrays.ArrowExtensionArray(numeros))
+    elif not isinstance(numeros, pd.Series):
+        numeros = pd.Series(numeros, dtype=object)
+    numeros = numeros.reset_index(drop=True)
+    
+    try:
+        if pd.api.types.is_integer_dtype(numeros.dtype) or pd.api.types.is_string_dtype(numeros.dtype):
+            texto = pa.array(numeros, from_pandas=True)
+            # Las columnas de Arrow con varios bloques ya llegan como ChunkedArray
+            if isinstance(texto, pa.Array):
+                texto = pa.chunked_array([texto])
+            return numeros, pc.cast(texto, pa.string())
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+        pass   # objetos que no son texto: se convierten con str() abajo
+    
+    como_texto = numeros.astype(str).to_numpy(dtype=object, na_value=None)
+    texto = pa.array(como_texto, type=pa.string(), mask=numeros.isna().to_numpy())
+    return numeros, pa.chunked_array([texto])
+
+
+def _a_numpy(arreglo, nulo) -> np.ndarray:
+    """Resultado de pyarrow.compute como arreglo de NumPy (nulos reemplazados por nulo)."""
+    return np.asarray(pc.fill_null(arreglo, nulo))
+
+
+def _matriz_de_texto(numeros: pa.ChunkedArray) -> np.ndarray:
+    """Matriz de dígitos de texto que ya se sabe de 10 dígitos ASCII.
+    
+    Los 10 bytes de cada número están contiguos en el buffer de datos de Arrow,
+    así que la matriz se lee directo de ese buffer.
+    """
+    numeros = numeros.combine_chunks()
+    if len(numeros) == 0:
+        return np.empty((0, 10), dtype=np.uint8)
+    _, offsets, valores = numeros.buffers()
+    inicio = int(np.frombuffer(offsets, dtype=np.int32, count=1, offset=numeros.offset * 4)[0])
+    datos = np.frombuffer(valores, dtype=np.uint8, count=len(numeros) * 10, offset=inicio)
+    return (datos - ord('0')).reshape(-1, 10)
+
+
+def matriz_digitos(numeros) -> np.ndarray:
+    """
+    Convierte una columna de números de 10 dígitos en una matriz N×10 uint8.
     
     Args:
-        numeros: Lista de números a validar
+        numeros: Enteros (hasta 10 dígitos) o texto de exactamente 10 dígitos;
+                 Serie de pandas, arreglo de Arrow o NumPy, o lista
         
     Returns:
-        DataFrame con resultados de validación
+        Matriz con el valor (0-9) de cada dígito, una fila por número
+    """
+    if isinstance(numeros, (pa.Array, pa.ChunkedArray)):
+        numeros = pd.Series(pd.arrays.ArrowExtensionArray(numeros))
+    elif not isinstance(numeros, pd.Series):
+        numeros = pd.Series(numeros)
+    
+    if pd.api.types.is_integer_dtype(numeros.dtype):
+        valores = numeros.to_numpy(dtype=np.int64)
+        if len(valores) and (valores.min() < 0 or valores.max() > 9_999_999_999):
+            raise ValueError("matriz_digitos espera enteros de hasta 10 dígitos")
+        # Dos mitades de 5 dígitos: la división en int32 es mucho más rápida que en int64
+        digitos = np.empty((len(valores), 10), dtype=np.uint8)
+        for columna, mitad in ((4, valores // 100_000), (9, valores % 100_000)):
+            mitad = mitad.astype(np.int32)
+            for j in range(columna, columna - 5, -1):
+                mitad, digitos[:, j] = np.divmod(mitad, 10)
+        return digitos
+    
+    texto = pa.chunked_array([pa.array(numeros, type=pa.string(), from_pandas=True)])
+    if texto.null_count or not pc.all(pc.match_substring_regex(texto, r'^[0-9]{10}$')).as_py():
+        raise ValueError("matriz_digitos espera números de exactamente 10 dígitos")
+    return _matriz_de_texto(texto)
+
+
+# Códigos de razón de detectar_patrones_sospechosos() (índices en RAZONES_SOSPECHA).
+# Los patrones repetitivo y alternante tienen un código por cada par de dígitos.
+RAZON_NINGUNA = 0
+RAZON_IGUALES = 1
+RAZON_CEROS = 2
+RAZON_ASCENDENTE = 3
+RAZON_DESCENDENTE = 4
+RAZON_CONSECUTIVOS = 5
+RAZON_REPETITIVO = 6      # + par (00-99)
+RAZON_ALTERNANTE = 106    # + par (00-99)
+
+# Mismos textos que detectar_patron_sospechoso()
+RAZONES_SOSPECHA = [
+    '',
+    'Todos los dígitos son iguales',
+    'Termina en 4 o más ceros',
+    'Contiene secuencia ascendente',
+    'Contiene secuencia descendente',
+    'Más de 4 dígitos consecutivos iguales',
+    *(f'Patrón repetitivo ({par:02d} x 4)' for par in range(100)),
+    *(f'Patrón alternante detectado: {par:02d} x 3' for par in range(100)),
+]
+
+
+# Posición del bit más bajo encendido de cada valor de 9 bits (ventana que cumple primero)
+_PRIMER_BIT = np.array([0] + [(v & -v).bit_length() - 1 for v in range(1, 512)], dtype=np.int8)
+
+# Filas por bloque: las columnas de un bloque caben en la caché del procesador
+_FILAS_BLOQUE = 1 << 16
+
+
+def _ventanas_de_4(bits: np.ndarray) -> np.ndarray:
+    """Bit i encendido si los bits i..i+3 están encendidos (4 posiciones seguidas)."""
+    pares = bits & (bits >> 1)
+    return pares & (pares >> 2)
+
+
+def _detectar_bloque(columnas: np.ndarray) -> np.ndarray:
+    """detectar_patrones_sospechosos() sobre un bloque en columnas (10×N int8)."""
+    n = columnas.shape[1]
+    # Bit j: relación entre los dígitos j y j+1 (salto_dos: entre j y j+2)
+    sube = np.zeros(n, dtype=np.uint16)
+    baja = np.zeros(n, dtype=np.uint16)
+    igual = np.zeros(n, dtype=np.uint16)
+    salto_dos = np.zeros(n, dtype=np.uint16)
+    for j in range(9):
+        diferencia = columnas[j + 1] - columnas[j]
+        sube |= (diferencia == 1).astype(np.uint16) << j
+        baja |= (diferencia == -1).astype(np.uint16) << j
+        igual |= (diferencia == 0).astype(np.uint16) << j
+        if j < 8:
+            salto_dos |= (columnas[j + 2] == columnas[j]).astype(np.uint16) << j
+    
+    # Se asigna de la última regla a la primera: gana la primera que cumple
+    razon = np.zeros(n, dtype=np.uint8)
+    
+    # ABABAB en 6 dígitos desde la posición i (i = 0..4), con A != B
+    alternante = _ventanas_de_4(salto_dos) & ~igual & 0x1F
+    filas = np.flatnonzero(alternante)
+    inicio = _PRIMER_BIT[alternante[filas]]
+    razon[filas] = RAZON_ALTERNANTE + columnas[inicio, filas] * 10 + columnas[inicio + 1, filas]
+    
+    # Los 8 primeros dígitos son el primer par repetido 4 veces
+    filas = np.flatnonzero((salto_dos & 0x3F) == 0x3F)
+    razon[filas] = RAZON_REPETITIVO + columnas[0, filas] * 10 + columnas[1, filas]
+    
+    # 5 o más dígitos iguales seguidos
+    razon[_ventanas_de_4(igual) != 0] = RAZON_CONSECUTIVOS
+    
+    # Secuencias de 5 dígitos (gana la primera ventana, ascendente o descendente)
+    ascendente = _ventanas_de_4(sube)
+    secuencia = ascendente | _ventanas_de_4(baja)
+    filas = np.flatnonzero(secuencia)
+    es_ascendente = (ascendente[filas] >> _PRIMER_BIT[secuencia[filas]]) & 1
+    razon[filas] = np.where(es_ascendente, RAZON_ASCENDENTE, RAZON_DESCENDENTE)
+    
+    razon[(columnas[6] | columnas[7] | columnas[8] | columnas[9]) == 0] = RAZON_CEROS
+    razon[igual == 0x1FF] = RAZON_IGUALES
+    return razon
+
+
+def detectar_patrones_sospechosos(digitos: np.ndarray) -> np.ndarray:
     """
-    resultados = []
+    Detecta patrones sospechosos en lote, con las reglas de detectar_patron_sospechoso().
     
-    for numero in numeros:
-        resultado = validar_numero_colombiano(numero)
-        resultados.append(resultado)
+    Las comparaciones entre dígitos vecinos (diferencia de +1, -1 o 0, e igualdad
+    a dos posiciones) se empaquetan en un entero de bits por número; cada regla
+    es entonces una operación de bits: 4 bits seguidos son 5 dígitos en
+    secuencia o repetidos, y el bit más bajo es la primera ventana. Cada número
+    recibe la razón de la primera regla que cumple, en el mismo orden que la
+    versión por número. La matriz se procesa por bloques de filas.
+    
+    Args:
+        digitos: Matriz N×10 uint8 (ver matriz_digitos)
+        
+    Returns:
+        Arreglo uint8 con el código de razón de cada número (0 = no sospechoso)
+    """
+    razon = np.empty(len(digitos), dtype=np.uint8)
+    for inicio in range(0, len(digitos), _FILAS_BLOQUE):
+        bloque = digitos[inicio:inicio + _FILAS_BLOQUE]
+        columnas = np.ascontiguousarray(bloque.T, dtype=np.int8)
+        razon[inicio:inicio + len(bloque)] = _detectar_bloque(columnas)
+    return razon
+
+
+def _reemplazar_filas(resultado: pd.DataFrame, filas: np.ndarray, legado: pd.DataFrame) -> None:
+    """Sobrescribe filas del resultado columnar con resultados de validar_numero_colombiano()."""
+    for columna in COLUMNAS_RESULTADO[1:]:
+        valores = legado[columna].to_numpy()
+        if isinstance(resultado[columna].dtype, pd.CategoricalDtype):
+            nuevas = [v for v in pd.unique(valores) if v not in resultado[columna].cat.categories]
+            resultado[columna] = resultado[columna].cat.add_categories(nuevas)
+        resultado.loc[filas, columna] = valores
+
+
+def validar_columna(numeros, fechas=None) -> pd.DataFrame:
+    """
+    Valida una columna completa de números con operaciones vectorizadas.
     
-    df = pd.DataFrame(resultados)
+    El resultado es el mismo que validar_numero_colombiano() fila a fila, pero la
+    limpieza, el código 57, la longitud, el prefijo y el operador se resuelven con
+    pyarrow.compute y NumPy sobre toda la columna.
     
-    return df
+    Args:
+        numeros: Serie de pandas, arreglo de Arrow, lista o arreglo de NumPy
+        fechas: Fecha de envío (una para todos o una por número) para validar
+                con el plan de numeración vigente entonces; None = hoy
+        
+    Returns:
+        DataFrame con las columnas de validar_numero_colombiano(): los números como
+        texto de Arrow y categoría, operador, mensaje y razón como categóricos
+    """
+    originales, texto = _columna_texto(numeros)
+    n = len(originales)
+    
+    # 1. Limpiar: \p{Nd} equivale a \d de Python (dígitos Unicode), como limpiar_numero()
+    limpio = pc.replace_substring_regex(texto, r'[^\p{Nd}+]', '')
+    vacio = _a_numpy(pc.equal(limpio, ''), True)
+    # Los dígitos no ASCII (ej: '３') son rarísimos: esas filas usan el validador por número
+    no_ascii = ~_a_numpy(pc.string_is_ascii(limpio), True)
+    
+    # 2. Quitar los '+' y el código de país
+    sin_mas = pc.replace_substring(limpio, '+', '')
+    movil = pc.if_else(pc.starts_with(sin_mas, '57'), pc.utf8_slice_codeunits(sin_mas, 2), sin_mas)
+    longitud = _a_numpy(pc.utf8_length(movil), 0)
+    
+    categoria = np.full(n, CATEGORIAS.index('Longitud inválida'), dtype=np.int8)
+    operador = np.full(n, OPERADORES.index('N/A'), dtype=np.int8)
+    clave_mensaje = _CLAVE_LONGITUD + longitud.astype(np.int64)
+    
+    # 3. Solo '+' (o solo '57'): no queda ningún dígito
+    formato_invalido = ~vacio & (longitud == 0)
+    categoria[formato_invalido] = CATEGORIAS.index('Formato inválido')
+    clave_mensaje[formato_invalido] = 2
+    categoria[vacio] = CATEGORIAS.index('Vacío')
+    clave_mensaje[vacio] = 1
+    
+    # 4. Números de 10 dígitos: prefijo y operador sobre la matriz de dígitos
+    filas = np.flatnonzero(~vacio & ~no_ascii & (longitud == 10))
+    digitos = _matriz_de_texto(pc.take(movil, filas))
+    prefijo = digitos[:, 0].astype(np.int32) * 100 + digitos[:, 1] * 10 + digitos[:, 2]
+    celular = digitos[:, 0] == 3
+    
+    # Operador: un indexado en la tabla de 1000 prefijos del plan vigente en cada fecha
+    dias = _dias(fechas, n)
+    operador_filas = np.where(
+        celular, TABLAS_PLANES[_indices_plan(dias[filas]), prefijo], OPERADORES.index('N/A')
+    ).astype(np.int8)
+    desconocido = operador_filas == OPERADORES.index('Desconocido')
+    valido_filas = celular & ~desconocido
+    
+    # 5. Patrones sospechosos de los válidos, en lote sobre la matriz de dígitos
+    razon_filas = np.where(valido_filas, detectar_patrones_sospechosos(digitos), RAZON_NINGUNA)
+    sospechoso_filas = razon_filas != RAZON_NINGUNA
+    
+    operador[filas] = operador_filas
+    categoria[filas] = np.select(
+        [~celular, desconocido, sospechoso_filas],
+        [CATEGORIAS.index('No es celular'), CATEGORIAS.index('Prefijo inválido'), CATEGORIAS.index('Válido (Sospechoso)')],
+        CATEGORIAS.index('Válido'),
+    )
+    clave_mensaje[filas] = np.select([~celular, desconocido], [3, _CLAVE_PREFIJO + prefijo], 0)
+    
+    sospechoso = np.zeros(n, dtype=bool)
+    sospechoso[filas] = sospechoso_filas
+    razon = np.zeros(n, dtype=np.uint8)
+    razon[filas] = razon_filas
+    
+    claves, codigos_mensaje = np.unique(clave_mensaje, return_inverse=True)
+    numero_limpio = pc.if_else(pa.array(vacio), '', movil)
+    numero_completo = pc.if_else(pa.array(vacio), '', pc.binary_join_element_wise('+57', movil, ''))
+    
+    resultado = pd.DataFrame({
+        'numero_original': originales,
+        'numero_limpio': pd.arrays.ArrowExtensionArray(numero_limpio),
+        'numero_completo': pd.arrays.ArrowExtensionArray(numero_completo),
+        'valido': (categoria == CATEGORIAS.index('Válido')) | (categoria == CATEGORIAS.index('Válido (Sospechoso)')),
+        'categoria': pd.Categorical.from_codes(categoria, CATEGORIAS),
+        'operador': pd.Categorical.from_codes(operador, OPERADORES),
+        'mensaje_error': pd.Categorical.from_codes(codigos_mensaje, [_mensaje_error(c) for c in claves]),
+        'sospechoso': sospechoso,
+        'razon_sospecha': pd.Categorical.from_codes(razon, RAZONES_SOSPECHA),
+    })
+    
+    filas_no_ascii = np.flatnonzero(no_ascii & ~vacio)
+    if len(filas_no_ascii):
+        legado = pd.DataFrame([validar_numero_colombiano(originales[i], dias[i]) for i in filas_no_ascii])
+        _reemplazar_filas(resultado, filas_no_ascii, legado)
+    
+    return resultado
+
+
+def validar_lista_numeros(numeros: List[str], fechas=None) -> pd.DataFrame:
+    """
+    Valida una lista completa de números y retorna un DataFrame.
+    
+    Args:
+        numeros: Lista de números a validar (o Serie de pandas / arreglo de Arrow)
+        fechas: Fecha de envío, una para todos o una por número (None = hoy)
+        
+    Returns:
+        DataFrame con resultados de validación (ver validar_columna)
+    """
+    return validar_columna(numeros, fechas)
 
 
 def analizar_resultados(df_validacion: pd.DataFrame) -> Dict:
@@ -293,23 +740,46 @@ def analizar_resultados(df_validacion: pd.DataFrame) -> Dict:
         return {'total': 0}
     
     validos = df_validacion['valido'].sum()
-    invalidos = total - validos
     
-    # Contar por categoría
-    categorias = df_validacion['categoria'].value_counts().to_dict()
+    # Contar por categoría (los categóricos de validar_columna traen categorías sin filas)
+    categorias = _conteos(df_validacion['categoria'])
     
     # Contar por operador (solo válidos)
-    operadores = df_validacion[df_validacion['valido']]['operador'].value_counts().to_dict()
+    operadores = _conteos(df_validacion.loc[df_validacion['valido'], 'operador'])
     
     # Contar sospechosos
     sospechosos = df_validacion['sospechoso'].sum()
     
-    # Detectar repetidos
-    numeros_limpios = df_validacion['numero_limpio'].dropna()
-    repeticiones = Counter(numeros_limpios)
-    numeros_repetidos = {num: count for num, count in repeticiones.items() if count > 1}
+    # Detectar repetidos (en orden de primera aparición, así los empates quedan igual que antes)
+    repeticiones = df_validacion['numero_limpio'].dropna().value_counts(sort=False)
+    repetidos = repeticiones[repeticiones > 1].sort_values(ascending=False, kind='stable')
+    
+    return estadisticas_validacion(total, validos, sospechosos, categorias, operadores,
+                                   len(repetidos), repetidos.head(10))
+
+
+def estadisticas_validacion(total: int, validos, sospechosos, categorias: Dict[str, int],
+                            operadores: Dict[str, int], numeros_repetidos: int,
+                            top_repetidos: pd.Series) -> Dict:
+    """
+    Diccionario de analizar_resultados() a partir de los conteos ya calculados
+    (lo usa también el validador por lotes, que cuenta archivo por archivo).
     
-    estadisticas = {
+    Args:
+        total: Números validados (mayor que 0)
+        validos: Cantidad de válidos
+        sospechosos: Cantidad de sospechosos
+        categorias: Cantidad por categoría, de mayor a menor
+        operadores: Cantidad de válidos por operador, de mayor a menor
+        numeros_repetidos: Números distintos que aparecen más de una vez
+        top_repetidos: Repeticiones de los más repetidos (número → veces), de mayor a menor
+        
+    Returns:
+        Diccionario con estadísticas
+    """
+    invalidos = total - validos
+    
+    return {
         'total': total,
         'validos': int(validos),
         'invalidos': int(invalidos),
@@ -319,11 +789,14 @@ def analizar_resultados(df_validacion: pd.DataFrame) -> Dict:
         'operadores': operadores,
         'sospechosos': int(sospechosos),
         'porcentaje_sospechosos': round(sospechosos / total * 100, 2),
-        'numeros_repetidos': len(numeros_repetidos),
-        'top_repetidos': dict(sorted(numeros_repetidos.items(), key=lambda x: x[1], reverse=True)[:10]),
+        'numeros_repetidos': numeros_repetidos,
+        'top_repetidos': {str(num): int(count) for num, count in top_repetidos.items()},
     }
-    
-    return estadisticas
+
+
+def _conteos(columna: pd.Series) -> Dict[str, int]:
+    """value_counts() como diccionario, sin las categorías que no tienen filas."""
+    return {valor: int(cantidad) for valor, cantidad in columna.value_counts().items() if cantidad}
 
 
 # ==================== EJEMPLO DE USO CON STREAMLIT ====================
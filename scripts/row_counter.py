@@ -0,0 +1,173 @@
+"""
+Conteo rápido de filas para archivos CSV y Parquet.
+Recorre el CSV con memory-mapping y lleva el estado de comillas, de modo que los
+saltos de línea dentro de un campo entre comillas (ej: 'Mensaje' con varias líneas)
+no cuentan como filas nuevas. El resultado se persiste en el sidecar de agregados.
+"""
+
+import mmap
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from aggregate_store import cached_aggregate
+
+# Bytes por bloque al recorrer el archivo mapeado
+COUNT_CHUNK_SIZE = 16 * 1024 * 1024
+
+_NEWLINE = ord('\n')
+_CARRIAGE_RETURN = ord('\r')
+_DELIMITER_CANDIDATES = (';', ',', '\t', '|')
+
+# Clave del conteo en el sidecar (v2: las comillas solo abren campo al inicio del campo;
+# los conteos guardados con la clave anterior pueden estar mal)
+ROW_COUNT_KEY = 'row_count_v2'
+
+
+def _sniff_delimiter(filepath: Path) -> str:
+    """Delimitador más frecuente en la primera línea (el encabezado)."""
+    with open(filepath, 'rb') as f:
+        first_line = f.readline(1 << 16)
+    counts = {d: first_line.count(d.encode()) for d in _DELIMITER_CANDIDATES}
+    best = max(counts, key=counts.get)
+    return best if counts[best] else ','
+
+
+def count_csv_rows(filepath: Path, delimiter: Optional[str] = None, quotechar: str = '"',
+                   header: bool = True, chunk_size: int = COUNT_CHUNK_SIZE) -> int:
+    """Cuenta los registros de un CSV respetando los campos entre comillas.
+
+    Un salto de línea termina un registro solo si hay un número par de comillas
+    antes de él; las comillas escapadas ("") suman dos y no alteran la paridad.
+    Como en pandas, una comilla solo abre un campo entre comillas al inicio del
+    campo: si aparece alguna comilla suelta (ej: 'dice "hola' sin cerrar) la
+    paridad ya no sirve y el conteo se hace con el tokenizador de pyarrow.
+    Las líneas en blanco se ignoran, igual que en pandas.read_csv. Funciona con
+    LATIN1 y UTF-8 porque comillas, delimitadores y saltos de línea son bytes
+    ASCII en ambos.
+
+    Args:
+        filepath: Ruta al archivo CSV
+        delimiter: Delimitador de campos (None = el más frecuente del encabezado)
+        quotechar: Carácter de comillas del CSV
+        header: Si la primera fila es el encabezado (no se cuenta)
+        chunk_size: Bytes por bloque
+
+    Returns:
+        Número de registros (sin el encabezado)
+    """
+    if delimiter is None:
+        delimiter = _sniff_delimiter(filepath)
+    quote = ord(quotechar)
+    # Bytes tras los que una comilla abre campo (o cierra el anterior si es "")
+    field_start = np.zeros(256, dtype=bool)
+    field_start[[ord(delimiter), _NEWLINE, _CARRIAGE_RETURN, quote]] = True
+    records = 0
+    in_quotes = 0
+    last_end = -1          # posición del último fin de registro (global)
+    prev_byte = _NEWLINE   # último byte del bloque anterior; el inicio del archivo cuenta como salto de línea
+
+    with open(filepath, 'rb') as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Archivo vacío: mmap no admite longitud 0
+            return 0
+
+        with mm:
+            size = len(mm)
+            for offset in range(0, size, chunk_size):
+                length = min(chunk_size, size - offset)
+                buf = np.frombuffer(mm, dtype=np.uint8, count=length, offset=offset)
+                newlines = np.flatnonzero(buf == _NEWLINE)
+                quotes = np.flatnonzero(buf == quote)
+
+                if len(quotes):
+                    # Las comillas en posición par de la paridad abren campo y las impares lo cierran:
+                    # abrir exige inicio de campo y cerrar exige fin de campo (o la pareja de "")
+                    opening, closing = quotes[in_quotes::2], quotes[1 - in_quotes::2]
+                    before = buf[np.maximum(opening - 1, 0)]
+                    if len(opening) and opening[0] == 0:
+                        before[0] = prev_byte
+                    after = buf[np.minimum(closing + 1, length - 1)]
+                    if len(closing) and closing[-1] == length - 1:
+                        after[-1] = mm[offset + length] if offset + length < size else _NEWLINE
+                    if not (field_start[before].all() and field_start[after].all()):
+                        del buf
+                        return _count_with_tokenizer(filepath, delimiter, quotechar, header)
+
+                    # Comillas antes de cada salto de línea → paridad dentro/fuera de comillas
+                    before_newline = np.searchsorted(quotes, newlines)
+                    ends = newlines[((before_newline + in_quotes) & 1) == 0]
+                    in_quotes = (in_quotes + len(quotes)) & 1
+                elif in_quotes:
+                    ends = newlines[:0]
+                else:
+                    ends = newlines
+
+                if len(ends):
+                    # Líneas en blanco: fin de registro justo después del anterior (\n o \r\n)
+                    ends_global = ends + offset
+                    gap = ends_global - np.concatenate(([last_end], ends_global[:-1]))
+                    byte_before = np.where(ends > 0, buf[np.maximum(ends - 1, 0)], prev_byte)
+                    blank = (gap == 1) | ((gap == 2) & (byte_before == _CARRIAGE_RETURN))
+                    records += int(len(ends) - blank.sum())
+                    last_end = int(ends_global[-1])
+
+                prev_byte = int(buf[-1])
+                del buf
+
+    # Último registro sin salto de línea final
+    if prev_byte != _NEWLINE and last_end < size - 1:
+        records += 1
+
+    if header and records:
+        records -= 1
+    return records
+
+
+def _count_with_tokenizer(filepath: Path, delimiter: str, quotechar: str, header: bool) -> int:
+    """Conteo exacto con el lector de CSV de pyarrow (comillas sueltas, filas con otro número de columnas)."""
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+
+    invalid_rows = 0
+
+    def count_invalid(row) -> str:
+        nonlocal invalid_rows
+        invalid_rows += 1
+        return 'skip'
+
+    # LATIN1 nunca falla al decodificar: la estructura del CSV es ASCII en cualquier codificación
+    read_options = pacsv.ReadOptions(encoding='latin1', autogenerate_column_names=not header)
+    parse_options = pacsv.ParseOptions(delimiter=delimiter, quote_char=quotechar,
+                                       newlines_in_values=True, invalid_row_handler=count_invalid)
+    with pacsv.open_csv(filepath, read_options=read_options, parse_options=parse_options) as reader:
+        first_column = reader.schema.names[0]
+    invalid_rows = 0
+
+    # Solo se materializa la primera columna, como texto (la inferencia de tipos podría fallar más adelante)
+    convert_options = pacsv.ConvertOptions(include_columns=[first_column],
+                                           column_types={first_column: pa.string()})
+    rows = 0
+    with pacsv.open_csv(filepath, read_options=read_options, parse_options=parse_options,
+                        convert_options=convert_options) as reader:
+        for batch in reader:
+            rows += batch.num_rows
+    return rows + invalid_rows
+
+
+def count_file_rows(filepath: Path, **kwargs) -> int:
+    """Cuenta filas de un CSV o Parquet (en Parquet solo lee los metadatos)."""
+    if filepath.suffix == '.parquet':
+        import pyarrow.parquet as pq
+        return pq.ParquetFile(filepath).metadata.num_rows
+    return count_csv_rows(filepath, **kwargs)
+
+
+def cached_row_count(filepath: Path, **kwargs) -> int:
+    """Conteo de filas persistido en el sidecar y validado por la huella del archivo."""
+    if filepath.suffix == '.parquet':
+        return count_file_rows(filepath)
+    return cached_aggregate(filepath, ROW_COUNT_KEY, lambda: count_csv_rows(filepath, **kwargs))
@@ -0,0 +1,197 @@
+"""
+Muestreo aleatorio para estimaciones rápidas con intervalos de confianza.
+Reemplaza el uso de las primeras N filas (nrows) por muestras uniformes o
+estratificadas a través de los row groups de Parquet, y muestreo de reservorio
+para CSV. Cada conteo estimado viene con su intervalo de confianza.
+"""
+
+import math
+from pathlib import Path
+from statistics import NormalDist
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+def z_score(confidence: float = 0.95) -> float:
+    """Valor z de la normal estándar para un nivel de confianza bilateral."""
+    return NormalDist().inv_cdf(0.5 + confidence / 2)
+
+
+def sample_size_for_error(margin: float, confidence: float = 0.95,
+                          population: Optional[int] = None, p: float = 0.5) -> int:
+    """Tamaño de muestra necesario para estimar una proporción con el error dado.
+
+    Args:
+        margin: Error máximo deseado en la proporción (ej: 0.01 = ±1 punto porcentual)
+        confidence: Nivel de confianza (ej: 0.95)
+        population: Tamaño de la población, para aplicar la corrección por población finita
+        p: Proporción esperada (0.5 es el caso más conservador)
+
+    Returns:
+        Cantidad de filas a muestrear
+    """
+    z = z_score(confidence)
+    n0 = (z ** 2) * p * (1 - p) / (margin ** 2)
+    if population:
+        n0 = n0 / (1 + (n0 - 1) / population)
+        return int(min(population, math.ceil(n0)))
+    return int(math.ceil(n0))
+
+
+def _allocate(sizes: List[int], n: int) -> np.ndarray:
+    """Reparte n filas entre estratos proporcionalmente a su tamaño (sin exceder cada estrato)."""
+    sizes = np.asarray(sizes, dtype=np.int64)
+    total = sizes.sum()
+    if total == 0:
+        return np.zeros_like(sizes)
+    exact = sizes * min(n, total) / total
+    alloc = np.floor(exact).astype(np.int64)
+    # Repartir el sobrante a los estratos con mayor parte decimal
+    remainder = int(min(n, total) - alloc.sum())
+    if remainder > 0:
+        order = np.argsort(-(exact - alloc))
+        alloc[order[:remainder]] += 1
+    return np.minimum(alloc, sizes)
+
+
+def sample_parquet(filepath: Path, n: int, columns: Optional[List[str]] = None,
+                   method: str = "stratified", seed: Optional[int] = None) -> pd.DataFrame:
+    """Muestra aleatoria de un archivo Parquet a través de sus row groups.
+
+    Args:
+        filepath: Ruta al archivo Parquet
+        n: Tamaño de la muestra
+        columns: Columnas a leer
+        method: "uniform" (muestra aleatoria simple sobre todas las filas) o
+                "stratified" (cada row group es un estrato, asignación proporcional).
+                Como los archivos vienen ordenados por fecha de envío, estratificar
+                por row group garantiza cubrir todo el periodo.
+        seed: Semilla para reproducibilidad
+
+    Returns:
+        DataFrame con la muestra
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    rng = np.random.default_rng(seed)
+    # Las columnas de texto se leen como diccionario: solo se decodifican los índices de
+    # cada página y el texto se materializa únicamente para las filas de la muestra
+    schema = pq.read_schema(filepath)
+    text_columns = {
+        field.name: field.type for field in schema
+        if (columns is None or field.name in columns)
+        and (pa.types.is_string(field.type) or pa.types.is_large_string(field.type))
+    }
+    parquet_file = pq.ParquetFile(filepath, read_dictionary=list(text_columns) or None)
+    metadata = parquet_file.metadata
+    sizes = [metadata.row_group(i).num_rows for i in range(metadata.num_row_groups)]
+    total = sum(sizes)
+
+    if method == "uniform":
+        picks = np.sort(rng.choice(total, size=min(n, total), replace=False))
+        bounds = np.cumsum([0] + sizes)
+        per_group = [picks[(picks >= bounds[i]) & (picks < bounds[i + 1])] - bounds[i]
+                     for i in range(len(sizes))]
+    elif method == "stratified":
+        alloc = _allocate(sizes, n)
+        per_group = [np.sort(rng.choice(size, size=k, replace=False)) if k else np.array([], dtype=np.int64)
+                     for size, k in zip(sizes, alloc)]
+    else:
+        raise ValueError(f"Método de muestreo desconocido: {method}")
+
+    parts = []
+    for i, rows in enumerate(per_group):
+        if len(rows) == 0:
+            continue
+        group = parquet_file.read_row_group(i, columns=columns).take(rows)
+        for name, text_type in text_columns.items():
+            decoded = [chunk.dictionary_decode().cast(text_type) for chunk in group.column(name).chunks]
+            group = group.set_column(group.schema.get_field_index(name), name,
+                                     pa.chunked_array(decoded, type=text_type))
+        parts.append(group.to_pandas())
+
+    if not parts:
+        return pd.DataFrame(columns=columns)
+    return pd.concat(parts, ignore_index=True)
+
+
+def reservoir_sample_csv(filepath: Path, n: int, columns: Optional[List[str]] = None,
+                         chunksize: int = 100_000, seed: Optional[int] = None,
+                         **kwargs) -> pd.DataFrame:
+    """Muestra aleatoria simple de un CSV en una sola pasada con memoria acotada.
+
+    Muestreo de reservorio por prioridades aleatorias: a cada fila se le asigna una
+    clave uniforme y se conservan las n filas con las claves más bajas. Es equivalente
+    al algoritmo R pero se evalúa de forma vectorizada por chunk.
+    """
+    rng = np.random.default_rng(seed)
+    reservoir = None
+
+    for chunk in pd.read_csv(filepath, usecols=columns, chunksize=chunksize, **kwargs):
+        chunk = chunk.assign(_clave=rng.random(len(chunk)))
+        reservoir = chunk if reservoir is None else pd.concat([reservoir, chunk], ignore_index=True)
+        if len(reservoir) > n:
+            reservoir = reservoir.nsmallest(n, '_clave')
+
+    if reservoir is None:
+        return pd.DataFrame(columns=columns)
+    return reservoir.drop(columns='_clave').reset_index(drop=True)
+
+
+def sample_file(filepath: Path, n: int, columns: Optional[List[str]] = None,
+                method: str = "stratified", seed: Optional[int] = None, **kwargs) -> pd.DataFrame:
+    """Muestra aleatoria de un archivo CSV o Parquet según su extensión."""
+    if filepath.suffix == '.parquet':
+        return sample_parquet(filepath, n, columns=columns, method=method, seed=seed)
+    return reservoir_sample_csv(filepath, n, columns=columns, seed=seed, **kwargs)
+
+
+def wilson_interval(successes: int, n: int, confidence: float = 0.95,
+                    population: Optional[int] = None) -> tuple:
+    """Intervalo de Wilson para una proporción.
+
+    Con population se aplica la corrección por población finita a través del
+    tamaño efectivo de muestra n_eff = n · (N - 1) / (N - n).
+    """
+    if n == 0:
+        return 0.0, 1.0
+    if population and n >= population:
+        p = successes / n
+        return p, p
+
+    n_eff = n * (population - 1) / (population - n) if population else n
+    p = successes / n
+    z = z_score(confidence)
+    denom = 1 + z ** 2 / n_eff
+    center = (p + z ** 2 / (2 * n_eff)) / denom
+    half = z * math.sqrt(p * (1 - p) / n_eff + z ** 2 / (4 * n_eff ** 2)) / denom
+    return max(0.0, center - half), min(1.0, center + half)
+
+
+def estimate_counts(values: pd.Series, population: int,
+                    confidence: float = 0.95) -> Dict[str, Dict]:
+    """Estima conteos por categoría en la población a partir de una muestra.
+
+    Args:
+        values: Columna muestreada
+        population: Total de filas de la población
+        confidence: Nivel de confianza del intervalo
+
+    Returns:
+        {categoría: {'estimate', 'low', 'high', 'proportion'}}
+    """
+    n = len(values)
+    estimates = {}
+    for category, count in values.value_counts().items():
+        low, high = wilson_interval(int(count), n, confidence, population)
+        proportion = count / n
+        estimates[str(category)] = {
+            'estimate': int(round(proportion * population)),
+            'low': int(math.floor(low * population)),
+            'high': int(math.ceil(high * population)),
+            'proportion': round(float(proportion), 6),
+        }
+    return estimates
@@ -4,7 +4,6 @@ Clasifica mensajes como positivos, negativos o neutrales.
 """
 
 import pandas as pd
-from openai import OpenAI
 import json
 from pathlib import Path
 import hashlib
@@ -15,7 +14,16 @@ OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
 
 CACHE_FILE = Path(__file__).parent.parent / "data" / ".sentiment_cache.json"
 
-client = OpenAI(api_key=OPENAI_API_KEY) if OPENAI_API_KEY else None
+_client = None
+
+
+def get_client():
+    """Cliente de OpenAI, creado en el primer uso (openai se importa solo si hay API key)."""
+    global _client
+    if _client is None and OPENAI_API_KEY:
+        from openai import OpenAI
+        _client = OpenAI(api_key=OPENAI_API_KEY)
+    return _client
 
 
 def load_cache() -> dict:
@@ -59,6 +67,7 @@ def analyze_batch(messages: list, use_cache: bool = True, batch_size: int = 10)
     if not messages:
         return []
     
+    client = get_client()
     if not client or not OPENAI_API_KEY:
         return [{
             'mensaje': msg[:100],
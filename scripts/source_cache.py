@@ -0,0 +1,192 @@
+"""
+Caché de resultados por huella de los archivos fuente.
+Cada función cacheada declara de qué fuentes depende ('sms', 'interacciones',
+'whatsapp') y la clave del caché incluye la huella (ruta, tamaño, mtime) de esos
+archivos, resuelta en cada llamada. Reemplazar un archivo solo recalcula lo que
+depende de él; el resto del caché sigue valiendo.
+
+Dónde se guardan los resultados lo decide el backend activo (ver cache_backends
+y set_backend); la app de Streamlit instala el suyo en data_loader.
+
+Un hilo vigía revisa las huellas cada WATCH_INTERVAL segundos, libera los
+resultados de las fuentes que cambiaron y sube data_version() para que la app
+se vuelva a dibujar.
+"""
+
+import functools
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import config
+from cache_backends import CacheBackend, make_backend
+
+# Archivos actuales de cada fuente, resueltos en cada llamada (detecta exports nuevos
+# o un .parquet que reemplaza al .csv)
+SOURCES: Dict[str, Callable[[], List[Path]]] = {
+    "sms": lambda: [config._resolve_sms_file()],
+    "interacciones": lambda: [config._resolve_interacciones_file()],
+    "whatsapp": lambda: config._resolve_whatsapp_files(),
+}
+
+# Funciones cacheadas que dependen de cada fuente
+_DEPENDENTS: Dict[str, List[Callable]] = {source: [] for source in SOURCES}
+
+# Última huella vista por el vigía y contador de cambios detectados
+_SNAPSHOT: Dict[str, Tuple] = {}
+_VERSION = 0
+_LOCK = threading.Lock()
+
+_WATCHER: Optional["SourceWatcher"] = None
+
+# Backend de caché activo (se crea según config.CACHE_BACKEND en el primer uso)
+_BACKEND: Optional[CacheBackend] = None
+
+
+def set_backend(backend: CacheBackend) -> None:
+    """Cambia el backend de caché; las funciones ya decoradas lo usan desde su próxima llamada."""
+    global _BACKEND
+    _BACKEND = backend
+
+
+def get_backend() -> CacheBackend:
+    """Backend de caché activo."""
+    global _BACKEND
+    if _BACKEND is None:
+        _BACKEND = make_backend()
+    return _BACKEND
+
+
+def source_paths(source: str) -> List[Path]:
+    """Rutas actuales de una fuente (pueden no existir, ej: el sample cuando no hay datos)."""
+    return SOURCES[source]()
+
+
+def source_fingerprint(source: str) -> Tuple:
+    """Huella de una fuente: ((ruta, tamaño, mtime_ns), ...) de sus archivos existentes."""
+    fingerprint = []
+    for filepath in source_paths(source):
+        try:
+            stat = filepath.stat()
+        except OSError:
+            continue
+        fingerprint.append((str(filepath), stat.st_size, stat.st_mtime_ns))
+    return tuple(fingerprint)
+
+
+def sources_fingerprint(sources) -> Tuple:
+    """Huellas de varias fuentes, en el orden dado."""
+    return tuple(source_fingerprint(source) for source in sources)
+
+
+def cached_on(*sources: str, ttl: Optional[float] = None, shared: bool = False):
+    """Cachea la función en el backend activo con la huella de sus fuentes como parte de la clave.
+
+    shared=True marca resultados de solo lectura que se guardan una sola vez por
+    proceso y se entregan sin copiar a todos los llamadores (ej: los datasets
+    completos); quien los recibe no debe modificarlos.
+
+    Uso:
+        @cached_on("sms")
+        def count_total_sms_records() -> int: ...
+
+        @cached_on("interacciones", ttl=3600)
+        def get_interacciones_messages(limit: int = None) -> pd.DataFrame: ...
+    """
+    unknown = set(sources) - set(SOURCES)
+    if unknown:
+        raise ValueError(f"Fuentes desconocidas: {sorted(unknown)}")
+
+    def decorator(func):
+        # La versión cacheada se arma con el backend activo y se rehace si este cambia
+        bound = {}
+
+        def cached():
+            backend = get_backend()
+            if bound.get("backend") is not backend:
+                bound["backend"], bound["func"] = backend, backend.wrap(func, ttl=ttl, shared=shared)
+            return bound["func"]
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            return cached()(*args, source_fingerprint=sources_fingerprint(sources), **kwargs)
+
+        wrapper.sources = sources
+        wrapper.shared = shared
+        wrapper.clear = lambda: cached().clear()
+        for source in sources:
+            _DEPENDENTS[source].append(wrapper)
+        return wrapper
+
+    return decorator
+
+
+def invalidate(source: str) -> None:
+    """Libera los resultados cacheados de las funciones que dependen de la fuente."""
+    for func in _DEPENDENTS[source]:
+        func.clear()
+
+
+def check_for_changes() -> List[str]:
+    """Compara las huellas con la última revisión e invalida las fuentes que cambiaron.
+
+    La primera llamada solo toma la foto inicial.
+
+    Returns:
+        Fuentes que cambiaron desde la revisión anterior
+    """
+    global _VERSION
+    changed = []
+    with _LOCK:
+        for source in SOURCES:
+            fingerprint = source_fingerprint(source)
+            previous = _SNAPSHOT.get(source)
+            _SNAPSHOT[source] = fingerprint
+            if previous is not None and previous != fingerprint:
+                changed.append(source)
+        if changed:
+            _VERSION += 1
+
+    for source in changed:
+        invalidate(source)
+    return changed
+
+
+def data_version() -> int:
+    """Cuántas veces el vigía detectó archivos nuevos o modificados."""
+    return _VERSION
+
+
+class SourceWatcher(threading.Thread):
+    """Hilo (daemon) que llama check_for_changes() cada interval segundos."""
+
+    def __init__(self, interval: float):
+        super().__init__(name="source-watcher", daemon=True)
+        self.interval = interval
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        check_for_changes()
+        while not self._stop_event.wait(self.interval):
+            try:
+                changed = check_for_changes()
+                if changed:
+                    print(f"DEBUG: Archivos modificados: {', '.join(changed)}")
+            except Exception as e:
+                print(f"DEBUG: Error revisando archivos de datos: {e}")
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+
+def start_watcher(interval: Optional[float] = None) -> Optional[SourceWatcher]:
+    """Arranca el vigía una sola vez por proceso (None si WATCH_INTERVAL es 0)."""
+    global _WATCHER
+    interval = config.WATCH_INTERVAL if interval is None else interval
+    if interval <= 0:
+        return None
+    with _LOCK:
+        if _WATCHER is None or not _WATCHER.is_alive():
+            _WATCHER = SourceWatcher(interval)
+            _WATCHER.start()
+        return _WATCHER
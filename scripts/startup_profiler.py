@@ -0,0 +1,130 @@
+"""
+Perfilador de arranque de la app.
+Mide el tiempo de importación de cada módulo (python -X importtime en un proceso
+limpio, igual que el primer arranque del servidor) y el de cada paso de
+inicialización registrado con step().
+
+Ejecutar: python scripts/startup_profiler.py [--modulo app] [--top 15] [--presupuesto-ms 1500]
+Termina con código 1 si la importación pasa del presupuesto (STARTUP_BUDGET_MS).
+"""
+
+import argparse
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, NamedTuple
+
+import config
+
+SCRIPTS_DIR = Path(__file__).parent
+
+# Pasos de inicialización medidos en este proceso: {nombre: segundos}
+STARTUP_STEPS: Dict[str, float] = {}
+
+
+class ImportTiming(NamedTuple):
+    """Una línea de -X importtime: tiempos en microsegundos y nivel de anidamiento."""
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+@contextmanager
+def step(name: str):
+    """Registra la duración de un paso de inicialización en STARTUP_STEPS."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        STARTUP_STEPS[name] = time.perf_counter() - start
+
+
+def parse_importtime(output: str) -> List[ImportTiming]:
+    """Convierte la salida de -X importtime en ImportTiming (en el orden de la salida)."""
+    timings = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        # Un espacio antes del nombre en el nivel 0 y dos más por cada nivel
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        timings.append(ImportTiming(name.strip(), int(self_us), int(cumulative_us), depth))
+    return timings
+
+
+def measure_imports(module: str = "app", cwd: Path = SCRIPTS_DIR) -> List[ImportTiming]:
+    """Importa module en un proceso nuevo con -X importtime y retorna los tiempos."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=cwd,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"No se pudo importar {module}:\n{result.stderr[-2000:]}")
+    return parse_importtime(result.stderr)
+
+
+def direct_imports(timings: List[ImportTiming], module: str) -> List[ImportTiming]:
+    """Módulos que importa directamente module (la salida lista los hijos antes que el padre)."""
+    for position in range(len(timings) - 1, -1, -1):
+        if timings[position].module == module:
+            break
+    else:
+        return []
+
+    depth = timings[position].depth
+    children = []
+    for timing in reversed(timings[:position]):
+        if timing.depth <= depth:
+            break
+        if timing.depth == depth + 1:
+            children.append(timing)
+    return sorted(children, key=lambda t: t.cumulative_us, reverse=True)
+
+
+def total_import_ms(timings: List[ImportTiming], module: str) -> float:
+    """Tiempo acumulado de importar module (ms)."""
+    return next((t.cumulative_us / 1000 for t in reversed(timings) if t.module == module), 0.0)
+
+
+def format_report(timings: List[ImportTiming], module: str = "app", top: int = 15) -> str:
+    """Reporte de texto: importaciones directas, módulos más lentos y pasos de inicialización."""
+    lines = [f"Importación de {module}: {total_import_ms(timings, module):,.1f} ms", ""]
+
+    lines.append("Importaciones directas (acumulado):")
+    for timing in direct_imports(timings, module)[:top]:
+        lines.append(f"  {timing.module:<40} {timing.cumulative_us / 1000:>10,.1f} ms")
+
+    lines += ["", "Módulos más lentos (tiempo propio):"]
+    for timing in sorted(timings, key=lambda t: t.self_us, reverse=True)[:top]:
+        lines.append(f"  {timing.module:<40} {timing.self_us / 1000:>10,.1f} ms")
+
+    if STARTUP_STEPS:
+        lines += ["", "Pasos de inicialización:"]
+        for name, seconds in STARTUP_STEPS.items():
+            lines.append(f"  {name:<40} {seconds * 1000:>10,.1f} ms")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--modulo", default="app", help="Módulo a importar (por defecto la app)")
+    parser.add_argument("--top", type=int, default=15, help="Cantidad de módulos por sección")
+    parser.add_argument("--presupuesto-ms", type=float, default=config.STARTUP_BUDGET_MS,
+                        help="Tiempo máximo de importación (ms)")
+    args = parser.parse_args()
+
+    timings = measure_imports(args.modulo)
+    print(format_report(timings, args.modulo, args.top))
+
+    total = total_import_ms(timings, args.modulo)
+    print(f"\nPresupuesto: {args.presupuesto_ms:,.0f} ms → {'✅ OK' if total <= args.presupuesto_ms else '❌ EXCEDIDO'}")
+    sys.exit(0 if total <= args.presupuesto_ms else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,8 @@ from typing import Dict, List, Tuple
 from datetime import datetime, timedelta
 import re
 
+from date_parsing import as_datetime
+
 
 def normalize_phone(phone: str) -> str:
     """Normaliza números telefónicos."""
@@ -52,7 +54,7 @@ def get_date_range(df: pd.DataFrame, date_col: str) -> Tuple[datetime, datetime]
     if date_col not in df.columns:
         return None, None
     
-    dates = pd.to_datetime(df[date_col], errors="coerce")
+    dates = as_datetime(df, date_col)
     return dates.min(), dates.max()
 
 
@@ -61,7 +63,7 @@ def get_busiest_hours(df: pd.DataFrame, date_col: str) -> Dict[int, int]:
     if date_col not in df.columns:
         return {}
     
-    dates = pd.to_datetime(df[date_col], errors="coerce")
+    dates = as_datetime(df, date_col)
     hours = dates.dt.hour.value_counts().sort_index()
     
     return hours.to_dict()
@@ -72,7 +74,7 @@ def get_busiest_days(df: pd.DataFrame, date_col: str) -> Dict[str, int]:
     if date_col not in df.columns:
         return {}
     
-    dates = pd.to_datetime(df[date_col], errors="coerce")
+    dates = as_datetime(df, date_col)
     day_names = {
         0: "Lunes", 1: "Martes", 2: "Miércoles", 3: "Jueves",
         4: "Viernes", 5: "Sábado", 6: "Domingo"
@@ -8,8 +8,10 @@ from phone_validator import (
     validar_numero_colombiano,
     validar_lista_numeros,
     analizar_resultados,
-    PREFIJOS_OPERADORES
+    PREFIJOS_OPERADORES,
+    plan_vigente,
 )
+from validation_store import get_store
 
 # Configuración de página
 st.set_page_config(
@@ -93,7 +95,8 @@ with tab1:
         )
     
     if numero_input:
-        resultado = validar_numero_colombiano(numero_input)
+        # Los números ya validados (en esta u otra sesión) salen del almacén
+        resultado = get_store().validate(numero_input)
         
         st.markdown("---")
         
@@ -142,6 +145,12 @@ with tab1:
             
             if resultado['sospechoso']:
                 st.warning(f"**Sospechoso:** {resultado['razon_sospecha']}")
+            
+            almacen = get_store().stats()
+            st.caption(
+                f"Almacén de validaciones: {almacen['hits']} en memoria, "
+                f"{almacen['disk_hits']} en disco, {almacen['misses']} calculadas"
+            )
 
 # ==================== TAB 2: VALIDAR LISTA ====================
 with tab2:
@@ -172,7 +181,8 @@ with tab2:
                 df_upload = pd.read_csv(uploaded_file)
                 columna = st.selectbox("Selecciona la columna con los números:", df_upload.columns)
                 if columna:
-                    numeros_lista = df_upload[columna].dropna().astype(str).tolist()
+                    # La columna pasa entera al validador columnar, sin convertirla a lista
+                    numeros_lista = df_upload[columna].dropna().astype(str)
                     st.success(f"✅ {len(numeros_lista)} números cargados")
             except Exception as e:
                 st.error(f"Error al leer archivo: {e}")
@@ -363,6 +373,7 @@ with tab3:
     
     df_operadores_doc = pd.DataFrame(operadores_info)
     st.dataframe(df_operadores_doc, use_container_width=True, hide_index=True)
+    st.caption(f"Plan de numeración vigente: {plan_vigente().version} (archivos en scripts/planes_numeracion/)")
     
     st.markdown("""
     ### 3. Patrones Sospechosos
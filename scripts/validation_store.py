@@ -0,0 +1,221 @@
+"""
+Almacén de resultados de validación de números telefónicos.
+Memoiza validar_numero_colombiano() por número canónico (los 10 dígitos del
+celular, sin +57 ni separadores) y versión del plan de numeración: un LRU en
+memoria del proceso delante de una tabla SQLite en disco, que sobrevive entre
+sesiones y campañas. Un plan de numeración nuevo es otra clave, así que los
+resultados de un plan anterior no se reutilizan.
+
+Los números que no tienen 10 dígitos no se guardan: su resultado depende solo
+del formato y calcularlo es tan barato como buscarlo.
+
+Las columnas completas (validar_columna) no pasan por aquí: el motor columnar
+recalcula un millón de números en menos tiempo del que toma buscarlos.
+"""
+
+import atexit
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import config
+from phone_validator import extraer_numero_movil, limpiar_numero, plan_vigente, validar_numero_colombiano
+
+# Cambiar si cambian las reglas del validador (invalida los resultados guardados)
+STORE_VERSION = 1
+
+# Resultados nuevos que se acumulan antes de escribirlos en disco (o segundos desde la última escritura)
+FLUSH_EVERY = 1_000
+FLUSH_INTERVAL = 5.0
+
+# Columnas guardadas por número; las demás se derivan del número
+COLUMNS = ('categoria', 'operador', 'mensaje_error', 'razon_sospecha')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS validaciones (
+    plan TEXT NOT NULL,
+    numero TEXT NOT NULL,
+    categoria TEXT NOT NULL,
+    operador TEXT NOT NULL,
+    mensaje_error TEXT NOT NULL,
+    razon_sospecha TEXT NOT NULL,
+    PRIMARY KEY (plan, numero)
+) WITHOUT ROWID
+"""
+
+
+def canonical_number(numero) -> Optional[str]:
+    """Los 10 dígitos del celular sin +57, o None si el número no los tiene."""
+    if isinstance(numero, str) and numero.isascii() and numero.isdigit():
+        # Ya viene limpio (lo usual en las listas de contactos): sin regex
+        movil, _ = extraer_numero_movil(numero)
+    else:
+        movil, _ = extraer_numero_movil(limpiar_numero(numero))
+    if len(movil) == 10 and movil.isascii() and movil.isdigit():
+        return movil
+    return None
+
+
+class ValidationStore:
+    """Resultados de validación por (versión del plan, número canónico).
+
+    hits cuenta las validaciones resueltas en el LRU, disk_hits las que se
+    leyeron de la tabla en disco y misses las que hubo que calcular.
+    """
+
+    def __init__(self, path: Optional[Path] = None, max_entries: Optional[int] = None):
+        self.max_entries = max_entries if max_entries is not None else config.VALIDATION_CACHE_ENTRIES
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[str, ...]]" = OrderedDict()
+        self._pending = []
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.path = Path(path) if path is not None else None
+        self._db = self._connect() if self.path is not None else None
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        """Abre la tabla en disco; si no se puede, el almacén queda solo en memoria."""
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(self.path, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            if db.execute("PRAGMA user_version").fetchone()[0] != STORE_VERSION:
+                db.execute("DROP TABLE IF EXISTS validaciones")
+                db.execute(f"PRAGMA user_version={STORE_VERSION}")
+            db.execute(_SCHEMA)
+            db.commit()
+            return db
+        except (OSError, sqlite3.Error) as e:
+            print(f"DEBUG: No se pudo abrir el almacén de validaciones {self.path}: {e}")
+            return None
+
+    def validate(self, numero, fecha=None) -> Dict:
+        """Igual que validar_numero_colombiano(numero, fecha), consultando primero el almacén."""
+        movil = canonical_number(numero)
+        if movil is None:
+            return validar_numero_colombiano(numero, fecha)
+
+        key = (plan_vigente(fecha).version, movil)
+        values = self._lookup(key)
+        if values is None:
+            resultado = validar_numero_colombiano(numero, fecha)
+            values = tuple(resultado[c] for c in COLUMNS)
+            self._store(key, values)
+
+        categoria, operador, mensaje_error, razon_sospecha = values
+        return {
+            'numero_original': numero,
+            'numero_limpio': movil,
+            'numero_completo': f'+57{movil}',
+            'valido': categoria.startswith('Válido'),
+            'categoria': categoria,
+            'operador': operador,
+            'mensaje_error': mensaje_error,
+            'sospechoso': bool(razon_sospecha),
+            'razon_sospecha': razon_sospecha,
+        }
+
+    def _lookup(self, key: Tuple[str, str]) -> Optional[Tuple[str, ...]]:
+        with self._lock:
+            values = self._entries.get(key)
+            if values is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return values
+
+            if self._db is not None:
+                row = self._db.execute(
+                    f"SELECT {', '.join(COLUMNS)} FROM validaciones WHERE plan = ? AND numero = ?", key
+                ).fetchone()
+                if row is not None:
+                    self.disk_hits += 1
+                    self._remember(key, tuple(row))
+                    return tuple(row)
+
+            self.misses += 1
+            return None
+
+    def _store(self, key: Tuple[str, str], values: Tuple[str, ...]) -> None:
+        with self._lock:
+            self._remember(key, values)
+            if self._db is not None:
+                self._pending.append(key + values)
+                if len(self._pending) >= FLUSH_EVERY or time.monotonic() - self._last_flush >= FLUSH_INTERVAL:
+                    self._flush()
+
+    def _remember(self, key, values) -> None:
+        """Agrega al LRU y desaloja la entrada menos usada (con el lock tomado)."""
+        self._entries[key] = values
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _flush(self) -> None:
+        """Escribe los resultados pendientes en disco (con el lock tomado)."""
+        self._last_flush = time.monotonic()
+        if not self._pending:
+            return
+        try:
+            self._db.executemany("INSERT OR REPLACE INTO validaciones VALUES (?, ?, ?, ?, ?, ?)", self._pending)
+            self._db.commit()
+        except sqlite3.Error as e:
+            # Disco lleno o de solo lectura: los resultados quedan solo en memoria
+            print(f"DEBUG: No se pudieron guardar validaciones en {self.path}: {e}")
+        self._pending.clear()
+
+    def flush(self) -> None:
+        """Escribe en disco los resultados que aún no se guardaron."""
+        with self._lock:
+            if self._db is not None:
+                self._flush()
+
+    def stats(self) -> Dict[str, int]:
+        """Contadores de aciertos y fallos, y tamaño del LRU."""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'entries': len(self._entries),
+            }
+
+    def clear(self) -> None:
+        """Vacía el LRU y la tabla en disco (ej: después de corregir una regla sin cambiar STORE_VERSION)."""
+        with self._lock:
+            self._entries.clear()
+            self._pending.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM validaciones")
+                self._db.commit()
+
+    def close(self) -> None:
+        """Guarda lo pendiente y cierra la tabla en disco."""
+        with self._lock:
+            if self._db is not None:
+                self._flush()
+                self._db.close()
+                self._db = None
+
+
+_STORE: Optional[ValidationStore] = None
+
+
+def set_store(store: Optional[ValidationStore]) -> None:
+    """Cambia el almacén activo (None = se vuelve a crear desde config en la próxima consulta)."""
+    global _STORE
+    _STORE = store
+
+
+def get_store() -> ValidationStore:
+    """Almacén activo; por defecto en config.VALIDATION_STORE_PATH (vacío = solo memoria)."""
+    global _STORE
+    if _STORE is None:
+        _STORE = ValidationStore(config.VALIDATION_STORE_PATH)
+        atexit.register(_STORE.close)
+    return _STORE
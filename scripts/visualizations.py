@@ -1,18 +1,27 @@
 """
 Módulo para crear visualizaciones y gráficos.
 Incluye Sankey, gráficos de barras, estadísticas, etc.
+
+plotly se importa dentro de cada función (plotly.express tarda más que el resto
+de la app en importarse), así el primer dibujado no espera a los gráficos.
 """
 
+from __future__ import annotations
+
 import pandas as pd
-import plotly.graph_objects as go
-import plotly.express as px
-from typing import Dict, List, Tuple
+from typing import TYPE_CHECKING, Dict, List, Tuple
 import streamlit as st
 from config import COLORS
+from date_parsing import as_datetime
+
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
 
 
 def create_sankey_diagram(source: List, target: List, value: List, title: str = "") -> go.Figure:
     """Crea un diagrama de Sankey mejorado para visualizar flujos de estados."""
+    import plotly.graph_objects as go
+
     if not source or not target or not value:
         return go.Figure().add_annotation(text="No hay datos para visualizar")
     
@@ -158,6 +167,9 @@ def create_sankey_diagram(source: List, target: List, value: List, title: str =
 
 def create_status_bar_chart(data: Dict[str, int], title: str = "") -> go.Figure:
     """Crea un gráfico de barras con estados y sus conteos."""
+    import plotly.graph_objects as go
+    import plotly.express as px
+
     if not data:
         return go.Figure().add_annotation(text="No hay datos disponibles")
     
@@ -186,6 +198,8 @@ def create_status_bar_chart(data: Dict[str, int], title: str = "") -> go.Figure:
 
 def create_pie_chart(data: Dict[str, int], title: str = "") -> go.Figure:
     """Crea un gráfico de pastel con distribución de estados."""
+    import plotly.graph_objects as go
+
     if not data:
         return go.Figure().add_annotation(text="No hay datos disponibles")
     
@@ -212,11 +226,13 @@ def create_pie_chart(data: Dict[str, int], title: str = "") -> go.Figure:
 
 def create_time_series_chart(df: pd.DataFrame, date_col: str, title: str = "") -> go.Figure:
     """Crea un gráfico de serie temporal."""
+    import plotly.graph_objects as go
+
     if df.empty or date_col not in df.columns:
         return go.Figure().add_annotation(text="No hay datos disponibles")
     
     df_time = df.copy()
-    df_time[date_col] = pd.to_datetime(df_time[date_col], errors="coerce")
+    df_time[date_col] = as_datetime(df_time, date_col)
     df_time = df_time.dropna(subset=[date_col]).sort_values(date_col)
     
     if df_time.empty:
@@ -263,6 +279,8 @@ def create_statistics_cards(title: str, total: int, stats: Dict[str, int]) -> No
 
 def create_comparison_chart(sms_stats: Dict, whatsapp_stats: Dict) -> go.Figure:
     """Crea un gráfico comparativo entre SMS y WhatsApp."""
+    import plotly.graph_objects as go
+
     all_states = set(sms_stats.get("states", {}).keys()) | set(whatsapp_stats.get("states", {}).keys())
     
     data = {
@@ -292,6 +310,8 @@ def create_comparison_chart(sms_stats: Dict, whatsapp_stats: Dict) -> go.Figure:
 
 def create_horizontal_bar_chart(data: Dict[str, int], title: str = "") -> go.Figure:
     """Crea un gráfico de barras horizontales (mejor para textos largos)."""
+    import plotly.graph_objects as go
+
     if not data:
         return go.Figure().add_annotation(text="No hay datos disponibles")
     
@@ -347,6 +367,8 @@ def create_horizontal_bar_chart(data: Dict[str, int], title: str = "") -> go.Fig
 
 def create_donut_chart(data: Dict[str, int], title: str = "") -> go.Figure:
     """Crea un gráfico de donut (dona) mejorado."""
+    import plotly.graph_objects as go
+
     if not data:
         return go.Figure().add_annotation(text="No hay datos disponibles")
     
@@ -377,6 +399,8 @@ def create_donut_chart(data: Dict[str, int], title: str = "") -> go.Figure:
 
 def create_stacked_bar_chart(data_dict: Dict[str, Dict[str, int]], title: str = "") -> go.Figure:
     """Crea un gráfico de barras apiladas para múltiples categorías."""
+    import plotly.graph_objects as go
+
     if not data_dict:
         return go.Figure().add_annotation(text="No hay datos disponibles")
     
@@ -0,0 +1,123 @@
+"""
+Script de prueba para el almacén persistente de agregados.
+Ejecutar: python test_aggregate_store.py
+"""
+
+import json
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
+from scripts.aggregate_store import (
+    cached_aggregate,
+    load_aggregate,
+    save_aggregate,
+    sidecar_path,
+)
+
+
+def _crear_archivo(directorio: Path, contenido: bytes) -> Path:
+    archivo = directorio / "datos.csv"
+    archivo.write_bytes(contenido)
+    return archivo
+
+
+def test_guardar_y_cargar():
+    """Un agregado guardado se recupera sin recalcular."""
+    print("\n" + "="*60)
+    print("TEST 1: Guardar y cargar agregados")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        archivo = _crear_archivo(Path(tmp), b"a;b\n1;2\n")
+        llamadas = []
+
+        def calcular():
+            llamadas.append(1)
+            return {"total": 1, "states": {"Entregado": 1}}
+
+        primero = cached_aggregate(archivo, "sms", calcular)
+        segundo = cached_aggregate(archivo, "sms", calcular)
+
+        print(f"Sidecar: {sidecar_path(archivo).name}")
+        print(f"Cálculos realizados: {len(llamadas)}")
+        assert primero == segundo == {"total": 1, "states": {"Entregado": 1}}
+        assert len(llamadas) == 1
+
+
+def test_invalidacion_por_contenido():
+    """Si el archivo cambia, el agregado guardado deja de ser válido."""
+    print("\n" + "="*60)
+    print("TEST 2: Invalidación cuando cambia el archivo")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        archivo = _crear_archivo(Path(tmp), b"a;b\n1;2\n")
+        save_aggregate(archivo, "sms", {"total": 1})
+
+        archivo.write_bytes(b"a;b\n1;2\n3;4\n")
+        resultado = load_aggregate(archivo, "sms")
+        print(f"Agregado tras modificar el archivo: {resultado}")
+        assert resultado is None
+
+
+def test_mtime_distinto_mismo_contenido():
+    """Un archivo copiado de nuevo (mismo contenido, otro mtime) conserva sus agregados."""
+    print("\n" + "="*60)
+    print("TEST 3: Mismo contenido con otro mtime")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        archivo = _crear_archivo(Path(tmp), b"a;b\n1;2\n")
+        save_aggregate(archivo, "sms", {"total": 1})
+
+        stat = archivo.stat()
+        os.utime(archivo, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        resultado = load_aggregate(archivo, "sms")
+        print(f"Agregado tras cambiar solo el mtime: {resultado}")
+        assert resultado == {"total": 1}
+
+
+def _guardar_claves(archivo: str, trabajador: int, claves: int) -> None:
+    for i in range(claves):
+        save_aggregate(Path(archivo), f"w{trabajador}_{i}", {"total": i})
+
+
+def test_guardado_concurrente():
+    """Procesos e hilos que guardan agregados distintos a la vez no pierden ninguno."""
+    print("\n" + "="*60)
+    print("TEST 4: Guardado concurrente de agregados")
+    print("="*60)
+
+    trabajadores, claves = 6, 25
+    for pool in (ProcessPoolExecutor, ThreadPoolExecutor):
+        with tempfile.TemporaryDirectory() as tmp:
+            archivo = _crear_archivo(Path(tmp), b"a;b\n1;2\n")
+            with pool(max_workers=trabajadores) as executor:
+                futuros = [executor.submit(_guardar_claves, str(archivo), w, claves) for w in range(trabajadores)]
+                for futuro in futuros:
+                    futuro.result()
+
+            guardados = json.loads(sidecar_path(archivo).read_text(encoding="utf-8"))["aggregates"]
+            temporales = list(Path(tmp).glob("*.tmp"))
+            print(f"{pool.__name__}: {len(guardados)} agregados guardados, {len(temporales)} temporales")
+            assert len(guardados) == trabajadores * claves
+            assert load_aggregate(archivo, f"w{trabajadores - 1}_{claves - 1}") == {"total": claves - 1}
+            assert not temporales
+
+
+def main():
+    """Ejecuta todos los tests."""
+    test_guardar_y_cargar()
+    test_invalidacion_por_contenido()
+    test_mtime_distinto_mismo_contenido()
+    test_guardado_concurrente()
+
+    print("\n" + "="*60)
+    print("✅ SUITE DE PRUEBAS COMPLETADA")
+    print("="*60)
+
+
+if __name__ == "__main__":
+    main()
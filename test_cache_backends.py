@@ -0,0 +1,199 @@
+"""
+Script de prueba para los backends de caché del motor de datos.
+Ejecutar: python test_cache_backends.py
+"""
+
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / "scripts"))
+
+from cache_backends import DiskCache, LRUCache, NullCache, SingleFlight
+
+
+def _contador(backend, ttl=None):
+    """Función cacheada que cuenta cuántas veces se calculó."""
+    llamadas = []
+
+    def cuadrado(x: int, factor: int = 1) -> int:
+        llamadas.append(x)
+        return x * x * factor
+
+    return backend.wrap(cuadrado, ttl=ttl), llamadas
+
+
+def test_lru():
+    """El LRU normaliza argumentos, respeta la huella y desaloja la entrada menos usada."""
+    print("\n" + "="*60)
+    print("TEST 1: LRU en memoria")
+    print("="*60)
+
+    cuadrado, llamadas = _contador(LRUCache(max_entries=2))
+    assert cuadrado(3) == cuadrado(3, factor=1) == cuadrado(x=3) == 9
+    assert llamadas == [3]
+
+    # Otra huella de los archivos fuente es otra entrada
+    cuadrado(3, source_fingerprint=(("a.csv", 10, 1),))
+    assert llamadas == [3, 3]
+
+    cuadrado(4)           # desaloja la entrada más vieja: cuadrado(3) sin huella
+    cuadrado(3)
+    print(f"Cálculos: {llamadas}")
+    assert llamadas == [3, 3, 4, 3]
+
+    cuadrado.clear()
+    cuadrado(4)
+    assert llamadas == [3, 3, 4, 3, 4]
+
+    # Al llegar otra huella se descartan las entradas de las anteriores
+    backend = LRUCache()
+    cuadrado, llamadas = _contador(backend)
+    cuadrado(2, source_fingerprint=(("a.csv", 10, 1),))
+    cuadrado(3, source_fingerprint=(("a.csv", 10, 1),))
+    cuadrado(2, source_fingerprint=(("a.csv", 20, 2),))
+    print(f"Entradas tras actualizar el archivo: {len(backend._entries)}")
+    assert len(backend._entries) == 1
+
+
+def test_disco_entre_instancias():
+    """El caché en disco sobrevive a otra instancia (otro proceso) y respeta el ttl."""
+    print("\n" + "="*60)
+    print("TEST 2: Caché en disco")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cuadrado, llamadas = _contador(DiskCache(tmp))
+        assert cuadrado(5) == 25
+
+        # Una instancia nueva (ej: la app después del job nocturno) encuentra el resultado
+        otro, otras_llamadas = _contador(DiskCache(tmp))
+        assert otro(5) == 25
+        assert otras_llamadas == []
+
+        vencido, vencidas = _contador(DiskCache(tmp), ttl=-1)
+        vencido(5)
+        print(f"Archivos: {[p.name for p in Path(tmp).rglob('*.pkl')]}")
+        assert vencidas == [5]
+
+        # Con otra huella (archivo actualizado) se borran los resultados de la anterior
+        cuadrado(5, source_fingerprint=(("sms.csv", 10, 1),))
+        cuadrado(6, source_fingerprint=(("sms.csv", 10, 1),))
+        assert len(list(Path(tmp).rglob("*.pkl"))) == 2
+        nuevo, _ = _contador(DiskCache(tmp))
+        nuevo(5, source_fingerprint=(("sms.csv", 20, 2),))
+        print(f"Archivos tras actualizar la fuente: {len(list(Path(tmp).rglob('*.pkl')))}")
+        assert len(list(Path(tmp).rglob("*.pkl"))) == 1
+
+        otro.clear()
+        assert not any(Path(tmp).rglob("*.pkl"))
+
+
+def test_sin_cache():
+    """El backend 'none' recalcula en cada llamada."""
+    print("\n" + "="*60)
+    print("TEST 3: Sin caché")
+    print("="*60)
+
+    cuadrado, llamadas = _contador(NullCache())
+    cuadrado(2)
+    cuadrado(2)
+    assert llamadas == [2, 2]
+
+
+def test_motor_sin_streamlit():
+    """El motor de datos se importa sin cargar Streamlit."""
+    print("\n" + "="*60)
+    print("TEST 4: Motor sin Streamlit")
+    print("="*60)
+
+    codigo = "import sys, data_engine; print('streamlit' in sys.modules)"
+    salida = subprocess.run(
+        [sys.executable, "-c", codigo],
+        cwd=Path(__file__).parent / "scripts",
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.strip()
+    print(f"streamlit importado: {salida}")
+    assert salida == "False"
+
+
+def test_single_flight():
+    """Las llamadas concurrentes a un resultado que no está en caché comparten un solo cálculo."""
+    print("\n" + "="*60)
+    print("TEST 5: Single-flight con el caché frío")
+    print("="*60)
+
+    backend = LRUCache()
+    llamadas = []
+    lock = threading.Lock()
+
+    def lectura_lenta(archivo: str) -> list:
+        with lock:
+            llamadas.append(archivo)
+        time.sleep(0.2)
+        return [archivo]
+
+    leer = backend.wrap(lectura_lenta)
+    pedidos = ["sms"] * 8 + ["interacciones"] * 4
+    with ThreadPoolExecutor(max_workers=len(pedidos)) as pool:
+        resultados = list(pool.map(lambda a: leer(a, source_fingerprint=(("v1",),)), pedidos))
+
+    print(f"Cálculos: {sorted(llamadas)} | resultados compartidos: {backend.single_flight.shared}")
+    assert sorted(llamadas) == ["interacciones", "sms"]
+    assert all(r is resultados[0] for r in resultados[:8])
+    assert backend.single_flight.shared == len(pedidos) - 2
+
+    # Otra huella (archivo reemplazado) es otro cálculo
+    leer("sms", source_fingerprint=(("v2",),))
+    assert llamadas.count("sms") == 2
+
+
+def test_single_flight_errores():
+    """Un error llega a todos los que esperaban y la clave queda libre para reintentar."""
+    print("\n" + "="*60)
+    print("TEST 6: Single-flight con errores")
+    print("="*60)
+
+    flight = SingleFlight()
+    intentos = []
+
+    def falla():
+        intentos.append(1)
+        time.sleep(0.1)
+        raise OSError("archivo bloqueado")
+
+    def pedir(_):
+        try:
+            return flight.do("sms", falla)
+        except OSError as e:
+            return str(e)
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        errores = list(pool.map(pedir, range(4)))
+    assert errores == ["archivo bloqueado"] * 4
+    assert len(intentos) == 1
+    assert flight.do("sms", lambda: "ok") == "ok"
+
+
+def main():
+    """Ejecuta todos los tests."""
+    test_lru()
+    test_disco_entre_instancias()
+    test_sin_cache()
+    test_motor_sin_streamlit()
+    test_single_flight()
+    test_single_flight_errores()
+
+    print("\n" + "="*60)
+    print("✅ SUITE DE PRUEBAS COMPLETADA")
+    print("="*60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Script de prueba para el cubo OLAP preagregado.
+Ejecutar: python test_cube.py
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent / "scripts"))
+
+from aggregate_store import cached_table
+from cube import batch_cells, build_cube, rollup
+
+
+def _interacciones(n: int = 6000, seed: int = 0) -> pd.DataFrame:
+    """Filas crudas de interacciones con usuarios nulos y códigos vacíos."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "Estado del envio": rng.choice(["Entregado", "Lista negra", "Operador fallido"], n),
+        "Operador": rng.choice(["Claro", "Movistar", "Tigo"], n),
+        "Codigo corto": rng.choice(["890123", "85432", ""], n),
+        "Usuario": rng.choice(["Cuantico_tecnologia", "cliente1", None], n),
+        "Hora": rng.integers(0, 24, n),
+        "Total de mensajes": rng.integers(1, 4, n),
+    })
+
+
+def _cubo(df: pd.DataFrame, lote: int = 1000) -> pd.DataFrame:
+    """Construye el cubo recorriendo el DataFrame por lotes."""
+    def celdas():
+        for inicio in range(0, len(df), lote):
+            parte = df.iloc[inicio:inicio + lote]
+            yield batch_cells(
+                "interacciones",
+                len(parte),
+                state=parte["Estado del envio"],
+                operator=parte["Operador"],
+                codigo=parte["Codigo corto"],
+                usuario=parte["Usuario"],
+                hour=parte["Hora"],
+                messages=parte["Total de mensajes"],
+            )
+    return build_cube(celdas())
+
+
+def test_rollup_igual_a_filas_crudas():
+    """Los roll-ups del cubo dan los mismos conteos que value_counts sobre las filas."""
+    print("\n" + "="*60)
+    print("TEST 1: Roll-up vs filas crudas")
+    print("="*60)
+
+    df = _interacciones()
+    cubo = _cubo(df)
+    print(f"{len(df):,} filas → {len(cubo):,} celdas")
+    assert cubo["count"].sum() == len(df)
+
+    filtrado = df[df["Usuario"] != "Cuantico_tecnologia"]
+    por_operador = rollup(cubo, ["operator"], exclude={"usuario": "Cuantico_tecnologia"})
+    esperado = filtrado["Operador"].value_counts().to_dict()
+    obtenido = dict(zip(por_operador["operator"], por_operador["count"]))
+    print(f"Por operador (sin Cuantico): {obtenido}")
+    assert obtenido == esperado
+
+    por_hora = rollup(cubo, ["hour"], where={"state": "Entregado"})
+    esperado = df.loc[df["Estado del envio"] == "Entregado", "Hora"].value_counts().to_dict()
+    assert dict(zip(por_hora["hour"], por_hora["count"])) == esperado
+
+
+def test_clicks():
+    """Las medidas de clicks se suman por celda y el total sin dimensiones es exacto."""
+    print("\n" + "="*60)
+    print("TEST 2: Medidas de clicks")
+    print("="*60)
+
+    clicks = np.array([[0, 0, 0], [2, 0, 1], [1, 0, 0], [0, 0, 0]])
+    celdas = batch_cells("sms", 4, state=["Entregado"] * 4, clicks=clicks)
+    total = rollup(build_cube([celdas]), measures=["count", "with_clicks_1", "total_clicks_1", "with_any_click"])
+    print(total.to_dict("records"))
+    assert total.iloc[0].tolist() == [4, 2, 3, 2]
+
+
+def test_cubo_persistido():
+    """El cubo se guarda como Parquet junto al archivo y se recalcula si el archivo cambia."""
+    print("\n" + "="*60)
+    print("TEST 3: Cubo persistido")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        archivo = Path(tmp) / "interacciones.csv"
+        archivo.write_text("a;b\n1;2\n")
+        construcciones = []
+
+        def construir():
+            construcciones.append(1)
+            return _cubo(_interacciones(600, seed=len(construcciones)))
+
+        primero = cached_table(archivo, "cube", construir)
+        segundo = cached_table(archivo, "cube", construir)
+        assert len(construcciones) == 1
+        assert rollup(primero, ["state"]).equals(rollup(segundo, ["state"]))
+
+        archivo.write_text("a;b\n1;2\n3;4\n")
+        cached_table(archivo, "cube", construir)
+        print(f"Construcciones: {len(construcciones)}")
+        assert len(construcciones) == 2
+
+
+def main():
+    """Ejecuta todos los tests."""
+    test_rollup_igual_a_filas_crudas()
+    test_clicks()
+    test_cubo_persistido()
+
+    print("\n" + "="*60)
+    print("✅ SUITE DE PRUEBAS COMPLETADA")
+    print("="*60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Script de prueba para el parseo vectorizado de fechas.
+Ejecutar: python test_date_parsing.py
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+sys.path.insert(0, str(Path(__file__).parent / "scripts"))
+
+from date_parsing import as_datetime, parse_date_columns, parse_date_columns_arrow
+from utils import get_busiest_days, get_busiest_hours, get_date_range
+
+
+def _export_whatsapp() -> pd.DataFrame:
+    """Filas como las de un export de WhatsApp: '-' cuando el mensaje no se entregó o no se leyó."""
+    return pd.DataFrame({
+        "Status": ["Read", "Delivered", "Failed"],
+        "Date Sent": ["2026-01-15 16:58:29", "2026-01-16 09:10:00", "2026-01-16 09:10:05"],
+        "Date Read": ["2026-01-15 17:03:45", "-", "-"],
+    })
+
+
+def test_marcador_y_formato():
+    """El marcador '-' queda como NaT y las fechas válidas se parsean con el formato exacto."""
+    print("\n" + "="*60)
+    print("TEST 1: Formato exacto y marcador '-'")
+    print("="*60)
+
+    df = parse_date_columns(_export_whatsapp())
+    print(df.dtypes.to_dict())
+    assert pd.api.types.is_datetime64_any_dtype(df["Date Read"])
+    assert df["Date Read"].isna().tolist() == [False, True, True]
+    assert df["Date Read"].iloc[0] == pd.Timestamp("2026-01-15 17:03:45")
+
+
+def test_arrow_igual_a_pandas():
+    """El parseo sobre la tabla Arrow da lo mismo que el de pandas y to_pandas() lo respeta."""
+    print("\n" + "="*60)
+    print("TEST 2: Parseo en Arrow")
+    print("="*60)
+
+    table = parse_date_columns_arrow(pa.Table.from_pandas(_export_whatsapp(), preserve_index=False))
+    desde_arrow = table.to_pandas()
+    desde_pandas = parse_date_columns(_export_whatsapp())
+    print(desde_arrow.dtypes.to_dict())
+    for columna in ("Date Sent", "Date Read"):
+        assert pd.api.types.is_datetime64_any_dtype(desde_arrow[columna])
+        assert desde_arrow[columna].astype("datetime64[s]").equals(desde_pandas[columna].astype("datetime64[s]"))
+
+
+def test_helpers_reutilizan_columna_parseada():
+    """Los helpers de utils usan la columna datetime64 ya parseada sin volver a convertirla."""
+    print("\n" + "="*60)
+    print("TEST 3: Análisis por tiempo sobre columnas parseadas")
+    print("="*60)
+
+    df = parse_date_columns(_export_whatsapp())
+    assert np.shares_memory(as_datetime(df, "Date Sent").to_numpy(), df["Date Sent"].to_numpy())
+
+    inicio, fin = get_date_range(df, "Date Read")
+    horas = get_busiest_hours(df, "Date Sent")
+    dias = get_busiest_days(df, "Date Sent")
+    print(f"Rango: {inicio} – {fin} | Horas: {horas} | Días: {dias}")
+    assert inicio == fin == pd.Timestamp("2026-01-15 17:03:45")
+    assert horas == {9: 2, 16: 1}
+    assert dias == {"Jueves": 1, "Viernes": 2}
+
+
+def test_columna_sin_formato_configurado():
+    """Una columna fuera de DATE_FORMATS se parsea infiriendo el formato, no como ISO 8601."""
+    print("\n" + "="*60)
+    print("TEST 4: Columna sin formato configurado")
+    print("="*60)
+
+    df = pd.DataFrame({"Fecha campaña": ["Jan 15 2026 16:58", "Jan 16 2026 09:10", "-", "sin fecha"]})
+    fechas = as_datetime(df, "Fecha campaña")
+    print(fechas.tolist())
+    assert fechas.tolist()[:2] == [pd.Timestamp("2026-01-15 16:58"), pd.Timestamp("2026-01-16 09:10")]
+    assert fechas.iloc[2:].isna().all()
+
+
+def main():
+    """Ejecuta todos los tests."""
+    test_marcador_y_formato()
+    test_arrow_igual_a_pandas()
+    test_helpers_reutilizan_columna_parseada()
+    test_columna_sin_formato_configurado()
+
+    print("\n" + "="*60)
+    print("✅ SUITE DE PRUEBAS COMPLETADA")
+    print("="*60)
+
+
+if __name__ == "__main__":
+    main()
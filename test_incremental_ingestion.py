@@ -0,0 +1,128 @@
+"""
+Script de prueba para la ingesta incremental de exports de WhatsApp.
+Ejecutar: python test_incremental_ingestion.py
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent / "scripts"))
+
+import data_engine
+import source_cache
+from cache_backends import LRUCache
+
+ESTADOS = ["Delivered", "Read", "Failed", "Processing"]
+RESPUESTAS = ["no", "Yes", "NO", "yes"]
+
+
+def _export(n: int, desde: int = 0) -> pd.DataFrame:
+    """Filas como las de un export de WhatsApp (Reply Status con mayúsculas mezcladas)."""
+    filas = range(desde, desde + n)
+    return pd.DataFrame({
+        "Phone number": [f"57300{i:07d}" for i in filas],
+        "Status": [ESTADOS[i * 7 % 4] for i in filas],
+        "Reply Status": [RESPUESTAS[i * 3 % 4] for i in filas],
+        "Date Read": ["-" if i % 3 else "2026-01-15 10:00:00" for i in filas],
+    })
+
+
+def _esperado(archivos) -> dict:
+    """Totales y embudo calculados con pandas sobre todos los archivos completos."""
+    por_archivo = {f.name: pd.read_csv(f, dtype=str) for f in archivos}
+    df = pd.concat(por_archivo.values(), ignore_index=True)
+    embudo = df.groupby([df["Status"], df["Reply Status"].str.lower()]).size()
+    return {
+        "total": len(df),
+        "states": df["Status"].value_counts().to_dict(),
+        "by_file": {nombre: len(parte) for nombre, parte in por_archivo.items()},
+        "funnel": {(estado, respuesta): int(n) for (estado, respuesta), n in embudo.items()},
+    }
+
+
+def _embudo(fuentes, destinos, valores) -> dict:
+    """Aristas Status → respuesta del diagrama de flujo, para comparar con el esperado."""
+    return {(s, t): v for s, t, v in zip(fuentes, destinos, valores)}
+
+
+def test_export_nuevo_y_filas_agregadas():
+    """Un export nuevo o con filas agregadas actualiza los agregados leyendo solo ese archivo."""
+    print("\n" + "="*60)
+    print("TEST 1: Export nuevo y export con filas agregadas")
+    print("="*60)
+
+    original_sources = dict(source_cache.SOURCES)
+    original_read = data_engine._read_whatsapp_tables
+    leidos = []
+
+    def leer_y_anotar(files):
+        leidos.append(sorted(f.name for f in files))
+        return original_read(files)
+
+    source_cache.set_backend(LRUCache())
+    data_engine._WHATSAPP_TABLES.clear()
+    data_engine._read_whatsapp_tables = leer_y_anotar
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        source_cache.SOURCES["whatsapp"] = lambda: sorted(tmp.glob("whatsapp_*.csv"))
+        try:
+            primero, segundo = tmp / "whatsapp_1.csv", tmp / "whatsapp_2.csv"
+            _export(120).to_csv(primero, index=False)
+            inicial = data_engine.get_whatsapp_statistics()
+            assert inicial["total"] == 120
+            assert leidos == [["whatsapp_1.csv"]]
+
+            pasos = (
+                ("export nuevo", lambda: _export(80, desde=1_000).to_csv(segundo, index=False), ["whatsapp_2.csv"]),
+                ("filas agregadas", lambda: _export(45, desde=120).to_csv(primero, mode="a", header=False, index=False),
+                 ["whatsapp_1.csv"]),
+            )
+            for paso, modificar, decodificados in pasos:
+                leidos.clear()
+                modificar()
+                estadisticas = data_engine.get_whatsapp_statistics()
+                flujo = _embudo(*data_engine.get_whatsapp_flow_data())
+                esperado = _esperado([primero, segundo])
+                print(f"{paso}: total {estadisticas['total']} | decodificados: {leidos}")
+
+                # Solo se decodifica el archivo nuevo o modificado; el otro sale de su sidecar
+                assert leidos == [decodificados]
+                assert estadisticas["total"] == esperado["total"]
+                assert estadisticas["states"] == esperado["states"]
+                assert {n: f["count"] for n, f in estadisticas["by_file"].items()} == esperado["by_file"]
+
+                # El diagrama de flujo refleja el embudo Status × Reply Status de todos los archivos
+                for estado, nodo in (("Delivered", "📖 No Leído"), ("Read", "✅ Leído")):
+                    for respuesta, destino in (("yes", "💬 Respondido"), ("no", "🔇 Sin respuesta")):
+                        assert flujo[(nodo, destino)] == esperado["funnel"].get((estado, respuesta), 0)
+
+            # El resultado incremental es el mismo que recalcular todo desde cero
+            incremental = (data_engine.get_whatsapp_statistics(), data_engine.get_whatsapp_flow_data())
+            for sidecar in tmp.glob(".*.aggregates.json"):
+                sidecar.unlink()
+            data_engine._WHATSAPP_TABLES.clear()
+            source_cache.set_backend(LRUCache())
+            leidos.clear()
+            assert (data_engine.get_whatsapp_statistics(), data_engine.get_whatsapp_flow_data()) == incremental
+            assert leidos == [["whatsapp_1.csv", "whatsapp_2.csv"]]
+        finally:
+            data_engine._read_whatsapp_tables = original_read
+            data_engine._WHATSAPP_TABLES.clear()
+            source_cache.SOURCES.update(original_sources)
+            source_cache.set_backend(None)
+
+
+def main():
+    """Ejecuta todos los tests."""
+    test_export_nuevo_y_filas_agregadas()
+
+    print("\n" + "="*60)
+    print("✅ SUITE DE PRUEBAS COMPLETADA")
+    print("="*60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""
+Script de prueba para el modo out-of-core (techo de memoria y volcado a disco).
+Ejecutar: python test_out_of_core.py
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent / "scripts"))
+
+import config
+from out_of_core import SpillingAggregator, estimate_table_bytes, rows_within_limit
+
+
+def _lotes(n_lotes: int = 20, filas: int = 5000, seed: int = 0):
+    """Lotes con muchas claves distintas (el estado del group-by no cabe en el presupuesto)."""
+    rng = np.random.default_rng(seed)
+    for _ in range(n_lotes):
+        yield pd.DataFrame({
+            "Operador": rng.choice(["Claro", "Movistar", "Tigo", None], filas),
+            "Mensaje": rng.integers(0, 30000, filas).astype(str),
+            "n": np.ones(filas, dtype=np.int64),
+        })
+
+
+def test_agregacion_con_volcado():
+    """Con un presupuesto mínimo el group-by se vuelca a disco y el resultado es exacto."""
+    print("\n" + "="*60)
+    print("TEST 1: Group-by con volcado a disco")
+    print("="*60)
+
+    lotes = list(_lotes())
+    esperado = (pd.concat(lotes).groupby(["Operador", "Mensaje"], dropna=False)["n"].sum())
+
+    with tempfile.TemporaryDirectory() as tmp:
+        with SpillingAggregator(["Operador", "Mensaje"], ["n"], memory_limit=200_000, spill_dir=tmp) as agg:
+            for lote in lotes:
+                agg.add(lote)
+            partes = list(agg.iter_results())
+        print(f"Volcados: {agg.spills} | Partes: {len(partes)}")
+        assert agg.spills > 0
+        assert not any(Path(tmp).iterdir())
+
+    obtenido = pd.concat(partes).groupby(["Operador", "Mensaje"], dropna=False)["n"].sum()
+    assert len(obtenido) == len(esperado)
+    assert obtenido.sort_index().equals(esperado.sort_index())
+    # Cada clave aparece en una sola parte
+    assert sum(len(p) for p in partes) == len(esperado)
+
+
+def test_sin_volcado_si_cabe():
+    """Si el estado cabe en el presupuesto no se escribe nada en disco."""
+    print("\n" + "="*60)
+    print("TEST 2: Sin volcado cuando cabe en memoria")
+    print("="*60)
+
+    with SpillingAggregator(["Operador"], ["n"], memory_limit=10_000_000) as agg:
+        for lote in _lotes(n_lotes=3):
+            agg.add(lote)
+        resultado = agg.result()
+    print(resultado)
+    assert agg.spills == 0
+    assert resultado["n"].sum() == 15000
+
+
+def test_limite_de_filas():
+    """En modo out-of-core la carga se limita a las filas que caben en el techo."""
+    print("\n" + "="*60)
+    print("TEST 3: Filas dentro del techo de memoria")
+    print("="*60)
+
+    modo, limite = config.OUT_OF_CORE, config.MEMORY_LIMIT_MB
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            archivo = Path(tmp) / "sms.parquet"
+            pd.DataFrame({"Mensaje": ["x" * 200] * 20000}).to_parquet(archivo, index=False)
+            tamano = estimate_table_bytes(archivo)
+
+            config.OUT_OF_CORE, config.MEMORY_LIMIT_MB = "auto", 1024
+            assert rows_within_limit(archivo) is None
+
+            config.MEMORY_LIMIT_MB = 1
+            filas = rows_within_limit(archivo)
+            print(f"Tamaño estimado: {tamano:,} bytes | Filas permitidas con 1 MB: {filas:,}")
+            assert 0 < filas < 20000
+
+            config.OUT_OF_CORE = "off"
+            assert rows_within_limit(archivo) is None
+    finally:
+        config.OUT_OF_CORE, config.MEMORY_LIMIT_MB = modo, limite
+
+
+def test_otras_agregaciones():
+    """Cada medida puede juntarse con su propia función (ej: primera aparición con min)."""
+    print("\n" + "="*60)
+    print("TEST 4: Agregaciones distintas de la suma")
+    print("="*60)
+
+    lotes = []
+    for i, lote in enumerate(_lotes(n_lotes=10)):
+        lote["primera"] = np.arange(len(lote)) + i * len(lote)
+        lotes.append(lote)
+    esperado = pd.concat(lotes).groupby("Mensaje").agg({"n": "sum", "primera": "min"})
+
+    with tempfile.TemporaryDirectory() as tmp:
+        with SpillingAggregator(["Mensaje"], ["n", "primera"], aggregations={"primera": "min"},
+                                memory_limit=100_000, spill_dir=tmp) as agg:
+            for lote in lotes:
+                agg.add(lote[["Mensaje", "n", "primera"]])
+            obtenido = agg.result().set_index("Mensaje").sort_index()
+    print(f"Volcados: {agg.spills} | Claves: {len(obtenido):,}")
+    assert agg.spills > 0
+    assert obtenido.equals(esperado.sort_index())
+
+
+def test_carga_completa_sin_cortar():
+    """Una carga completa que no cabe se carga entera salvo con OUT_OF_CORE_TRUNCATE, y queda marcada."""
+    print("\n" + "="*60)
+    print("TEST 5: Cargas completas que no caben en el techo")
+    print("="*60)
+
+    import data_engine
+    import source_cache
+    from cache_backends import NullCache
+
+    n = 20000
+    original = dict(source_cache.SOURCES)
+    modo, limite, cortar = config.OUT_OF_CORE, config.MEMORY_LIMIT_MB, config.OUT_OF_CORE_TRUNCATE
+    source_cache.set_backend(NullCache())
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            archivo = Path(tmp) / "interacciones.csv"
+            pd.DataFrame({
+                "Id Envio": np.arange(n),
+                "Mensaje": [f"respuesta {i} " + "x" * 200 for i in range(n)],
+                "Operador": "Claro",
+                "Codigo corto": "890",
+                "Usuario": np.where(np.arange(n) % 4 == 0, "Cuantico_tecnologia", "cliente"),
+            }).to_csv(archivo, sep=";", index=False, encoding="latin1")
+            source_cache.SOURCES["interacciones"] = lambda: [archivo]
+            config.OUT_OF_CORE, config.MEMORY_LIMIT_MB = "auto", 1
+
+            config.OUT_OF_CORE_TRUNCATE = False
+            completo = data_engine.get_interacciones_messages()
+            assert len(completo) == n * 3 // 4
+            assert not data_engine.is_truncated(completo)
+
+            config.OUT_OF_CORE_TRUNCATE = True
+            cortado = data_engine.get_interacciones_messages()
+            print(f"Sin cortar: {len(completo):,} mensajes | Con OUT_OF_CORE_TRUNCATE: {len(cortado):,}")
+            assert 0 < len(cortado) < len(completo)
+            assert data_engine.is_truncated(cortado)
+            # Un limit explícito no es un corte por memoria
+            assert not data_engine.is_truncated(data_engine.get_interacciones_messages(limit=10))
+    finally:
+        config.OUT_OF_CORE, config.MEMORY_LIMIT_MB, config.OUT_OF_CORE_TRUNCATE = modo, limite, cortar
+        source_cache.SOURCES.update(original)
+        source_cache.set_backend(None)
+
+
+def main():
+    """Ejecuta todos los tests."""
+    test_agregacion_con_volcado()
+    test_sin_volcado_si_cabe()
+    test_limite_de_filas()
+    test_otras_agregaciones()
+    test_carga_completa_sin_cortar()
+
+    print("\n" + "="*60)
+    print("✅ SUITE DE PRUEBAS COMPLETADA")
+    print("="*60)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,7 +8,7 @@ scripts_dir = Path(__file__).parent / "scripts"
 sys.path.insert(0, str(scripts_dir))
 
 from config import SMS_FILE, WHATSAPP_FILES, INTERACCIONES_FILE
-from data_loader import _read_file
+from data_engine import _read_file
 
 print("=" * 70)
 print("🧪 TEST: Lectura de archivos Parquet")
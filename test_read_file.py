@@ -0,0 +1,193 @@
+"""
+Script de prueba para las lecturas del motor: nrows acotado, filtros empujados al escáner
+y almacenamiento de texto en Arrow.
+Ejecutar: python test_read_file.py
+"""
+
+import random
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+sys.path.insert(0, str(Path(__file__).parent / "scripts"))
+
+import config
+import data_engine
+
+COLUMNAS = ["Mensaje", "Operador", "Usuario", "Total Clicks URL 1"]
+DTYPES = {"Mensaje": "string", "Operador": "category", "Usuario": "category", "Total Clicks URL 1": "Int16"}
+LECTURA_CSV = {"encoding": "LATIN1", "delimiter": ";"}
+
+
+def _interacciones(n: int = 230, seed: int = 12) -> pd.DataFrame:
+    """Filas como las de interacciones: mensajes con tildes, ';' y saltos de línea, vacíos y usuarios nulos."""
+    rng = random.Random(seed)
+    mensajes = ["Sí, gracias", "NO ME INTERESA", "", "Quiero más info; ¿cuándo?", "Línea 1\nLínea 2", "Señor"]
+    return pd.DataFrame({
+        "Id Envio": range(n),
+        "Mensaje": [rng.choice(mensajes) + (f" {i}" if i % 4 else "") for i in range(n)],
+        "Operador": [rng.choice(["Claro", "Movistar", "Tigo"]) for _ in range(n)],
+        "Usuario": [rng.choice(["Cuantico_tecnologia", "Cuantico_tecnologia", "cliente", None]) for _ in range(n)],
+        "Total Clicks URL 1": [rng.randrange(4) for _ in range(n)],
+    })
+
+
+def _archivos(tmp: Path) -> dict:
+    """El mismo contenido como Parquet (row groups de 50 filas) y como CSV ';' en LATIN1."""
+    df = _interacciones()
+    parquet = tmp / "interacciones.parquet"
+    pq.write_table(pa.Table.from_pandas(df, preserve_index=False), parquet, row_group_size=50)
+    csv = tmp / "interacciones.csv"
+    df.to_csv(csv, sep=";", index=False, encoding="latin1")
+    return {"parquet": parquet, "csv": csv}
+
+
+def _leer_pandas(archivo: Path) -> pd.DataFrame:
+    """Lectura completa con pandas, la referencia de todas las comparaciones."""
+    if archivo.suffix == ".parquet":
+        return pd.read_parquet(archivo)
+    return pd.read_csv(archivo, sep=";", encoding="latin1")
+
+
+def _valores(df: pd.DataFrame) -> dict:
+    """Valores por columna sin importar el dtype (vacío, NaN y NA cuentan como None)."""
+    def normalizar(valor):
+        if valor is None or valor is pd.NA or valor == "" or (isinstance(valor, float) and np.isnan(valor)):
+            return None
+        return int(valor) if isinstance(valor, (np.integer, float)) else valor
+    return {c: [normalizar(v) for v in df[c].astype(object).tolist()] for c in df.columns}
+
+
+def _excluir_cuantico(df: pd.DataFrame) -> pd.Series:
+    """Máscara de pandas equivalente a data_engine._filtro_excluir_cuantico()."""
+    return df["Usuario"].ne("Cuantico_tecnologia") | df["Usuario"].isna()
+
+
+def _mensajes_usuarios(df: pd.DataFrame) -> pd.Series:
+    """Máscara de pandas equivalente a data_engine._filtro_mensajes_usuarios()."""
+    return _excluir_cuantico(df) & df["Mensaje"].fillna("").ne("")
+
+
+def test_nrows_acotado():
+    """nrows en Parquet y CSV da las mismas primeras filas que leer todo con pandas y cortar."""
+    print("\n" + "="*60)
+    print("TEST 1: Lecturas con nrows")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for formato, archivo in _archivos(Path(tmp)).items():
+            completo = _leer_pandas(archivo)[COLUMNAS]
+            # Dentro del primer row group, justo en el borde, cruzando varios y más que el archivo
+            for nrows in (1, 37, 50, 151, 1_000):
+                df = data_engine._read_file(archivo, usecols=COLUMNAS, nrows=nrows, dtype=DTYPES, **LECTURA_CSV)
+                assert list(df.columns) == COLUMNAS
+                assert _valores(df) == _valores(completo.head(nrows)), (formato, nrows)
+            print(f"{formato}: nrows 1, 37, 50, 151 y 1000 iguales a pandas + head()")
+
+        # En Parquet el corte se hace por lotes: una vista previa no decodifica el archivo completo
+        leidas = []
+        original = pq.ParquetFile.iter_batches
+
+        def contar_lotes(self, *args, **kwargs):
+            for lote in original(self, *args, **kwargs):
+                leidas.append(lote.num_rows)
+                yield lote
+
+        pq.ParquetFile.iter_batches = contar_lotes
+        try:
+            data_engine._read_file(Path(tmp) / "interacciones.parquet", usecols=COLUMNAS, nrows=20, dtype=DTYPES)
+        finally:
+            pq.ParquetFile.iter_batches = original
+        print(f"Filas decodificadas para nrows=20: {sum(leidas)}")
+        assert sum(leidas) == 20
+
+
+def test_filtros_y_columnas_empujados():
+    """filters= y columnas empujados al escáner dan lo mismo que filtrar una lectura completa de pandas."""
+    print("\n" + "="*60)
+    print("TEST 2: Filtros y columnas empujados al escáner")
+    print("="*60)
+
+    filtros = {
+        "excluir_cuantico": (data_engine._filtro_excluir_cuantico(), _excluir_cuantico),
+        "mensajes_usuarios": (data_engine._filtro_mensajes_usuarios(), _mensajes_usuarios),
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for formato, archivo in _archivos(Path(tmp)).items():
+            completo = _leer_pandas(archivo)
+            for nombre, (filtro, mascara) in filtros.items():
+                esperado = completo[mascara(completo)][COLUMNAS]
+
+                df = data_engine._read_file(archivo, filters=filtro, usecols=COLUMNAS, dtype=DTYPES, **LECTURA_CSV)
+                assert list(df.columns) == COLUMNAS
+                assert _valores(df) == _valores(esperado), (formato, nombre)
+
+                primeras = data_engine._read_file(archivo, filters=filtro, usecols=COLUMNAS, nrows=25,
+                                                  dtype=DTYPES, **LECTURA_CSV)
+                assert _valores(primeras) == _valores(esperado.head(25)), (formato, nombre)
+
+                lotes = list(data_engine._iter_batches(archivo, columns=COLUMNAS, batch_size=40, filters=filtro,
+                                                       dtype=DTYPES, **LECTURA_CSV))
+                assert _valores(pd.concat(lotes, ignore_index=True)) == _valores(esperado), (formato, nombre)
+
+                assert data_engine._count_rows(archivo, filters=filtro, **LECTURA_CSV) == len(esperado)
+                print(f"{formato} / {nombre}: {len(df)} de {len(completo)} filas, iguales a pandas")
+
+
+def test_texto_en_arrow():
+    """Con STRING_STORAGE="pyarrow" el texto queda en large_string y da lo mismo que con str de Python."""
+    print("\n" + "="*60)
+    print("TEST 3: Almacenamiento de texto en Arrow")
+    print("="*60)
+
+    almacenamiento = config.STRING_STORAGE
+    with tempfile.TemporaryDirectory() as tmp:
+        for formato, archivo in _archivos(Path(tmp)).items():
+            completo = _leer_pandas(archivo)
+            esperado = completo[_mensajes_usuarios(completo)]["Mensaje"].astype(object)
+            lecturas = {}
+            try:
+                for storage in ("pyarrow", "python"):
+                    config.STRING_STORAGE = storage
+                    completa = data_engine._read_file(archivo, usecols=COLUMNAS, dtype=DTYPES, **LECTURA_CSV)
+                    filtrada = data_engine._read_file(archivo, filters=data_engine._filtro_mensajes_usuarios(),
+                                                      usecols=COLUMNAS, dtype=DTYPES, **LECTURA_CSV)
+                    lecturas[storage] = (completa, filtrada)
+            finally:
+                config.STRING_STORAGE = almacenamiento
+
+            for storage, (completa, filtrada) in lecturas.items():
+                dtype_texto = pd.ArrowDtype(pa.large_string()) if storage == "pyarrow" else pd.StringDtype("python")
+                assert completa["Mensaje"].dtype == dtype_texto, (formato, storage)
+                assert filtrada["Mensaje"].dtype == dtype_texto, (formato, storage)
+                assert _valores(completa) == _valores(completo[COLUMNAS]), (formato, storage)
+
+                mensajes = filtrada["Mensaje"]
+                assert mensajes.str.len().tolist() == esperado.str.len().tolist()
+                assert mensajes.str.lower().tolist() == esperado.str.lower().tolist()
+                if storage == "pyarrow":
+                    # Las operaciones de texto corren sobre kernels de Arrow y el resultado sigue en Arrow
+                    assert isinstance(mensajes.str.len().dtype, pd.ArrowDtype)
+                    assert mensajes.str.lower().dtype == dtype_texto
+            print(f"{formato}: pyarrow y python dan los mismos valores, largos y minúsculas")
+
+
+def main():
+    """Ejecuta todos los tests."""
+    test_nrows_acotado()
+    test_filtros_y_columnas_empujados()
+    test_texto_en_arrow()
+
+    print("\n" + "="*60)
+    print("✅ SUITE DE PRUEBAS COMPLETADA")
+    print("="*60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Script de prueba para el contador de filas con memory-mapping.
+Ejecutar: python test_row_counter.py
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent / "scripts"))
+
+from row_counter import cached_row_count, count_csv_rows
+
+
+def _datos_con_saltos(n: int = 5000) -> pd.DataFrame:
+    """Mensajes donde 1 de cada 10 tiene saltos de línea y comillas escapadas."""
+    mensajes = np.where(np.arange(n) % 10 == 0, 'Hola\n"Juan"\n; responde SI', 'Mensaje simple')
+    return pd.DataFrame({"Id Envio": np.arange(n), "Mensaje": mensajes})
+
+
+def test_saltos_dentro_de_comillas():
+    """Los saltos de línea dentro de un campo no cuentan como filas (wc -l sí los cuenta)."""
+    print("\n" + "="*60)
+    print("TEST 1: Saltos de línea dentro de comillas")
+    print("="*60)
+
+    df = _datos_con_saltos()
+    with tempfile.TemporaryDirectory() as tmp:
+        for terminador in ("\n", "\r\n"):
+            archivo = Path(tmp) / "sms.csv"
+            df.to_csv(archivo, sep=";", index=False, lineterminator=terminador)
+            lineas = archivo.read_bytes().count(b"\n") - 1
+
+            # Bloques pequeños para forzar cortes en medio de un campo entre comillas
+            for bloque in (5, 4096, 1 << 24):
+                filas = count_csv_rows(archivo, chunk_size=bloque)
+                print(f"terminador={terminador!r} bloque={bloque}: {filas:,} filas (wc -l: {lineas:,})")
+                assert filas == len(df)
+            assert lineas > len(df)
+
+
+def test_casos_borde():
+    """Archivo vacío, solo encabezado, líneas en blanco y última fila sin salto final."""
+    print("\n" + "="*60)
+    print("TEST 2: Casos borde")
+    print("="*60)
+
+    casos = [
+        (b"", 0),
+        (b"a;b\n", 0),
+        (b"a;b\n1;2", 1),
+        (b"a;b\n\n1;2\n\n3;\"x\ny\"\n", 2),
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        archivo = Path(tmp) / "datos.csv"
+        for contenido, esperado in casos:
+            archivo.write_bytes(contenido)
+            filas = count_csv_rows(archivo)
+            print(f"{contenido!r}: {filas}")
+            assert filas == esperado
+
+
+def test_conteo_persistido():
+    """El conteo queda en el sidecar y se invalida cuando cambia el archivo."""
+    print("\n" + "="*60)
+    print("TEST 3: Conteo persistido en el sidecar")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        archivo = Path(tmp) / "interacciones.csv"
+        _datos_con_saltos(100).to_csv(archivo, sep=";", index=False)
+        assert cached_row_count(archivo) == 100
+        assert any(Path(tmp).glob(".interacciones.csv.aggregates.json"))
+
+        _datos_con_saltos(150).to_csv(archivo, sep=";", index=False)
+        filas = cached_row_count(archivo)
+        print(f"Tras modificar el archivo: {filas} filas")
+        assert filas == 150
+
+
+def test_comillas_sueltas_y_crlf():
+    """Una comilla en medio de un campo no abre comillas; un \r\n en blanco partido entre bloques no cuenta."""
+    print("\n" + "="*60)
+    print("TEST 4: Comillas sueltas y \\r\\n entre bloques")
+    print("="*60)
+
+    casos = [
+        (b'a;b\n1;dice "hola\n2;x\n3;y\n', 3),
+        (b'a;b\n1;"x\ny";z\n2;ab"c"d\n3\n', 3),
+        (b'a;b\n1;"dijo ""si"""\n2;""\n', 2),
+        (b'a;b\r\n\r\n1;2\r\n3;4\r\n', 2),
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        archivo = Path(tmp) / "datos.csv"
+        for contenido, esperado in casos:
+            archivo.write_bytes(contenido)
+            assert len(pd.read_csv(archivo, sep=";")) == esperado
+            for bloque in (1, 2, 3, 1 << 24):
+                filas = count_csv_rows(archivo, delimiter=";", chunk_size=bloque)
+                assert filas == esperado, (contenido, bloque, filas)
+            # Sin delimitador se toma el del encabezado
+            assert count_csv_rows(archivo) == esperado
+            print(f"{contenido!r}: {esperado}")
+
+        # Mensajes al azar entre comillas o con comillas sueltas en medio: siempre lo mismo que pandas
+        rng = np.random.default_rng(10)
+        piezas = np.array(['hola', ' ', '"', '""', '\n', ';', 'si'], dtype=object)
+        for _ in range(30):
+            mensajes = ["".join(rng.choice(piezas, 6)) for _ in range(40)]
+            lineas = ["id;mensaje"] + [
+                f'{i};"{m.replace(chr(34), chr(34) * 2)}"' if rng.random() < 0.5 else f"{i};x{m.replace(chr(10), ' ').replace(';', ',')}"
+                for i, m in enumerate(mensajes)
+            ]
+            archivo.write_text("\r\n".join(lineas) + "\r\n")
+            esperado = len(pd.read_csv(archivo, sep=";"))
+            for bloque in (7, 1 << 24):
+                assert count_csv_rows(archivo, delimiter=";", chunk_size=bloque) == esperado
+
+
+def main():
+    """Ejecuta todos los tests."""
+    test_saltos_dentro_de_comillas()
+    test_casos_borde()
+    test_conteo_persistido()
+    test_comillas_sueltas_y_crlf()
+
+    print("\n" + "="*60)
+    print("✅ SUITE DE PRUEBAS COMPLETADA")
+    print("="*60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Script de prueba para el muestreo aleatorio con intervalos de confianza.
+Ejecutar: python test_sampling.py
+"""
+
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from scripts.sampling import (
+    estimate_counts,
+    reservoir_sample_csv,
+    sample_parquet,
+    sample_size_for_error,
+)
+
+
+def _datos_ordenados(n: int = 20000) -> pd.DataFrame:
+    """Datos ordenados por estado: las primeras filas NO representan el total."""
+    estados = np.array(["Entregado"] * (n // 2) + ["Fallido"] * (n // 4) + ["Lista negra"] * (n // 4))
+    return pd.DataFrame({"Estado del envio": estados, "Id": np.arange(n)})
+
+
+def test_tamano_muestra():
+    """El tamaño de muestra crece al pedir menos error y respeta la población."""
+    print("\n" + "="*60)
+    print("TEST 1: Tamaño de muestra según error objetivo")
+    print("="*60)
+
+    n_1pct = sample_size_for_error(0.01)
+    n_5pct = sample_size_for_error(0.05)
+    n_finita = sample_size_for_error(0.01, population=1000)
+    print(f"±1%: {n_1pct:,} | ±5%: {n_5pct:,} | ±1% con N=1000: {n_finita:,}")
+    assert n_1pct == 9604
+    assert n_5pct == 385
+    assert n_finita <= 1000
+
+
+def test_muestra_estratificada_parquet():
+    """La muestra por row groups cubre todo el archivo y el IC contiene el valor real."""
+    print("\n" + "="*60)
+    print("TEST 2: Muestra estratificada en Parquet")
+    print("="*60)
+
+    df = _datos_ordenados()
+    with tempfile.TemporaryDirectory() as tmp:
+        archivo = Path(tmp) / "sms.parquet"
+        df.to_parquet(archivo, row_group_size=2000, index=False)
+
+        for metodo in ("stratified", "uniform"):
+            muestra = sample_parquet(archivo, 2000, columns=["Estado del envio"], method=metodo, seed=42)
+            estimados = estimate_counts(muestra["Estado del envio"], len(df))
+            reales = df["Estado del envio"].value_counts().to_dict()
+            print(f"{metodo}: {len(muestra)} filas")
+            for estado, est in estimados.items():
+                print(f"   {estado}: {est['estimate']:,} [{est['low']:,} – {est['high']:,}] real={reales[estado]:,}")
+                assert est['low'] <= reales[estado] <= est['high']
+            assert len(muestra) == 2000
+
+        # El texto se lee como diccionario pero la muestra trae los mismos valores y tipos que una lectura normal
+        muestra = sample_parquet(archivo, 300, method="uniform", seed=1)
+        completo = pd.read_parquet(archivo)
+        esperada = completo.set_index("Id").loc[muestra["Id"], "Estado del envio"]
+        assert muestra["Estado del envio"].dtype == completo["Estado del envio"].dtype
+        assert muestra["Estado del envio"].tolist() == esperada.tolist()
+
+
+def test_reservorio_csv():
+    """El reservorio devuelve exactamente n filas distintas de todo el archivo."""
+    print("\n" + "="*60)
+    print("TEST 3: Muestreo de reservorio en CSV")
+    print("="*60)
+
+    df = _datos_ordenados()
+    with tempfile.TemporaryDirectory() as tmp:
+        archivo = Path(tmp) / "sms.csv"
+        df.to_csv(archivo, sep=";", index=False)
+
+        muestra = reservoir_sample_csv(archivo, 500, chunksize=3000, seed=7, delimiter=";")
+        print(f"Filas muestreadas: {len(muestra)} | Ids únicos: {muestra['Id'].nunique()}")
+        assert len(muestra) == 500
+        assert muestra["Id"].nunique() == 500
+        assert muestra["Id"].max() > len(df) // 2
+
+
+def main():
+    """Ejecuta todos los tests."""
+    test_tamano_muestra()
+    test_muestra_estratificada_parquet()
+    test_reservorio_csv()
+
+    print("\n" + "="*60)
+    print("✅ SUITE DE PRUEBAS COMPLETADA")
+    print("="*60)
+
+
+if __name__ == "__main__":
+    main()
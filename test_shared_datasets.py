@@ -0,0 +1,138 @@
+"""
+Script de prueba para los datasets compartidos entre sesiones (vistas Copy-on-Write).
+Ejecutar: python test_shared_datasets.py
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent / "scripts"))
+
+import data_engine
+import source_cache
+from cache_backends import LRUCache
+
+
+def _whatsapp_csv(tmp: Path) -> None:
+    pd.DataFrame({
+        "Phone number": ["573001112233", "573004445566", "573007778899"],
+        "Status": ["Delivered", "Failed", "Read"],
+        "Reply Status": ["none", "none", "replied"],
+        "Intentos": [1, 3, 2],
+    }).to_csv(tmp / "whatsapp_1.csv", index=False)
+
+
+def test_vistas_comparten_datos():
+    """Cada llamada recibe otro DataFrame sobre los mismos datos y modificarlo no afecta a los demás."""
+    print("\n" + "="*60)
+    print("TEST 1: Vistas Copy-on-Write del dataset compartido")
+    print("="*60)
+
+    original = dict(source_cache.SOURCES)
+    source_cache.set_backend(LRUCache())
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        source_cache.SOURCES["whatsapp"] = lambda: sorted(tmp.glob("whatsapp_*.csv"))
+        try:
+            _whatsapp_csv(tmp)
+            sesion_a = data_engine.load_whatsapp_data()
+            sesion_b = data_engine.load_whatsapp_data()
+
+            assert sesion_a is not sesion_b
+            assert np.shares_memory(sesion_a["Intentos"].to_numpy(), sesion_b["Intentos"].to_numpy())
+
+            # Una sesión filtra y modifica su vista: las otras y el dataset compartido no cambian
+            sesion_a.loc[0, "Intentos"] = 99
+            sesion_a["Nueva"] = 1
+            assert sesion_b.loc[0, "Intentos"] == 1
+            assert "Nueva" not in sesion_b.columns
+
+            sesion_c = data_engine.load_whatsapp_data()
+            print(sesion_c[["Status", "Intentos"]].to_dict("list"))
+            assert sesion_c["Intentos"].tolist() == [1, 3, 2]
+            assert "Nueva" not in sesion_c.columns
+        finally:
+            source_cache.SOURCES.update(original)
+            source_cache.set_backend(None)
+
+
+def test_cache_streamlit_sin_copias():
+    """Con el backend de Streamlit los resultados shared son un solo objeto; los demás se copian."""
+    print("\n" + "="*60)
+    print("TEST 2: st.cache_resource para resultados compartidos")
+    print("="*60)
+
+    from data_loader import StreamlitCache
+
+    def dataset_compartido() -> pd.DataFrame:
+        return pd.DataFrame({"x": range(1000)})
+
+    def dataset_copiado() -> pd.DataFrame:
+        return pd.DataFrame({"x": range(1000)})
+
+    # Importar data_loader instala el backend y los avisos de Streamlit: se restauran al final
+    try:
+        backend = StreamlitCache()
+        compartido = backend.wrap(dataset_compartido, shared=True)
+        copiado = backend.wrap(dataset_copiado)
+
+        assert compartido() is compartido()
+        assert copiado() is not copiado()
+        assert copiado().equals(copiado())
+
+        # Otra huella (archivo actualizado) libera la entrada anterior aunque el vigía no corra
+        viejo = compartido(source_fingerprint=(("sms.parquet", 1, 1),))
+        assert compartido(source_fingerprint=(("sms.parquet", 1, 1),)) is viejo
+        compartido(source_fingerprint=(("sms.parquet", 2, 2),))
+        assert compartido(source_fingerprint=(("sms.parquet", 1, 1),)) is not viejo
+        compartido.clear()
+        copiado.clear()
+    finally:
+        source_cache.set_backend(None)
+        data_engine.set_notifier(data_engine._print_notice)
+
+
+def test_sin_copy_on_write():
+    """El motor no cambia opciones de pandas; sin Copy-on-Write la vista es una copia independiente."""
+    print("\n" + "="*60)
+    print("TEST 3: shared_view sin Copy-on-Write")
+    print("="*60)
+
+    import subprocess
+
+    codigo = ("import pandas as pd; antes = pd.get_option('mode.copy_on_write'); import data_engine; "
+              "print(pd.get_option('mode.copy_on_write') == antes)")
+    salida = subprocess.run([sys.executable, "-c", codigo], cwd=Path(__file__).parent / "scripts",
+                            capture_output=True, text=True, check=True).stdout.strip().splitlines()[-1]
+    print(f"Opción intacta al importar el motor: {salida}")
+    assert salida == "True"
+
+    original = data_engine._copy_on_write
+    try:
+        data_engine._copy_on_write = lambda: False
+        compartido = pd.DataFrame({"Intentos": [1, 3, 2]})
+        vista = data_engine.shared_view(compartido)
+        assert not np.shares_memory(vista["Intentos"].to_numpy(), compartido["Intentos"].to_numpy())
+        vista.loc[0, "Intentos"] = 99
+        assert compartido.loc[0, "Intentos"] == 1
+    finally:
+        data_engine._copy_on_write = original
+
+
+def main():
+    """Ejecuta todos los tests."""
+    test_vistas_comparten_datos()
+    test_cache_streamlit_sin_copias()
+    test_sin_copy_on_write()
+
+    print("\n" + "="*60)
+    print("✅ SUITE DE PRUEBAS COMPLETADA")
+    print("="*60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Script de prueba para el caché por huella de archivos fuente.
+Ejecutar: python test_source_cache.py
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / "scripts"))
+
+import source_cache
+from source_cache import cached_on, check_for_changes, data_version
+
+
+def _touch(path: Path, content: str, mtime_ns: int) -> None:
+    """Escribe el archivo con un mtime fijo (dos escrituras seguidas pueden compartir mtime)."""
+    path.write_text(content)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def _with_sources(tmp: Path):
+    """Apunta las fuentes a archivos temporales; retorna las fuentes originales."""
+    original = dict(source_cache.SOURCES)
+    source_cache.SOURCES["sms"] = lambda: [tmp / "mensajes_texto.csv"]
+    source_cache.SOURCES["whatsapp"] = lambda: sorted(tmp.glob("whatsapp_*.csv"))
+    return original
+
+
+def test_solo_recalcula_lo_que_depende_del_archivo():
+    """Reemplazar el archivo SMS recalcula las funciones de SMS y no las de WhatsApp."""
+    print("\n" + "="*60)
+    print("TEST 1: Invalidación por huella")
+    print("="*60)
+
+    llamadas = {"sms": 0, "whatsapp": 0}
+
+    @cached_on("sms")
+    def total_sms(factor: int = 1) -> int:
+        llamadas["sms"] += 1
+        return len(source_cache.source_paths("sms")[0].read_text().splitlines()) * factor
+
+    @cached_on("whatsapp")
+    def total_whatsapp() -> int:
+        llamadas["whatsapp"] += 1
+        return sum(len(f.read_text().splitlines()) for f in source_cache.source_paths("whatsapp"))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        original = _with_sources(tmp)
+        try:
+            _touch(tmp / "mensajes_texto.csv", "a\n1\n", 1_000_000_000)
+            _touch(tmp / "whatsapp_1.csv", "a\n1\n2\n", 1_000_000_000)
+
+            assert (total_sms(), total_whatsapp()) == (2, 3)
+            assert (total_sms(), total_whatsapp()) == (2, 3)
+            assert llamadas == {"sms": 1, "whatsapp": 1}
+
+            # Mismo tamaño, distinto mtime: también es otra versión del archivo
+            _touch(tmp / "mensajes_texto.csv", "a\n2\n", 2_000_000_000)
+            assert (total_sms(), total_whatsapp()) == (2, 3)
+            assert llamadas == {"sms": 2, "whatsapp": 1}
+
+            # Export nuevo de WhatsApp: solo cambia la huella de 'whatsapp'
+            _touch(tmp / "whatsapp_2.csv", "a\n1\n", 1_000_000_000)
+            assert (total_sms(), total_whatsapp()) == (2, 5)
+            assert total_sms(factor=2) == 4
+            print(f"Llamadas: {llamadas}")
+            assert llamadas == {"sms": 3, "whatsapp": 2}
+        finally:
+            source_cache.SOURCES.update(original)
+
+
+def test_revision_de_cambios():
+    """check_for_changes reporta las fuentes modificadas, sube la versión y libera sus cachés."""
+    print("\n" + "="*60)
+    print("TEST 2: Revisión del vigía")
+    print("="*60)
+
+    llamadas = []
+
+    @cached_on("sms")
+    def leer() -> str:
+        llamadas.append(1)
+        return "ok"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        original = _with_sources(tmp)
+        try:
+            _touch(tmp / "mensajes_texto.csv", "a\n1\n", 1_000_000_000)
+            check_for_changes()
+            version = data_version()
+            leer()
+            assert check_for_changes() == []
+            assert data_version() == version
+
+            _touch(tmp / "mensajes_texto.csv", "a\n1\n2\n", 2_000_000_000)
+            cambios = check_for_changes()
+            print(f"Cambios: {cambios} | Versión: {data_version()}")
+            assert cambios == ["sms"]
+            assert data_version() == version + 1
+
+            # El resultado de la versión anterior ya no se usa; el nuevo se calcula una vez
+            leer()
+            leer()
+            assert len(llamadas) == 2
+        finally:
+            source_cache.SOURCES.update(original)
+
+
+def main():
+    """Ejecuta todos los tests."""
+    test_solo_recalcula_lo_que_depende_del_archivo()
+    test_revision_de_cambios()
+
+    print("\n" + "="*60)
+    print("✅ SUITE DE PRUEBAS COMPLETADA")
+    print("="*60)
+
+
+if __name__ == "__main__":
+    main()
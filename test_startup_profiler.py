@@ -0,0 +1,87 @@
+"""
+Script de prueba para el perfilador de arranque y las importaciones diferidas.
+Ejecutar: python test_startup_profiler.py
+"""
+
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / "scripts"))
+
+from startup_profiler import STARTUP_STEPS, direct_imports, parse_importtime, step, total_import_ms
+
+SALIDA_IMPORTTIME = """\
+import time: self [us] | cumulative | imported package
+import time:       100 |        100 |     numpy.core
+import time:       500 |        600 |   numpy
+import time:       200 |        200 |     pandas.core
+import time:      1000 |       1200 |   pandas
+import time:        50 |         50 |   config
+import time:       300 |       2150 | app
+"""
+
+
+def test_parseo_importtime():
+    """La salida de -X importtime se convierte en tiempos por módulo con su anidamiento."""
+    print("\n" + "="*60)
+    print("TEST 1: Parseo de -X importtime")
+    print("="*60)
+
+    timings = parse_importtime(SALIDA_IMPORTTIME)
+    assert [(t.module, t.depth) for t in timings] == [
+        ("numpy.core", 2), ("numpy", 1), ("pandas.core", 2), ("pandas", 1), ("config", 1), ("app", 0),
+    ]
+    directos = direct_imports(timings, "app")
+    print([(t.module, t.cumulative_us) for t in directos])
+    assert [t.module for t in directos] == ["pandas", "numpy", "config"]
+    assert total_import_ms(timings, "app") == 2.15
+
+
+def test_pasos_de_inicializacion():
+    """step() registra la duración de cada paso."""
+    print("\n" + "="*60)
+    print("TEST 2: Pasos de inicialización")
+    print("="*60)
+
+    with step("espera"):
+        time.sleep(0.01)
+    print(f"espera: {STARTUP_STEPS['espera'] * 1000:.1f} ms")
+    assert STARTUP_STEPS["espera"] >= 0.01
+
+
+def test_importaciones_diferidas():
+    """visualizations, sentiment_analyzer y data_engine no importan plotly.express, openai ni el validador."""
+    print("\n" + "="*60)
+    print("TEST 3: Importaciones diferidas")
+    print("="*60)
+
+    codigo = (
+        "import sys, visualizations, sentiment_analyzer, data_engine, config; "
+        "print(sorted(m for m in ('plotly.express', 'openai', 'phone_validator') if m in sys.modules))"
+    )
+    salida = subprocess.run(
+        [sys.executable, "-c", codigo],
+        cwd=Path(__file__).parent / "scripts",
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.strip()
+    print(f"Cargados al importar: {salida}")
+    assert salida == "[]"
+
+
+def main():
+    """Ejecuta todos los tests."""
+    test_parseo_importtime()
+    test_pasos_de_inicializacion()
+    test_importaciones_diferidas()
+
+    print("\n" + "="*60)
+    print("✅ SUITE DE PRUEBAS COMPLETADA")
+    print("="*60)
+
+
+if __name__ == "__main__":
+    main()
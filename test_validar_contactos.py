@@ -0,0 +1,161 @@
+"""
+Script de prueba para el validador de archivos de contactos por lotes.
+Ejecutar: python test_validar_contactos.py
+"""
+
+import json
+import random
+import sys
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+sys.path.insert(0, str(Path(__file__).parent / "scripts"))
+
+import config
+from phone_validator import COLUMNAS_RESULTADO, analizar_resultados, validar_columna
+from validar_contactos import validar_archivo
+
+
+def _contactos(n: int, seed: int = 25) -> list:
+    """Números con repetidos, vacíos, formatos variados, basura y algún dígito no ASCII."""
+    rng = random.Random(seed)
+    base = [f"57{rng.choice(['300', '310', '315', '372', '212'])}{rng.randrange(10**7):07d}" for _ in range(500)]
+    numeros = []
+    for _ in range(n):
+        tipo = rng.random()
+        if tipo < 0.6:
+            numeros.append(rng.choice(base))
+        elif tipo < 0.7:
+            numeros.append("")
+        elif tipo < 0.8:
+            numero = rng.choice(base)
+            numeros.append(f"+57 {numero[2:5]} {numero[5:]}")
+        elif tipo < 0.85:
+            numeros.append(str(rng.randrange(10**22)))
+        elif tipo < 0.86:
+            numeros.append("３００1234567")
+        else:
+            numeros.append(f"3{rng.randrange(10**9):09d}")
+    return numeros
+
+
+def test_resumen_igual_a_analizar_resultados():
+    """Por lotes, con y sin pool, el resultado y el resumen son los de validar todo junto."""
+    print("\n" + "="*60)
+    print("TEST 1: Archivo por lotes vs validación en memoria")
+    print("="*60)
+
+    numeros = _contactos(20_000)
+    esperado = validar_columna(numeros)
+    resumen_esperado = analizar_resultados(esperado)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        pd.DataFrame({"Status": "Failed", "Phone number": numeros}).to_csv(tmp / "contactos.csv", index=False)
+        pa.table({"Phone number": numeros}).to_pandas().to_parquet(tmp / "contactos.parquet", index=False)
+
+        for entrada, procesos in (("contactos.csv", 1), ("contactos.csv", 2), ("contactos.parquet", 2)):
+            salida = tmp / "resultado.parquet"
+            resumen = validar_archivo(tmp / entrada, salida, filas_por_lote=3_001, procesos=procesos, progreso=False)
+            print(f"{entrada} con {procesos} proceso(s): {resumen['total']:,} filas, "
+                  f"{resumen['numeros_repetidos']} repetidos")
+            assert resumen.pop("filas_omitidas") == 0
+            # Mismo resumen, también en el orden de las claves (categorías, operadores, top repetidos)
+            assert json.dumps(resumen, ensure_ascii=False) == json.dumps(resumen_esperado, ensure_ascii=False)
+
+            resultado = pd.read_parquet(salida)
+            assert pq.ParquetFile(salida).metadata.num_row_groups == 7
+            for columna in COLUMNAS_RESULTADO:
+                assert resultado[columna].astype(object).tolist() == esperado[columna].astype(object).tolist(), columna
+            assert isinstance(resultado["categoria"].dtype, pd.CategoricalDtype)
+
+
+def test_repetidos_con_volcado():
+    """Con un techo de memoria mínimo los repetidos se cuentan volcando a disco, con el mismo resultado."""
+    print("\n" + "="*60)
+    print("TEST 2: Repetidos con volcado a disco")
+    print("="*60)
+
+    numeros = [f"3{i % 7_000:09d}" for i in range(30_000)] + ["", "", "57"]
+    esperado = analizar_resultados(validar_columna(numeros))
+
+    limite = config.MEMORY_LIMIT_MB
+    try:
+        config.MEMORY_LIMIT_MB = 1
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = Path(tmp)
+            pd.DataFrame({"Phone number": numeros}).to_parquet(tmp / "contactos.parquet", index=False)
+            resumen = validar_archivo(tmp / "contactos.parquet", tmp / "resultado.parquet",
+                                      filas_por_lote=2_000, procesos=1, progreso=False)
+    finally:
+        config.MEMORY_LIMIT_MB = limite
+
+    print(f"Repetidos: {resumen['numeros_repetidos']:,} | top: {list(resumen['top_repetidos'].items())[:3]}")
+    assert resumen.pop("filas_omitidas") == 0
+    assert resumen == esperado
+    assert list(resumen["top_repetidos"]) == list(esperado["top_repetidos"])
+
+
+def test_export_con_filas_irregulares():
+    """Las filas cortas de un export se completan como en pandas; las que traen columnas de más se omiten."""
+    print("\n" + "="*60)
+    print("TEST 3: Export de WhatsApp con filas irregulares")
+    print("="*60)
+
+    encabezado = ["Nick name", "Phone number", "Status", "Date Sent", "Date Delivered", "Date Read",
+                  "Reply Status", "Date First replied", "First reply message", "Template", "Campaign"]
+    numeros = _contactos(20_000, seed=7)
+
+    def export(primera_corta: int):
+        """Filas cortadas a 8 campos desde primera_corta (como los exports reales) y alguna con un campo extra."""
+        lineas, buenos, largas = [",".join(encabezado)], [], 0
+        for i, numero in enumerate(numeros):
+            campos = [f"Cliente {i}", numero, "Failed", "2026-01-15 10:00:00", "-", "-", "-", "-", "-", "saludo", "enero"]
+            if i >= primera_corta and i % 97 == 0:
+                campos = campos[:8]
+            elif i % 301 == 150:
+                campos = campos + ["extra"]
+                largas += 1
+                lineas.append(",".join(campos))
+                continue
+            buenos.append(numero)
+            lineas.append(",".join(campos))
+        return "\n".join(lineas) + "\n", buenos, largas
+
+    with tempfile.TemporaryDirectory() as tmp:
+        entrada = Path(tmp) / "2026-01-15 Saludo.csv"
+        # Filas cortas desde el comienzo, y pasado el primer bloque de 1 MB del lector de Arrow
+        # (que ya entregó varios lotes cuando aparece la primera)
+        for primera_corta in (0, 16_000):
+            texto, buenos, largas = export(primera_corta)
+            entrada.write_text(texto, encoding="utf-8")
+            leido = pd.read_csv(entrada, dtype=str, na_filter=False, on_bad_lines="skip")
+            assert leido["Phone number"].tolist() == buenos
+            esperado = analizar_resultados(validar_columna(buenos))
+            for procesos in (1, 2):
+                resumen = validar_archivo(entrada, Path(tmp) / "resultado.parquet", filas_por_lote=1_000,
+                                          procesos=procesos, progreso=False)
+                print(f"Cortas desde {primera_corta}, {procesos} proceso(s): {resumen['total']:,} validadas, "
+                      f"{resumen['filas_omitidas']} omitidas")
+                assert resumen.pop("filas_omitidas") == largas
+                assert resumen == esperado
+                assert pd.read_parquet(Path(tmp) / "resultado.parquet")["numero_original"].tolist() == buenos
+
+
+def main():
+    """Ejecuta todos los tests."""
+    test_resumen_igual_a_analizar_resultados()
+    test_repetidos_con_volcado()
+    test_export_con_filas_irregulares()
+
+    print("\n" + "="*60)
+    print("✅ SUITE DE PRUEBAS COMPLETADA")
+    print("="*60)
+
+
+if __name__ == "__main__":
+    main()
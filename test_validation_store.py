@@ -0,0 +1,82 @@
+"""
+Script de prueba para el almacén de resultados de validación de números.
+Ejecutar: python test_validation_store.py
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / "scripts"))
+
+from phone_validator import plan_vigente, validar_numero_colombiano
+from validation_store import ValidationStore, canonical_number
+
+NUMEROS = [
+    "573001234567", "+57 300 123 4567", "3001234567",   # el mismo número canónico
+    "573111111111", "3725270507", "2123456789",
+    "575712345678",                                      # 10 dígitos que empiezan por 57
+    "57312345", "", None, "abc",                         # sin 10 dígitos: no se guardan
+]
+
+
+def test_mismo_resultado():
+    """El almacén da lo mismo que validar_numero_colombiano y cuenta aciertos y fallos."""
+    print("\n" + "="*60)
+    print("TEST 1: Resultados y contadores")
+    print("="*60)
+
+    store = ValidationStore()
+    for _ in range(2):
+        for numero in NUMEROS:
+            assert store.validate(numero) == validar_numero_colombiano(numero), numero
+
+    stats = store.stats()
+    print(stats)
+    # 5 números canónicos distintos: se calculan una vez; el resto de las 14 consultas son aciertos
+    assert stats == {'hits': 9, 'disk_hits': 0, 'misses': 5, 'entries': 5}
+    assert canonical_number("+57 (300) 123-4567") == "3001234567"
+    assert canonical_number("57312345") is None
+
+
+def test_persistencia_en_disco():
+    """Otra instancia (otro proceso o sesión) lee de la tabla en disco; el LRU desaloja lo menos usado."""
+    print("\n" + "="*60)
+    print("TEST 2: Tabla en disco y LRU")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "validaciones.sqlite"
+        primera = ValidationStore(path)
+        for numero in NUMEROS:
+            primera.validate(numero)
+        primera.close()
+
+        segunda = ValidationStore(path, max_entries=2)
+        for numero in ["3001234567", "3111111111", "3725270507", "3001234567"]:
+            assert segunda.validate(numero) == validar_numero_colombiano(numero)
+        stats = segunda.stats()
+        print(stats)
+        # El 300 salió del LRU al entrar el 372: la segunda consulta vuelve a leer del disco
+        assert stats == {'hits': 0, 'disk_hits': 4, 'misses': 0, 'entries': 2}
+
+        # La clave incluye la versión del plan de numeración
+        assert (plan_vigente().version, "3001234567") in segunda._entries
+        segunda.clear()
+        segunda.validate("3001234567")
+        assert segunda.misses == 1
+        segunda.close()
+
+
+def main():
+    """Ejecuta todos los tests."""
+    test_mismo_resultado()
+    test_persistencia_en_disco()
+
+    print("\n" + "="*60)
+    print("✅ SUITE DE PRUEBAS COMPLETADA")
+    print("="*60)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,13 +3,33 @@ Script de prueba para el validador de números telefónicos colombianos.
 Ejecutar: python test_validator.py
 """
 
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+from datetime import date
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+
 from scripts.phone_validator import (
     validar_numero_colombiano,
     validar_lista_numeros,
+    validar_columna,
     analizar_resultados,
+    PlanNumeracion,
+    compilar_plan,
+    operadores_de_prefijos,
+    OPERADORES,
     limpiar_numero,
     identificar_operador,
-    detectar_patron_sospechoso
+    detectar_patron_sospechoso,
+    detectar_patrones_sospechosos,
+    matriz_digitos,
+    RAZONES_SOSPECHA
 )
 
 def test_limpieza():
@@ -190,6 +210,160 @@ def test_casos_edge():
             print(f"\n❌ Caso: {repr(caso)}")
             print(f"   Error inesperado: {e}")
 
+def _numeros_aleatorios(cantidad: int, semilla: int = 7) -> list:
+    """Mezcla de celulares con y sin 57, vacíos, basura, patrones sospechosos y enteros."""
+    rng = random.Random(semilla)
+    numeros = []
+    for _ in range(cantidad):
+        r = rng.random()
+        if r < 0.6:
+            celular = '3' + ''.join(rng.choice('0123456789') for _ in range(9))
+            numeros.append(rng.choice(['', '57', '+57', '+57 ', '57-']) + celular)
+        elif r < 0.7:
+            numeros.append(rng.choice([None, '', ' ', '+', '57', '+57', 'nan', float('nan')]))
+        elif r < 0.8:
+            numeros.append(''.join(rng.choice('0123456789+- ()abc') for _ in range(rng.randint(0, 15))))
+        elif r < 0.9:
+            numeros.append(rng.choice(['3111111111', '3001230000', '3012121212', '3123456789', '3987654321']))
+        else:
+            numeros.append(rng.randint(10**9, 10**12))
+    return numeros
+
+
+def test_motor_columnar():
+    """validar_columna da lo mismo que validar_numero_colombiano número a número."""
+    print("\n" + "="*60)
+    print("TEST 7: Motor Columnar vs Validación Individual")
+    print("="*60)
+    
+    numeros = _numeros_aleatorios(20_000) + ["３００1234567", "+57 ٣٠٠1234567", 3001234567.0]
+    esperado = pd.DataFrame([validar_numero_colombiano(n) for n in numeros])
+    columnar = validar_columna(numeros)
+    
+    for columna in esperado.columns[1:]:
+        iguales = (columnar[columna].astype(object) == esperado[columna]).all()
+        print(f"{'✅' if iguales else '❌'} {columna}")
+        assert iguales, columna
+    assert analizar_resultados(columnar) == analizar_resultados(esperado)
+    
+    # Columnas de pandas y de Arrow con enteros o texto
+    enteros = [573001234567, 3151234567, 2123456789, None]
+    esperado = [validar_numero_colombiano(n)['categoria'] for n in enteros]
+    for entrada in (pd.Series(enteros, dtype='Int64'), pa.array(enteros), pa.array([str(n) if n else None for n in enteros])):
+        assert validar_columna(entrada)['categoria'].tolist() == esperado
+    print(f"Categorías desde enteros/Arrow: {esperado}")
+
+
+def test_plan_numeracion():
+    """La tabla de 1000 prefijos da el mismo operador que los rangos y rechaza rangos cruzados."""
+    print("\n" + "="*60)
+    print("TEST 8: Plan de Numeración")
+    print("="*60)
+    
+    prefijos = list(range(1000))
+    por_tabla = [OPERADORES[c] for c in operadores_de_prefijos(prefijos)]
+    assert por_tabla == [identificar_operador(f"{p:03d}4567890") for p in prefijos]
+    print(f"Prefijos asignados: {sum(o != 'Desconocido' for o in por_tabla)}")
+    
+    cruzado = PlanNumeracion("x", date.min, {"Tigo": [(300, 306)], "Claro": [(306, 310)]})
+    try:
+        compilar_plan(cruzado, ["N/A", "Desconocido", "Tigo", "Claro"])
+        raise AssertionError("Se esperaba ValueError por rangos cruzados")
+    except ValueError as e:
+        print(f"✅ Rangos cruzados: {e}")
+
+
+def test_planes_historicos():
+    """Cada envío se valida con el plan vigente en su fecha."""
+    print("\n" + "="*60)
+    print("TEST 9: Validación con Planes Históricos")
+    print("="*60)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        base = {"version": "base", "operadores": {"Tigo": [[300, 306]], "Claro": [[315, 315]]}}
+        # Desde 2025 el 307 es de un operador nuevo y el 315 pasa a Tigo
+        nuevo = {
+            "version": "2025-01",
+            "vigente_desde": "2025-01-01",
+            "operadores": {"Tigo": [[300, 306], [315, 315]], "Nuevo": [[307, 307]]},
+        }
+        Path(tmp, "base.json").write_text(json.dumps(base))
+        Path(tmp, "2025.json").write_text(json.dumps(nuevo))
+        
+        codigo = (
+            "import json, phone_validator as pv; "
+            "df = pv.validar_columna(['3071234567', '3151234567', '3071234567', '3151234567'], "
+            "['2024-12-31', '2024-12-31', '2025-01-01', None]); "
+            "print(json.dumps([df['operador'].tolist(), pv.plan_vigente('2024-06-30').version, "
+            "pv.identificar_operador('3071234567', '2025-02-01')]))"
+        )
+        salida = subprocess.run(
+            [sys.executable, "-c", codigo],
+            cwd=Path(__file__).parent / "scripts",
+            env={**os.environ, "NUMBERING_PLAN_DIR": tmp},
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+    
+    operadores, version, operador_2025 = json.loads(salida)
+    print(f"Operadores por fecha: {operadores} | plan de 2024: {version}")
+    assert operadores == ["Desconocido", "Claro", "Nuevo", "Tigo"]
+    assert version == "base"
+    assert operador_2025 == "Nuevo"
+
+
+def _numeros_con_patrones(n: int) -> list:
+    """Números de 10 dígitos, la mayoría armados para caer en algún patrón sospechoso."""
+    rng = random.Random(23)
+    numeros = []
+    for _ in range(n):
+        tipo = rng.randrange(4)
+        if tipo == 0:
+            digitos = [rng.randrange(10) for _ in range(10)]
+        elif tipo == 1:
+            # Dos dígitos mezclados: alternantes, repetitivos y consecutivos
+            par = rng.sample(range(10), 2)
+            digitos = [rng.choice(par) for _ in range(10)]
+        elif tipo == 2:
+            # Escalera con un dígito cambiado
+            inicio, paso = rng.randrange(10), rng.choice([1, -1])
+            digitos = [(inicio + paso * i) % 10 for i in range(10)]
+            digitos[rng.randrange(10)] = rng.randrange(10)
+        else:
+            digitos = [rng.randrange(10) for _ in range(10)]
+            posicion = rng.randrange(6)
+            digitos[posicion:posicion + 5] = [rng.randrange(10)] * 5
+        numeros.append(''.join(map(str, digitos)))
+    return numeros
+
+
+def test_patrones_en_lote():
+    """detectar_patrones_sospechosos da la misma razón que detectar_patron_sospechoso."""
+    print("\n" + "="*60)
+    print("TEST 10: Patrones Sospechosos en Lote")
+    print("="*60)
+    
+    numeros = _numeros_con_patrones(100_000)
+    codigos = detectar_patrones_sospechosos(matriz_digitos(numeros))
+    en_lote = [RAZONES_SOSPECHA[c] for c in codigos]
+    esperado = [detectar_patron_sospechoso(n)[1] for n in numeros]
+    assert en_lote == esperado
+    print(f"✅ {len(numeros):,} números, {sum(map(bool, esperado)):,} sospechosos")
+    
+    # La matriz sale igual desde enteros (con ceros a la izquierda) y desde texto
+    enteros = [3001234567, 123, 9_999_999_999]
+    assert (matriz_digitos(enteros) == matriz_digitos([f"{n:010d}" for n in enteros])).all()
+    assert (matriz_digitos(pa.array(enteros)) == matriz_digitos(enteros)).all()
+    for invalida in ([10_000_000_000], [-1], ["300123456"], ["30012345a7"], ["3001234567", None]):
+        try:
+            matriz_digitos(invalida)
+            raise AssertionError(f"Se esperaba ValueError para {invalida}")
+        except ValueError:
+            pass
+    print("✅ Matriz de dígitos desde enteros y texto")
+
+
 def main():
     """Ejecuta todos los tests."""
     print("\n" + "🇨🇴"*30)
@@ -202,6 +376,10 @@ def main():
     test_validacion_completa()
     test_validacion_lista()
     test_casos_edge()
+    test_motor_columnar()
+    test_plan_numeracion()
+    test_planes_historicos()
+    test_patrones_en_lote()
     
     print("\n" + "="*60)
     print("✅ SUITE DE PRUEBAS COMPLETADA")
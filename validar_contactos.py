@@ -0,0 +1,415 @@
+#!/usr/bin/env python3
+"""
+Valida un archivo de contactos (CSV o Parquet) de cualquier tamaño por lotes.
+Lee solo la columna de números (y la de fechas, si se indica) de a
+--filas-por-lote filas, valida cada lote en un pool de procesos con el motor
+columnar de phone_validator y escribe el resultado en Parquet a medida que
+avanza. El resumen es el mismo que daría analizar_resultados() sobre todo el
+archivo; los números repetidos se cuentan con group-bys que se vuelcan a disco
+si no caben en memoria (out_of_core.SpillingAggregator).
+
+Ejecutar: python validar_contactos.py contactos.csv resultado.parquet [--columna "Phone number"]
+          [--columna-fecha "Date Sent"] [--filas-por-lote 500000] [--procesos 4] [--resumen resumen.json]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Iterator, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+sys.path.insert(0, str(Path(__file__).parent / "scripts"))
+
+from out_of_core import SpillingAggregator
+from phone_validator import CATEGORIAS, COLUMNAS_RESULTADO, OPERADORES, estadisticas_validacion, validar_columna
+
+# Filas por lote: cada proceso tiene a lo sumo dos lotes (el que valida y el que espera)
+FILAS_POR_LOTE = 500_000
+
+# Columnas categóricas del resultado: mismo tipo en todos los lotes del Parquet
+_DICCIONARIO = pa.dictionary(pa.int32(), pa.string())
+
+
+def esquema_resultado(tipo_original: pa.DataType) -> pa.Schema:
+    """Esquema del Parquet de resultado (numero_original conserva el tipo de la entrada)."""
+    tipos = {
+        'numero_original': tipo_original,
+        'numero_limpio': pa.string(),
+        'numero_completo': pa.string(),
+        'valido': pa.bool_(),
+        'sospechoso': pa.bool_(),
+    }
+    return pa.schema([(c, tipos.get(c, _DICCIONARIO)) for c in COLUMNAS_RESULTADO])
+
+
+def leer_lotes(archivo: Path, columnas, filas_por_lote: int = FILAS_POR_LOTE,
+               separador: str = ',', codificacion: str = 'utf-8',
+               al_omitir: Optional[Callable[[int], None]] = None) -> Iterator[pa.Table]:
+    """Recorre las columnas del archivo de a filas_por_lote filas, sin cargarlo completo.
+
+    En CSV todas las columnas se leen como texto: un número con + o ceros a la
+    izquierda llega a la validación tal como está escrito. Las filas con menos
+    columnas que el encabezado (los exports de WhatsApp no escriben las últimas
+    vacías) se completan con '' como en pandas y el dashboard; las que traen más
+    se omiten y al_omitir recibe el total de omitidas hasta el momento.
+    """
+    if archivo.suffix == '.parquet':
+        parquet = pq.ParquetFile(archivo)
+        for lote in parquet.iter_batches(batch_size=filas_por_lote, columns=list(columnas)):
+            yield pa.Table.from_batches([lote])
+        return
+
+    entregadas = 0
+    filas_cortas = []
+    for tabla in _lotes_csv_arrow(archivo, columnas, filas_por_lote, separador, codificacion,
+                                  al_omitir, filas_cortas):
+        yield tabla
+        entregadas += tabla.num_rows
+    if not filas_cortas:
+        return
+    # El lector de Arrow no completa filas: desde la primera fila corta sigue el de
+    # pandas, que relee el archivo y salta las filas ya entregadas
+    yield from _lotes_csv_pandas(archivo, columnas, filas_por_lote, separador, codificacion,
+                                 al_omitir, saltar=entregadas)
+
+
+def _lotes_csv_arrow(archivo: Path, columnas, filas_por_lote: int, separador: str, codificacion: str,
+                     al_omitir: Optional[Callable[[int], None]], filas_cortas: list) -> Iterator[pa.Table]:
+    """Lotes del lector de CSV de Arrow; se detiene (anotando en filas_cortas) en la primera fila corta."""
+    import pyarrow.csv as pacsv
+
+    omitidas = 0
+
+    def fila_invalida(fila) -> str:
+        nonlocal omitidas
+        if fila.actual_columns < fila.expected_columns:
+            filas_cortas.append(fila.number)
+            return 'error'
+        omitidas += 1
+        if al_omitir is not None:
+            al_omitir(omitidas)
+        return 'skip'
+
+    # Los bloques del lector de CSV no tienen un tamaño fijo de filas: se juntan hasta el lote
+    pendientes, filas = [], 0
+    try:
+        # open_csv ya lee el primer bloque: la fila corta puede aparecer aquí mismo
+        lector = pacsv.open_csv(
+            archivo,
+            read_options=pacsv.ReadOptions(encoding=codificacion),
+            parse_options=pacsv.ParseOptions(delimiter=separador, invalid_row_handler=fila_invalida),
+            convert_options=pacsv.ConvertOptions(
+                include_columns=list(columnas),
+                column_types={c: pa.string() for c in columnas},
+            ),
+        )
+        for bloque in lector:
+            pendientes.append(bloque)
+            filas += bloque.num_rows
+            if filas < filas_por_lote:
+                continue
+            tabla = pa.Table.from_batches(pendientes)
+            inicio = 0
+            while filas - inicio >= filas_por_lote:
+                yield tabla.slice(inicio, filas_por_lote)
+                inicio += filas_por_lote
+            resto = tabla.slice(inicio)
+            pendientes, filas = resto.to_batches(), resto.num_rows
+    except pa.ArrowInvalid:
+        if not filas_cortas:
+            raise
+        return
+    if filas:
+        yield pa.Table.from_batches(pendientes, schema=lector.schema)
+
+
+def _lotes_csv_pandas(archivo: Path, columnas, filas_por_lote: int, separador: str, codificacion: str,
+                      al_omitir: Optional[Callable[[int], None]], saltar: int = 0) -> Iterator[pa.Table]:
+    """Lotes del lector de CSV de pandas (completa las filas cortas), sin las primeras saltar filas."""
+    import warnings
+
+    omitidas = 0
+    # Sin usecols: con usecols pandas no detecta las filas con columnas de más.
+    # index_col=False: una primera fila larga no convierte la primera columna en índice
+    lector = pd.read_csv(archivo, sep=separador, encoding=codificacion, dtype=str, index_col=False,
+                         na_filter=False, on_bad_lines='warn', chunksize=filas_por_lote)
+    with lector:
+        while True:
+            # pandas avisa cada fila con más columnas que omite ("Skipping line N: ...")
+            with warnings.catch_warnings(record=True) as avisos:
+                warnings.simplefilter('always', pd.errors.ParserWarning)
+                bloque = next(lector, None)
+            nuevas = sum(str(aviso.message).count('Skipping line') for aviso in avisos
+                         if issubclass(aviso.category, pd.errors.ParserWarning))
+            if nuevas:
+                omitidas += nuevas
+                if al_omitir is not None:
+                    al_omitir(omitidas)
+            if bloque is None:
+                return
+            if saltar:
+                corte = min(saltar, len(bloque))
+                bloque, saltar = bloque.iloc[corte:], saltar - corte
+                if bloque.empty:
+                    continue
+            yield pa.table({c: pa.array(bloque[c].tolist(), type=pa.string()) for c in columnas})
+
+
+class ContadorRepetidos:
+    """Apariciones de cada numero_limpio en todo el archivo, con memoria acotada.
+
+    Cada lote se pre-agrupa en su proceso (contar_lote) y los parciales se juntan
+    en group-bys que se vuelcan a disco (SpillingAggregator). Los números de
+    hasta 18 dígitos ASCII (casi todos) se agrupan como el entero '1' + dígitos,
+    mucho más rápido que como texto; el resto se agrupa por el texto.
+    """
+
+    MEDIDAS = ['n', 'primera']
+
+    def __init__(self):
+        agregacion = {'primera': 'min'}
+        self._enteros = SpillingAggregator(['clave'], self.MEDIDAS, aggregations=agregacion)
+        self._textos = SpillingAggregator(['numero_limpio'], self.MEDIDAS, aggregations=agregacion)
+
+    @staticmethod
+    def contar_lote(numeros_limpios: pa.ChunkedArray, inicio: int) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Apariciones y primera posición (en el archivo) de cada número del lote."""
+        n = len(numeros_limpios)
+        primera = np.arange(inicio, inicio + n, dtype=np.int64)
+        entero = pc.and_(
+            pc.less_equal(pc.utf8_length(numeros_limpios), 18),
+            pc.match_substring_regex(numeros_limpios, r'^[0-9]*$'),
+        ).to_numpy(zero_copy_only=False)
+
+        claves = pc.cast(pc.binary_join_element_wise('1', pc.filter(numeros_limpios, entero), ''), pa.int64())
+        enteros = pd.DataFrame({
+            'clave': claves.to_numpy(),
+            'n': np.ones(len(claves), dtype=np.int64),
+            'primera': primera[entero],
+        }).groupby('clave', sort=False).agg({'n': 'sum', 'primera': 'min'}).reset_index()
+
+        textos = pd.DataFrame({
+            'numero_limpio': pc.filter(numeros_limpios, pc.invert(pa.array(entero))).to_pandas(),
+            'n': np.ones(n - len(claves), dtype=np.int64),
+            'primera': primera[~entero],
+        })
+        return enteros, textos
+
+    def add(self, parcial: Tuple[pd.DataFrame, pd.DataFrame]) -> None:
+        enteros, textos = parcial
+        self._enteros.add(enteros)
+        if len(textos):
+            self._textos.add(textos)
+
+    def close(self) -> None:
+        self._enteros.close()
+        self._textos.close()
+
+    def repetidos(self, top: int = 10) -> Tuple[int, pd.Series]:
+        """Cantidad de números con más de una aparición y los top más repetidos (número → veces).
+
+        Más apariciones primero y, en empate, el que apareció antes en el archivo
+        (el orden de analizar_resultados).
+        """
+        orden = dict(by=['n', 'primera'], ascending=[False, True])
+        cantidad, candidatos = 0, []
+        for agregador, decodificar in ((self._enteros, lambda c: c.astype(str).str[1:]), (self._textos, lambda t: t)):
+            for parte in agregador.iter_results():
+                repetidos = parte[parte['n'] > 1]
+                cantidad += len(repetidos)
+                mejores = repetidos.sort_values(**orden).head(top)
+                candidatos.append(pd.DataFrame({
+                    'numero': decodificar(mejores.iloc[:, 0]).to_numpy(dtype=object),
+                    'n': mejores['n'].to_numpy(),
+                    'primera': mejores['primera'].to_numpy(),
+                }))
+        if not candidatos:
+            return 0, pd.Series(dtype=np.int64)
+        mejores = pd.concat(candidatos).sort_values(**orden).head(top)
+        return cantidad, mejores.set_index('numero')['n']
+
+
+def validar_lote(numeros: pa.ChunkedArray, fechas: Optional[pa.ChunkedArray], inicio: int) -> Tuple[pa.Table, Dict]:
+    """
+    Valida un lote (en un proceso del pool) y cuenta lo necesario para el resumen.
+
+    Args:
+        numeros: Columna de números del lote
+        fechas: Columna de fechas de envío del lote (None = plan vigente hoy)
+        inicio: Posición de la primera fila del lote en el archivo
+
+    Returns:
+        Tupla (resultado en Arrow, conteos parciales)
+    """
+    resultado = validar_columna(numeros, fechas.to_pandas() if fechas is not None else None)
+    tabla = pa.Table.from_pandas(resultado, schema=esquema_resultado(numeros.type), preserve_index=False)
+
+    validos = resultado['valido']
+    conteos = {
+        'total': len(resultado),
+        'validos': int(validos.sum()),
+        'sospechosos': int(resultado['sospechoso'].sum()),
+        'categorias': resultado['categoria'].value_counts(sort=False).reindex(CATEGORIAS, fill_value=0).to_numpy(),
+        'operadores': resultado.loc[validos, 'operador'].value_counts(sort=False).reindex(OPERADORES, fill_value=0).to_numpy(),
+        'repeticiones': ContadorRepetidos.contar_lote(tabla.column('numero_limpio'), inicio),
+    }
+    return tabla, conteos
+
+
+def _de_mayor_a_menor(cantidades: np.ndarray, vocabulario) -> Dict[str, int]:
+    """Conteos del vocabulario sin ceros, de mayor a menor (empates en el orden del vocabulario, como value_counts)."""
+    serie = pd.Series(cantidades, index=vocabulario).sort_values(ascending=False, kind='stable')
+    return {valor: int(cantidad) for valor, cantidad in serie.items() if cantidad}
+
+
+def validar_archivo(entrada: Path, salida: Path, columna: str = 'Phone number',
+                    columna_fecha: Optional[str] = None, filas_por_lote: int = FILAS_POR_LOTE,
+                    procesos: Optional[int] = None, separador: str = ',', codificacion: str = 'utf-8',
+                    progreso: bool = True) -> Dict:
+    """
+    Valida todos los números de un archivo y escribe el resultado en Parquet.
+
+    Args:
+        entrada: Archivo CSV o Parquet con los contactos
+        salida: Parquet de resultado (columnas de validar_columna, un row group por lote)
+        columna: Columna con los números
+        columna_fecha: Columna con la fecha de envío (valida con el plan de numeración de esa fecha)
+        filas_por_lote: Filas que se validan juntas en un proceso
+        procesos: Procesos del pool (None = todos los núcleos; 1 = sin pool)
+        separador: Delimitador del CSV
+        codificacion: Codificación del CSV
+        progreso: Mostrar filas procesadas y filas por segundo
+
+    Returns:
+        Resumen igual al de analizar_resultados() sobre todo el archivo, más
+        'filas_omitidas': filas del CSV con más columnas que el encabezado, que no se validan
+    """
+    procesos = procesos or os.cpu_count() or 1
+    columnas = [columna] + ([columna_fecha] if columna_fecha else [])
+    omitidas = 0
+
+    def contar_omitidas(hasta_ahora: int) -> None:
+        nonlocal omitidas
+        omitidas = hasta_ahora
+
+    lotes = leer_lotes(entrada, columnas, filas_por_lote, separador, codificacion, contar_omitidas)
+
+    total = validos = sospechosos = 0
+    categorias = np.zeros(len(CATEGORIAS), dtype=np.int64)
+    operadores = np.zeros(len(OPERADORES), dtype=np.int64)
+    repeticiones = ContadorRepetidos()
+    escritor = None
+    inicio_reloj = time.perf_counter()
+
+    def acumular(tabla: pa.Table, conteos: Dict) -> None:
+        nonlocal escritor, total, validos, sospechosos
+        if escritor is None:
+            escritor = pq.ParquetWriter(salida, tabla.schema, compression='zstd')
+        escritor.write_table(tabla)
+        total += conteos['total']
+        validos += conteos['validos']
+        sospechosos += conteos['sospechosos']
+        categorias[:] += conteos['categorias']
+        operadores[:] += conteos['operadores']
+        repeticiones.add(conteos['repeticiones'])
+        if progreso:
+            segundos = time.perf_counter() - inicio_reloj
+            print(f"\r  {total:>12,} filas | {total / max(segundos, 1e-9):>10,.0f} filas/s",
+                  end='', file=sys.stderr, flush=True)
+
+    def argumentos(tabla: pa.Table, inicio: int):
+        fechas = tabla.column(columna_fecha) if columna_fecha else None
+        return tabla.column(columna), fechas, inicio
+
+    try:
+        inicio = 0
+        if procesos == 1:
+            for tabla in lotes:
+                acumular(*validar_lote(*argumentos(tabla, inicio)))
+                inicio += tabla.num_rows
+        else:
+            # Lotes en vuelo acotados: la memoria no depende del tamaño del archivo
+            with ProcessPoolExecutor(max_workers=procesos) as pool:
+                en_vuelo = deque()
+                for tabla in lotes:
+                    en_vuelo.append(pool.submit(validar_lote, *argumentos(tabla, inicio)))
+                    inicio += tabla.num_rows
+                    if len(en_vuelo) >= 2 * procesos:
+                        acumular(*en_vuelo.popleft().result())
+                while en_vuelo:
+                    acumular(*en_vuelo.popleft().result())
+
+        if escritor is None:
+            # Archivo sin filas: Parquet vacío con el esquema del resultado
+            pq.write_table(esquema_resultado(pa.string()).empty_table(), salida)
+            return {'total': 0, 'filas_omitidas': omitidas}
+
+        numeros_repetidos, top_repetidos = repeticiones.repetidos()
+    finally:
+        repeticiones.close()
+        if escritor is not None:
+            escritor.close()
+
+    if progreso:
+        segundos = time.perf_counter() - inicio_reloj
+        print(f"\r  {total:>12,} filas en {segundos:.1f}s ({total / max(segundos, 1e-9):,.0f} filas/s)", file=sys.stderr)
+
+    resumen = estadisticas_validacion(
+        total, np.int64(validos), np.int64(sospechosos),
+        _de_mayor_a_menor(categorias, CATEGORIAS), _de_mayor_a_menor(operadores, OPERADORES),
+        numeros_repetidos, top_repetidos,
+    )
+    resumen['filas_omitidas'] = omitidas
+    return resumen
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("entrada", type=Path, help="Archivo de contactos (.csv o .parquet)")
+    parser.add_argument("salida", type=Path, help="Parquet de resultado")
+    parser.add_argument("--columna", default="Phone number", help="Columna con los números")
+    parser.add_argument("--columna-fecha", default=None, help="Columna con la fecha de envío (plan de numeración de esa fecha)")
+    parser.add_argument("--filas-por-lote", type=int, default=FILAS_POR_LOTE, help="Filas por lote")
+    parser.add_argument("--procesos", type=int, default=None, help="Procesos del pool (por defecto todos los núcleos)")
+    parser.add_argument("--separador", default=",", help="Delimitador del CSV")
+    parser.add_argument("--codificacion", default="utf-8", help="Codificación del CSV")
+    parser.add_argument("--resumen", type=Path, default=None, help="JSON del resumen (por defecto junto a la salida)")
+    args = parser.parse_args()
+
+    print("="*80)
+    print(f"VALIDACIÓN DE CONTACTOS: {args.entrada} → {args.salida}")
+    print("="*80)
+
+    resumen = validar_archivo(args.entrada, args.salida, args.columna, args.columna_fecha,
+                              args.filas_por_lote, args.procesos, args.separador, args.codificacion)
+
+    ruta_resumen = args.resumen or args.salida.with_suffix('.resumen.json')
+    with open(ruta_resumen, 'w', encoding='utf-8') as f:
+        json.dump(resumen, f, ensure_ascii=False, indent=2)
+
+    if resumen['total']:
+        print(f"\nTotal:       {resumen['total']:,}")
+        print(f"Válidos:     {resumen['validos']:,} ({resumen['porcentaje_validos']}%)")
+        print(f"Inválidos:   {resumen['invalidos']:,} ({resumen['porcentaje_invalidos']}%)")
+        print(f"Sospechosos: {resumen['sospechosos']:,} ({resumen['porcentaje_sospechosos']}%)")
+        print(f"Repetidos:   {resumen['numeros_repetidos']:,}")
+        print("\nPor operador:")
+        for operador, cantidad in resumen['operadores'].items():
+            print(f"  {operador:<20} {cantidad:>12,}")
+    if resumen['filas_omitidas']:
+        print(f"\n⚠️  Filas omitidas (más columnas que el encabezado): {resumen['filas_omitidas']:,}")
+    print(f"\nResumen: {ruta_resumen}")
+
+
+if __name__ == "__main__":
+    main()